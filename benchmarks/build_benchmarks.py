@@ -0,0 +1,315 @@
+"""Scaling benchmarks of the rig builders without Maya.
+
+Every case builds at growing sizes against the mock_maya scene inside a
+BuildProfiler, so the durations are Python side overhead only. Command,
+node and connection counts are the ones Maya would report for the same
+calls. The suite fails when a count grows faster than linear with the size
+or went up compared to the last recorded run, and when the time of a case or
+stage grows about quadratically. Times are the median of repeated runs with
+the garbage collector off, series too short to time reliably are skipped and
+time growing somewhat faster than linear is only logged as a warning. Run it
+from the repository root, or through pytest with tests/test_build_benchmarks.py:
+
+    python benchmarks/build_benchmarks.py
+    python benchmarks/build_benchmarks.py --sizes 1 2 4 --repeats 1 --no-record
+"""
+import argparse
+import datetime
+import gc
+import json
+import logging
+import os
+import statistics
+import subprocess
+import sys
+
+import numpy as np
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path[:0] = [BENCHMARK_DIR, os.path.dirname(BENCHMARK_DIR)]
+
+import mock_maya  # noqa: E402
+
+mock_maya.install()
+
+from maya import cmds  # noqa: E402
+from pymel import core as pm  # noqa: E402
+
+from maya_frog_rigging_tools import benchmark  # noqa: E402
+from maya_frog_rigging_tools import deformation_cage  # noqa: E402
+from maya_frog_rigging_tools import eyeball_setup  # noqa: E402
+from maya_frog_rigging_tools.limb_setup import LimbSetup  # noqa: E402
+from maya_frog_rigging_tools.profiling import BuildProfiler  # noqa: E402
+from maya_frog_rigging_tools.skin import ribbon  # noqa: E402
+
+LOGGER = logging.getLogger("Build Benchmarks")
+
+DEFAULT_SIZES = (1, 2, 4, 8)
+DEFAULT_REPEATS = 3
+DEFAULT_HISTORY = os.path.join(BENCHMARK_DIR, "history.jsonl")
+COUNTS = ("commands", "nodes", "connections")
+
+# log log slope of counts and time over the case size, 1 is linear, 2 quadratic
+MAX_COUNT_EXPONENT = 1.25
+MAX_TIME_EXPONENT = 1.8
+TIME_WARNING_EXPONENT = 1.4
+# time series are only checked when the largest size takes these seconds and this share of the
+# case, and every fitted size takes at least MIN_FITTED_SECONDS, shorter ones are too noisy
+MIN_STAGE_SHARE = 0.1
+MIN_TIMED_SECONDS = 0.5
+MIN_FITTED_SECONDS = 0.02
+# allowed count increase against the last recorded run
+MAX_COUNT_INCREASE = 0.05
+TIME_WARNING_RATIO = 1.25
+
+
+# cases, each builds into a new scene and returns the number of elements it built
+
+def build_cage(size, deformer="skin"):
+    """Box cage subdivided 3 * size by size + 1 by size + 1 around a sphere of fixed resolution."""
+    joints = benchmark.create_test_chain("bench_cage", 3)
+    cage = cmds.polyCube(
+        name="bench_cage_geo", width=6, height=2, depth=2,
+        subdivisionsX=3 * size, subdivisionsY=size + 1, subdivisionsZ=size + 1
+    )[0]
+    body = cmds.polySphere(name="bench_body_geo", radius=0.8, subdivisionsX=16, subdivisionsY=16)[0]
+    for mesh in (cage, body):
+        cmds.move(2, 0, -0.25, mesh)
+        cmds.makeIdentity(mesh, apply=True, translate=True)
+    cmds.skinCluster(joints, cage, toSelectedBones=True, name="bench_cage_cluster")
+
+    deformation_cage.create_deform_cage(cage, [body], smooth_iterations=0, deformer=deformer)
+    return pm.PyNode(cage).numVertices()
+
+
+def build_limbs(size, constraint_mode="constraint"):
+    for index in range(size):
+        chain = benchmark.create_test_chain(f"bench_limb{index}", 3)
+        limb = LimbSetup(chain[0], prefix_name=f"bench{index}", constraint_mode=constraint_mode)
+        limb.build_structure()
+        limb.build_ctl_rig()
+        limb.cleanup()
+    return size
+
+
+def build_ribbons(size):
+    for index in range(size):
+        chain = [pm.PyNode(joint) for joint in benchmark.create_test_chain(f"bench_rbbn{index}", 3)]
+        host = pm.group(empty=True, name=f"bench_rbbn{index}_host")
+        ribbon.create_bezier_ribbon(chain, host, name=f"bench_rbbn{index}")
+    return size
+
+
+def build_eye(size, backend="network"):
+    """Eye with 8 * size joint rings on a sphere of fixed resolution."""
+    eye_geo = pm.polySphere(name="bench_eye_geo", axis=(1, 0, 0), subdivisionsX=32, subdivisionsY=32)[0]
+    eyeball_setup.setup_eye("bench_eye", iris_exists=True, subdiv_res=8 * size, input_geo=eye_geo, backend=backend)
+    return 8 * size + 1
+
+
+CASES = {
+    "cage_skin": build_cage,
+    "cage_mvc": lambda size: build_cage(size, deformer="mvc"),
+    "limb_constraint": build_limbs,
+    "limb_matrix": lambda size: build_limbs(size, constraint_mode="matrix"),
+    "ribbon": build_ribbons,
+    "eye_network": build_eye,
+    "eye_node": lambda size: build_eye(size, backend="node"),
+}
+
+
+# measuring
+
+def run_case(build, size):
+    cmds.file(new=True, force=True)
+    gc.collect()
+    gc.disable()
+    try:
+        with BuildProfiler(f"bench_{size}") as profiler:
+            elements = build(size)
+    finally:
+        gc.enable()
+
+    stages = {}
+    for stage in profiler.stages:
+        if stage["depth"] == 0:
+            continue
+        summary = stages.setdefault(stage["name"], {"duration": 0.0, "commands": 0, "nodes": 0})
+        summary["duration"] += stage["duration"]
+        summary["commands"] += stage["commands"]
+        summary["nodes"] += sum(stage["nodes"].values())
+
+    commands = sum(profiler.commands.values())
+    return {
+        "elements": elements,
+        "duration": profiler.duration,
+        "commands": commands,
+        "nodes": sum(profiler.nodes.values()),
+        "connections": sum(profiler.connections.values()),
+        "seconds_per_command": profiler.duration / max(commands, 1),
+        "stages": stages,
+    }
+
+
+def run_repeated(build, size, repeats):
+    """Counts of the first run with the median case and stage durations of all runs."""
+    runs = [run_case(build, size) for _ in range(max(repeats, 1))]
+    result = runs[0]
+    result["duration"] = statistics.median(run["duration"] for run in runs)
+    result["seconds_per_command"] = result["duration"] / max(result["commands"], 1)
+    for stage, summary in result["stages"].items():
+        summary["duration"] = statistics.median(run["stages"].get(stage, summary)["duration"] for run in runs)
+    return result
+
+
+def run_cases(case_names, sizes, repeats=DEFAULT_REPEATS):
+    results = {}
+    for name in case_names:
+        results[name] = {}
+        for size in sizes:
+            result = run_repeated(CASES[name], size, repeats)
+            results[name][str(size)] = result
+            LOGGER.info(
+                f"{name} size {size}: {result['elements']} elements, {result['duration']:.3f}s, "
+                f"{result['commands']} commands, {result['nodes']} nodes, {result['connections']} connections, "
+                f"{result['seconds_per_command'] * 1e6:.1f}us per command"
+            )
+    return results
+
+
+def get_exponent(elements, values):
+    """Log log slope over the three largest sizes, where constant setup costs matter least."""
+    elements = np.asarray(elements[-3:], dtype=float)
+    values = np.maximum(np.asarray(values[-3:], dtype=float), 1e-9)
+    if len(elements) < 2 or np.ptp(np.log(elements)) == 0:
+        return 0.0
+    return float(np.polyfit(np.log(elements), np.log(values), 1)[0])
+
+
+def check_scaling(results):
+    """Messages for every count growing faster than linear with the case size."""
+    failures = []
+    for name, sizes in results.items():
+        runs = list(sizes.values())
+        elements = [run["elements"] for run in runs]
+
+        for key in COUNTS:
+            exponent = get_exponent(elements, [run[key] for run in runs])
+            if exponent > MAX_COUNT_EXPONENT:
+                failures.append(f"{name} {key} grow with exponent {exponent:.2f}")
+    return failures
+
+
+def check_time_scaling(results):
+    """Failure and warning messages for case and stage times growing faster than linear.
+
+    Times growing with more than MAX_TIME_EXPONENT fail, about quadratic,
+    more than TIME_WARNING_EXPONENT is only a warning.
+    """
+    failures = []
+    warnings = []
+    for name, sizes in results.items():
+        runs = list(sizes.values())
+        elements = [run["elements"] for run in runs]
+        series = {name: [run["duration"] for run in runs]}
+        for stage, summary in runs[-1]["stages"].items():
+            if summary["duration"] >= MIN_STAGE_SHARE * runs[-1]["duration"]:
+                series[f"{name} stage {stage}"] = [run["stages"].get(stage, {}).get("duration", 0.0) for run in runs]
+
+        for label, durations in series.items():
+            if durations[-1] < MIN_TIMED_SECONDS or min(durations[-3:]) < MIN_FITTED_SECONDS:
+                continue
+            exponent = get_exponent(elements, durations)
+            if exponent > MAX_TIME_EXPONENT:
+                failures.append(f"{label} time grows with exponent {exponent:.2f}")
+            elif exponent > TIME_WARNING_EXPONENT:
+                warnings.append(f"{label} time grows with exponent {exponent:.2f}")
+    return failures, warnings
+
+
+# history
+
+def get_revision():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BENCHMARK_DIR, stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def load_last_record(history_path):
+    if not os.path.exists(history_path):
+        return None
+    with open(history_path) as history_file:
+        lines = [line for line in history_file if line.strip()]
+    return json.loads(lines[-1]) if lines else None
+
+
+def compare_to_record(results, record):
+    """Messages for counts that went up since the record, slower cases are only logged."""
+    failures = []
+    for name, sizes in results.items():
+        for size, result in sizes.items():
+            previous = record["results"].get(name, {}).get(size)
+            if previous is None:
+                continue
+            for key in COUNTS:
+                if result[key] > previous[key] * (1 + MAX_COUNT_INCREASE):
+                    failures.append(
+                        f"{name} size {size} {key} went from {previous[key]} to {result[key]} "
+                        f"since {record.get('revision')}"
+                    )
+            if result["duration"] > previous["duration"] * TIME_WARNING_RATIO:
+                LOGGER.warning(
+                    f"{name} size {size} took {result['duration']:.3f}s, {previous['duration']:.3f}s "
+                    f"at {record.get('revision')}"
+                )
+    return failures
+
+
+def append_record(history_path, results, sizes):
+    record = {
+        "date": datetime.datetime.now().isoformat(timespec="seconds"),
+        "revision": get_revision(),
+        "python": sys.version.split()[0],
+        "sizes": list(sizes),
+        "results": results,
+    }
+    with open(history_path, "a") as history_file:
+        history_file.write(json.dumps(record) + "\n")
+    LOGGER.info(f"Recorded results to {history_path}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--cases", nargs="+", choices=sorted(CASES), default=list(CASES))
+    parser.add_argument("--sizes", nargs="+", type=int, default=list(DEFAULT_SIZES))
+    parser.add_argument("--repeats", type=int, default=DEFAULT_REPEATS, help="runs per size, times are medians")
+    parser.add_argument("--history", default=DEFAULT_HISTORY, help="jsonl file results are recorded to")
+    parser.add_argument("--no-record", action="store_true", help="compare to the history without recording")
+    args = parser.parse_args(argv)
+
+    # the builders log per node, which would dominate the measured time
+    logging.basicConfig(level=logging.WARNING, format="%(name)s: %(message)s")
+    LOGGER.setLevel(logging.INFO)
+
+    results = run_cases(args.cases, sorted(args.sizes), args.repeats)
+    time_failures, time_warnings = check_time_scaling(results)
+    failures = check_scaling(results) + time_failures
+    for warning in time_warnings:
+        LOGGER.warning(warning)
+    record = load_last_record(args.history)
+    if record is not None and record.get("sizes") == sorted(args.sizes):
+        failures.extend(compare_to_record(results, record))
+    if not args.no_record and not failures:
+        append_record(args.history, results, sorted(args.sizes))
+
+    for failure in failures:
+        LOGGER.error(failure)
+    LOGGER.info("Failed" if failures else "Passed")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,151 @@
+"""Import time benchmarks of the rigging tool modules without Maya.
+
+Menus and shelves import the tool modules on Maya startup, so importing one
+must not load PyMEL, NumPy or the capito pipeline and has to stay within a
+time budget. Every module is imported in a fresh interpreter against the
+mock_maya modules, the heavy ones are taken out of sys.modules first and
+every import of them is recorded. Only the solvers, which the tools import
+on first use, may import NumPy. The plugin modules are left out, Maya loads
+them through loadPlugin and they need the plugin API the mock lacks. Run it
+from the repository root:
+
+    python benchmarks/import_benchmarks.py
+    python benchmarks/import_benchmarks.py --modules limb_setup skin.ribbon --budget 0.05
+"""
+import argparse
+import json
+import logging
+import os
+import subprocess
+import sys
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCHMARK_DIR)
+PACKAGE = "maya_frog_rigging_tools"
+
+LOGGER = logging.getLogger("Import Benchmarks")
+
+# seconds a single module import may take on top of the mocked maya modules
+DEFAULT_BUDGET = 0.1
+HEAVY_MODULES = ("pymel", "numpy", "capito")
+# modules only imported once they run, allowed to load their dependencies directly
+ALLOWED_HEAVY = {f"{PACKAGE}.solvers": ("numpy",)}
+# packages whose modules are loaded by Maya itself, only the package is imported
+SKIPPED_PACKAGES = ("plugins",)
+
+# runs in the fresh interpreter, prints the import time and the heavy modules that were imported
+IMPORT_SCRIPT = """
+import importlib.abc
+import importlib.util
+import json
+import sys
+import time
+
+sys.path[:0] = {paths!r}
+import mock_maya
+
+mock_maya.install()
+heavy = {heavy!r}
+held = {{
+    name: sys.modules.pop(name) for name in list(sys.modules) if name.split(".")[0] in heavy
+}}
+imported = []
+
+
+class HeldLoader(importlib.abc.Loader):
+    def __init__(self, module):
+        self.module = module
+
+    def create_module(self, spec):
+        return self.module
+
+    def exec_module(self, module):
+        pass
+
+
+class RecordingFinder(importlib.abc.MetaPathFinder):
+    def find_spec(self, name, path, target=None):
+        if name.split(".")[0] not in heavy:
+            return None
+        imported.append(name)
+        if name in held:
+            return importlib.util.spec_from_loader(name, HeldLoader(held[name]))
+        return None
+
+
+sys.meta_path.insert(0, RecordingFinder())
+start = time.perf_counter()
+importlib.import_module({module!r})
+print(json.dumps({{"duration": time.perf_counter() - start, "imported": imported}}))
+"""
+
+
+def get_modules():
+    """Dotted names of all modules and subpackages below the package, except the skipped ones."""
+    package_dir = os.path.join(ROOT_DIR, PACKAGE)
+    modules = []
+    for directory, _, files in os.walk(package_dir):
+        if "__init__.py" not in files:
+            continue
+        prefix = os.path.relpath(directory, package_dir).replace(os.sep, ".")
+        for file_name in files:
+            if not file_name.endswith(".py"):
+                continue
+            name = file_name[:-3]
+            if name == "__init__":
+                name = None
+            elif prefix in SKIPPED_PACKAGES:
+                continue
+            parts = [part for part in (prefix, name) if part and part != "."]
+            if parts:
+                modules.append(".".join(parts))
+    return sorted(modules)
+
+
+def time_import(module):
+    script = IMPORT_SCRIPT.format(paths=[BENCHMARK_DIR, ROOT_DIR], heavy=HEAVY_MODULES, module=module)
+    output = subprocess.run(
+        [sys.executable, "-c", script], capture_output=True, text=True, cwd=ROOT_DIR, check=False
+    )
+    if output.returncode:
+        raise RuntimeError(f"Importing {module} failed:\n{output.stderr}")
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+
+def check_import(module, result, budget):
+    """Messages for heavy modules the import loaded and for imports over the budget."""
+    failures = []
+    allowed = next((heavy for prefix, heavy in ALLOWED_HEAVY.items() if module.startswith(prefix)), ())
+    loaded = sorted({name.split(".")[0] for name in result["imported"]} - set(allowed))
+    if loaded:
+        failures.append(f"{module} imports {', '.join(loaded)}")
+    if result["duration"] > budget:
+        failures.append(f"{module} took {result['duration']:.3f}s, the budget is {budget:.3f}s")
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--modules", nargs="+", default=get_modules(), help="module names below the package")
+    parser.add_argument("--budget", type=float, default=DEFAULT_BUDGET, help="seconds per module import")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING, format="%(name)s: %(message)s")
+    LOGGER.setLevel(logging.INFO)
+
+    failures = []
+    for name in args.modules:
+        module = f"{PACKAGE}.{name}"
+        result = time_import(module)
+        heavy = sorted({imported.split(".")[0] for imported in result["imported"]})
+        LOGGER.info(f"{module}: {result['duration'] * 1000:.1f}ms{', imports ' + ', '.join(heavy) if heavy else ''}")
+        failures.extend(check_import(module, result, args.budget))
+
+    for failure in failures:
+        LOGGER.error(failure)
+    LOGGER.info("Failed" if failures else "Passed")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,82 @@
+"""Pure Python stand-in for maya.cmds, maya.api and pymel.core.
+
+install() registers the modules in sys.modules, so the rigging tools run
+without Maya. The scene records nodes, attributes and connections and
+counts commands, geometry and transforms are only as exact as the build
+code needs to take the same code paths. Use it to measure Python overhead
+and command counts, not to check rig behaviour.
+"""
+import sys
+import types
+
+from mock_maya.scene import Scene, get_scene
+
+
+def install():
+    """Register the mock modules, returns the scene they work on."""
+    if "maya" in sys.modules and not getattr(sys.modules["maya"], "MOCK", False):
+        raise RuntimeError("A real maya module is already imported")
+
+    from mock_maya import api
+    from mock_maya import cmds
+    from mock_maya import pymel
+
+    open_maya, open_maya_anim = api.build_modules()
+    maya_api = types.ModuleType("maya.api")
+    maya_api.__path__ = []
+    maya_api.OpenMaya = open_maya
+    maya_api.OpenMayaAnim = open_maya_anim
+
+    maya_utils = types.ModuleType("maya.utils")
+    maya_utils.executeDeferred = execute_deferred
+    maya_utils.processIdleEvents = process_idle_events
+
+    maya_mel = types.ModuleType("maya.mel")
+    maya_mel.eval = lambda *args, **kwargs: None
+
+    maya = types.ModuleType("maya")
+    maya.__path__ = []
+    maya.MOCK = True
+    maya.cmds = cmds
+    maya.api = maya_api
+    maya.utils = maya_utils
+    maya.mel = maya_mel
+    maya.OpenMaya = api.placeholder_module("maya.OpenMaya")
+    maya.OpenMayaAnim = api.placeholder_module("maya.OpenMayaAnim")
+    maya.OpenMayaMPx = api.placeholder_module("maya.OpenMayaMPx")
+
+    modules = {
+        "maya": maya,
+        "maya.cmds": cmds,
+        "maya.api": maya_api,
+        "maya.api.OpenMaya": open_maya,
+        "maya.api.OpenMayaAnim": open_maya_anim,
+        "maya.utils": maya_utils,
+        "maya.mel": maya_mel,
+        "maya.OpenMaya": maya.OpenMaya,
+        "maya.OpenMayaAnim": maya.OpenMayaAnim,
+        "maya.OpenMayaMPx": maya.OpenMayaMPx,
+    }
+    modules.update(pymel.build_modules())
+    sys.modules.update(modules)
+    return get_scene()
+
+
+def new_scene():
+    get_scene().reset()
+    return get_scene()
+
+
+def execute_deferred(func, *args, **kwargs):
+    get_scene().deferred.append((func, args, kwargs))
+
+
+def process_idle_events():
+    """Run deferred calls until none are left, including the ones they defer."""
+    scene = get_scene()
+    while scene.deferred:
+        func, args, kwargs = scene.deferred.pop(0)
+        func(*args, **kwargs)
+
+
+__all__ = ["Scene", "get_scene", "install", "new_scene", "process_idle_events"]
@@ -0,0 +1,813 @@
+"""maya.api.OpenMaya and OpenMayaAnim stand-ins working on the mock scene.
+
+API calls aren't counted as commands, like in Maya. Classes the rigging
+tools only need for plugins are placeholders raising NotImplementedError
+when they get instantiated.
+"""
+import logging
+import math
+import sys
+import types
+
+import numpy as np
+
+from mock_maya import cmds as _cmds
+from mock_maya.scene import decompose_matrix, euler_to_matrix, get_edges, get_scene, get_vertex_normals, is_a
+
+LOGGER = logging.getLogger("Mock Maya")
+
+
+class _PlaceholderType(type):
+    def __getattr__(cls, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return 0
+
+
+def _placeholder(name):
+    def __init__(self, *args, **kwargs):
+        raise NotImplementedError(f"{name} is not available in the mock Maya API")
+
+    return _PlaceholderType(name, (), {"__init__": __init__})
+
+
+def placeholder_module(name, existing=None):
+    """Module creating placeholder classes for every attribute it doesn't have."""
+    module = existing or types.ModuleType(name)
+    cache = {}
+
+    def __getattr__(attr):
+        if attr.startswith("__"):
+            raise AttributeError(attr)
+        if attr not in cache:
+            cache[attr] = _placeholder(attr)
+        return cache[attr]
+
+    module.__getattr__ = __getattr__
+    return module
+
+
+# constants
+
+class MSpace:
+    kInvalid = 0
+    kTransform = 1
+    kPreTransform = 2
+    kObject = 2
+    kPostTransform = 3
+    kWorld = 4
+
+
+class MFn:
+    kInvalid = 0
+    kDependencyNode = 4
+    kDagNode = 107
+    kTransform = 110
+    kJoint = 121
+    kShape = 248
+    kMesh = 296
+    kNurbsCurve = 267
+    kSkinClusterFilter = 682
+    kGeometryFilt = 334
+    kMeshVertComponent = 554
+    kCurveCVComponent = 533
+    kLatticeComponent = 547
+
+
+_FN_TYPES = {
+    MFn.kDependencyNode: "dependNode",
+    MFn.kDagNode: "dagNode",
+    MFn.kTransform: "transform",
+    MFn.kJoint: "joint",
+    MFn.kShape: "shape",
+    MFn.kMesh: "mesh",
+    MFn.kNurbsCurve: "nurbsCurve",
+    MFn.kSkinClusterFilter: "skinCluster",
+    MFn.kGeometryFilt: "geometryFilter",
+}
+
+
+# objects and paths
+
+class MObject:
+    kNullObj = None
+
+    def __init__(self, node=None, component=None):
+        self._node = node
+        self._component = component
+
+    def isNull(self):
+        return self._node is None and self._component is None
+
+    def hasFn(self, fn_type):
+        if self._component is not None:
+            return self._component["type"] == fn_type
+        return self._node is not None and is_a(self._node.type, _FN_TYPES.get(fn_type, ""))
+
+    def apiType(self):
+        if self._component is not None:
+            return self._component["type"]
+        return next(
+            (fn_type for fn_type, node_type in _FN_TYPES.items() if node_type == self._node.type),
+            MFn.kDependencyNode
+        )
+
+    def __eq__(self, other):
+        return isinstance(other, MObject) and self._node is other._node and self._component is other._component
+
+    def __hash__(self):
+        return hash(id(self._node))
+
+
+MObject.kNullObj = MObject()
+
+
+class MObjectHandle:
+    def __init__(self, mobject):
+        self._object = mobject
+
+    def isValid(self):
+        return self._object._node is not None and self._object._node.alive
+
+    def isAlive(self):
+        return self.isValid()
+
+    def object(self):
+        return self._object
+
+    def hashCode(self):
+        return id(self._object._node)
+
+
+class MDagPath:
+    def __init__(self, node=None):
+        self._node = node
+
+    def node(self):
+        return MObject(self._node)
+
+    def fullPathName(self):
+        return get_scene().path(self._node)
+
+    def partialPathName(self):
+        return self._node.name
+
+    def extendToShape(self):
+        if not self._node.is_shape:
+            self._node = _cmds._get_geometry(self._node)
+        return self
+
+    def transform(self):
+        return MObject(self._node.parent if self._node.is_shape else self._node)
+
+    def inclusiveMatrix(self):
+        node = self._node.parent if self._node.is_shape else self._node
+        return MMatrix(get_scene().world_matrix(node))
+
+    def exclusiveMatrix(self):
+        node = self._node.parent if self._node.is_shape else self._node
+        return MMatrix(get_scene().parent_matrix(node))
+
+    def __eq__(self, other):
+        return isinstance(other, MDagPath) and self._node is other._node
+
+    def __hash__(self):
+        return hash(id(self._node))
+
+
+class MSelectionList:
+    def __init__(self):
+        self._items = []
+
+    def add(self, name):
+        component = _cmds._parse_component(name)
+        if component is not None:
+            mesh, kind, indices = component
+            self._items.append((mesh, {"type": MFn.kMeshVertComponent, "elements": list(indices)}))
+            return self
+        node = get_scene().find(name)
+        if node is None:
+            raise RuntimeError(f"(kInvalidParameter): Object does not exist: {name}")
+        self._items.append((node, None))
+        return self
+
+    def length(self):
+        return len(self._items)
+
+    def getDependNode(self, index):
+        return MObject(self._items[index][0])
+
+    def getDagPath(self, index):
+        node = self._items[index][0]
+        if not node.is_dag:
+            raise TypeError(f"(kInvalidParameter): {node.name} is not a DAG node")
+        return MDagPath(node)
+
+    def getComponent(self, index):
+        node, component = self._items[index]
+        return MDagPath(node), MObject(component=component) if component else MObject.kNullObj
+
+
+class MGlobal:
+    kInteractive = 0
+    kBatch = 1
+    kLibraryApp = 2
+
+    @staticmethod
+    def mayaState():
+        return MGlobal.kBatch
+
+    @staticmethod
+    def getSelectionListByName(name):
+        return MSelectionList().add(name)
+
+    @staticmethod
+    def displayInfo(message):
+        LOGGER.info(message)
+
+    @staticmethod
+    def displayWarning(message):
+        LOGGER.warning(message)
+
+    @staticmethod
+    def displayError(message):
+        LOGGER.error(message)
+
+
+def _get_node(mobject_or_path):
+    return mobject_or_path._node
+
+
+# function sets
+
+class MFnBase:
+    def __init__(self, mobject_or_path=None):
+        self._node = _get_node(mobject_or_path) if mobject_or_path is not None else None
+
+    def object(self):
+        return MObject(self._node)
+
+
+class MFnDependencyNode(MFnBase):
+    @property
+    def typeName(self):
+        return self._node.type
+
+    def name(self):
+        return self._node.name
+
+    def findPlug(self, attr, want_networked=False):
+        return MPlug(self._node, attr)
+
+
+class MFnDagNode(MFnDependencyNode):
+    @property
+    def isIntermediateObject(self):
+        return bool(self._node.attrs.get("intermediateObject"))
+
+    def fullPathName(self):
+        return get_scene().path(self._node)
+
+    def partialPathName(self):
+        return self._node.name
+
+    def parentCount(self):
+        return int(self._node.parent is not None)
+
+    def parent(self, index):
+        return MObject(self._node.parent)
+
+    def childCount(self):
+        return len(self._node.children)
+
+    def child(self, index):
+        return MObject(list(self._node.children)[index])
+
+    def getPath(self):
+        return MDagPath(self._node)
+
+
+class MPlug:
+    def __init__(self, node=None, attr=None):
+        self._node = node
+        self._attr = attr
+
+    def node(self):
+        return MObject(self._node)
+
+    def name(self):
+        return f"{self._node.name}.{self._attr}"
+
+    def partialName(self, *args, **kwargs):
+        return self._attr
+
+    def asDouble(self):
+        return float(get_scene().get_attr(self._node, self._attr))
+
+    asFloat = asDouble
+
+    def asInt(self):
+        return int(get_scene().get_attr(self._node, self._attr))
+
+    def asBool(self):
+        return bool(get_scene().get_attr(self._node, self._attr))
+
+
+class MFnMesh(MFnDagNode):
+    def __init__(self, mobject_or_path=None):
+        super().__init__(mobject_or_path)
+        if self._node is not None and not self._node.is_shape:
+            self._node = _cmds._get_geometry(self._node)
+
+    @property
+    def numVertices(self):
+        return len(self._node.data["points"])
+
+    @property
+    def numEdges(self):
+        return len(get_edges(self._node.data))
+
+    @property
+    def numPolygons(self):
+        return len(self._node.data["faces"])
+
+    def _points(self, space):
+        if space == MSpace.kWorld:
+            return _cmds._world_points(self._node)
+        return self._node.data["points"]
+
+    def getPoints(self, space=MSpace.kObject):
+        return MPointArray(MPoint(*point) for point in self._points(space).tolist())
+
+    def getPoint(self, index, space=MSpace.kObject):
+        return MPoint(*self._points(space)[index].tolist())
+
+    def getVertexNormals(self, angle_weighted, space=MSpace.kObject):
+        normals = get_vertex_normals(self._node.data)
+        if space == MSpace.kWorld:
+            normals = normals @ get_scene().world_matrix(self._node.parent)[:3, :3]
+            normals = normals / np.maximum(np.linalg.norm(normals, axis=1, keepdims=True), 1e-12)
+        return MFloatVectorArray(MVector(*normal) for normal in normals.tolist())
+
+    def getVertexNormal(self, index, angle_weighted, space=MSpace.kObject):
+        return self.getVertexNormals(angle_weighted, space)[index]
+
+    def getTriangles(self):
+        counts = []
+        vertices = []
+        for face in self._node.data["faces"]:
+            counts.append(len(face) - 2)
+            for index in range(1, len(face) - 1):
+                vertices.extend((face[0], face[index], face[index + 1]))
+        return MIntArray(counts), MIntArray(vertices)
+
+    def create(self, points, counts, connects, parent=None):
+        from mock_maya.scene import create_mesh_data
+
+        scene = get_scene()
+        transform = scene.create_node("transform", "polySurface1")
+        self._node = scene.create_node("mesh", "polySurfaceShape1", transform)
+        faces = []
+        start = 0
+        for count in counts:
+            faces.append(tuple(connects[start:start + count]))
+            start += count
+        self._node.data = create_mesh_data([tuple(point)[:3] for point in points], faces)
+        return MObject(transform)
+
+    def parent(self, index):
+        return MObject(self._node.parent)
+
+
+class MFnNurbsCurve(MFnDagNode):
+    kOpen = 1
+    kClosed = 2
+    kPeriodic = 3
+
+    def __init__(self, mobject_or_path=None):
+        super().__init__(mobject_or_path)
+        if self._node is not None and not self._node.is_shape:
+            self._node = _cmds._get_geometry(self._node)
+
+    def cvPositions(self, space=MSpace.kObject):
+        cvs = _cmds._world_points(self._node) if space == MSpace.kWorld else self._node.data["cvs"]
+        return MPointArray(MPoint(*cv) for cv in cvs.tolist())
+
+    def knots(self):
+        return MDoubleArray(self._node.data["knots"])
+
+    @property
+    def degree(self):
+        return self._node.data["degree"]
+
+    @property
+    def numCVs(self):
+        return len(self._node.data["cvs"])
+
+    @property
+    def form(self):
+        return {"open": self.kOpen, "closed": self.kClosed, "periodic": self.kPeriodic}[self._node.data["form"]]
+
+
+class MFnSingleIndexedComponent:
+    def __init__(self, mobject=None):
+        self._component = mobject._component if mobject is not None else None
+
+    def create(self, component_type):
+        self._component = {"type": component_type, "elements": []}
+        return MObject(component=self._component)
+
+    def setCompleteData(self, count):
+        self._component["elements"] = list(range(count))
+
+    def addElements(self, elements):
+        self._component["elements"].extend(elements)
+
+    def addElement(self, element):
+        self._component["elements"].append(element)
+
+    def getElements(self):
+        return MIntArray(self._component["elements"])
+
+    @property
+    def elementCount(self):
+        return len(self._component["elements"])
+
+
+class MFnTripleIndexedComponent(MFnSingleIndexedComponent):
+    def setCompleteData(self, *counts):
+        self._component["elements"] = [
+            (s, t, u) for s in range(counts[0]) for t in range(counts[1]) for u in range(counts[2])
+        ]
+
+
+# iterators
+
+class MItMeshEdge:
+    def __init__(self, path):
+        mesh = _cmds._get_geometry(path._node) if not path._node.is_shape else path._node
+        self._edges = get_edges(mesh.data)
+        self._index = 0
+
+    def isDone(self):
+        return self._index >= len(self._edges)
+
+    def next(self):
+        self._index += 1
+
+    def index(self):
+        return self._index
+
+    def vertexId(self, side):
+        return int(self._edges[self._index][side])
+
+    def count(self):
+        return len(self._edges)
+
+
+class MItGeometry:
+    def __init__(self, path):
+        self._node = path._node if path._node.is_shape else _cmds._get_geometry(path._node)
+
+    def allPositions(self, space=MSpace.kObject):
+        if space == MSpace.kWorld:
+            points = _cmds._world_points(self._node)
+        else:
+            points = _cmds._get_points(self._node)
+        return MPointArray(MPoint(*point) for point in points.tolist())
+
+    def count(self):
+        return len(_cmds._get_points(self._node))
+
+
+# math
+
+class _Vector3:
+    __slots__ = ("x", "y", "z")
+
+    def __init__(self, x=0.0, y=0.0, z=0.0, *args):
+        if isinstance(x, (list, tuple, _Vector3)):
+            x, y, z = tuple(x)[:3]
+        self.x, self.y, self.z = float(x), float(y), float(z)
+
+    def __iter__(self):
+        return iter((self.x, self.y, self.z))
+
+    def __len__(self):
+        return 3
+
+    def __getitem__(self, index):
+        return (self.x, self.y, self.z)[index]
+
+    def __add__(self, other):
+        return type(self)(self.x + other[0], self.y + other[1], self.z + other[2])
+
+    def __sub__(self, other):
+        return MVector(self.x - other[0], self.y - other[1], self.z - other[2])
+
+    def __mul__(self, value):
+        if isinstance(value, MMatrix):
+            result = np.array([self.x, self.y, self.z, self._w]) @ value._values
+            return type(self)(*result[:3])
+        return type(self)(self.x * value, self.y * value, self.z * value)
+
+    def __eq__(self, other):
+        return tuple(self) == tuple(other)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.x}, {self.y}, {self.z})"
+
+
+class MVector(_Vector3):
+    __slots__ = ()
+    _w = 0.0
+
+    def length(self):
+        return math.sqrt(self.x ** 2 + self.y ** 2 + self.z ** 2)
+
+    def normal(self):
+        length = self.length() or 1.0
+        return MVector(self.x / length, self.y / length, self.z / length)
+
+    def __xor__(self, other):
+        return MVector(*np.cross(tuple(self), tuple(other)))
+
+
+class MPoint(_Vector3):
+    """Sequence of x, y, z and w like in Maya, so arrays of points convert to (points, 4)."""
+
+    __slots__ = ()
+    _w = 1.0
+
+    def __iter__(self):
+        return iter((self.x, self.y, self.z, self._w))
+
+    def __len__(self):
+        return 4
+
+    def __getitem__(self, index):
+        return (self.x, self.y, self.z, self._w)[index]
+
+    @property
+    def w(self):
+        return self._w
+
+    def distanceTo(self, other):
+        return math.dist(tuple(self), tuple(other))
+
+
+class MPointArray(list):
+    pass
+
+
+class MIntArray(list):
+    pass
+
+
+class MDoubleArray(list):
+    pass
+
+
+class MFloatVectorArray(list):
+    pass
+
+
+class MVectorArray(list):
+    pass
+
+
+class MMatrix:
+    def __init__(self, values=None):
+        if values is None:
+            self._values = np.eye(4)
+        elif isinstance(values, MMatrix):
+            self._values = values._values.copy()
+        else:
+            self._values = np.array(values, dtype=float).reshape(4, 4)
+
+    def __mul__(self, other):
+        return MMatrix(self._values @ other._values)
+
+    def __getitem__(self, index):
+        return float(self._values.ravel()[index])
+
+    def __iter__(self):
+        return iter(self._values.ravel().tolist())
+
+    def __len__(self):
+        return 16
+
+    def inverse(self):
+        return MMatrix(np.linalg.inv(self._values))
+
+    def transpose(self):
+        return MMatrix(self._values.T)
+
+    def getElement(self, row, column):
+        return float(self._values[row, column])
+
+    def setElement(self, row, column, value):
+        self._values[row, column] = value
+
+    def isEquivalent(self, other, tolerance=1e-10):
+        return bool(np.allclose(self._values, other._values, atol=tolerance))
+
+    def __eq__(self, other):
+        return isinstance(other, MMatrix) and self.isEquivalent(other)
+
+    def __repr__(self):
+        return f"MMatrix({self._values.ravel().tolist()})"
+
+
+MMatrix.kIdentity = MMatrix()
+
+
+class MEulerRotation:
+    kXYZ = 0
+
+    def __init__(self, x=0.0, y=0.0, z=0.0, order=0):
+        if isinstance(x, (list, tuple, MVector)):
+            x, y, z = tuple(x)[:3]
+        self.x, self.y, self.z = float(x), float(y), float(z)
+        self.order = order
+
+    def __iter__(self):
+        return iter((self.x, self.y, self.z))
+
+    def __getitem__(self, index):
+        return (self.x, self.y, self.z)[index]
+
+    def asMatrix(self):
+        matrix = np.eye(4)
+        matrix[:3, :3] = euler_to_matrix(np.degrees([self.x, self.y, self.z]))
+        return MMatrix(matrix)
+
+    def asQuaternion(self):
+        return MQuaternion.from_rotation(self.asMatrix()._values[:3, :3])
+
+
+class MQuaternion:
+    def __init__(self, x=0.0, y=0.0, z=0.0, w=1.0):
+        self.x, self.y, self.z, self.w = float(x), float(y), float(z), float(w)
+
+    @classmethod
+    def from_rotation(cls, rotation):
+        """Quaternion of a row major rotation, the transpose of the column major formula."""
+        matrix = rotation.T
+        w = math.sqrt(max(0.0, 1.0 + matrix[0, 0] + matrix[1, 1] + matrix[2, 2])) / 2.0
+        x = math.copysign(math.sqrt(max(0.0, 1.0 + matrix[0, 0] - matrix[1, 1] - matrix[2, 2])) / 2.0, matrix[2, 1] - matrix[1, 2])
+        y = math.copysign(math.sqrt(max(0.0, 1.0 - matrix[0, 0] + matrix[1, 1] - matrix[2, 2])) / 2.0, matrix[0, 2] - matrix[2, 0])
+        z = math.copysign(math.sqrt(max(0.0, 1.0 - matrix[0, 0] - matrix[1, 1] + matrix[2, 2])) / 2.0, matrix[1, 0] - matrix[0, 1])
+        return cls(x, y, z, w)
+
+    def asRotation(self):
+        x, y, z, w = self.x, self.y, self.z, self.w
+        column_major = np.array([
+            [1 - 2 * (y * y + z * z), 2 * (x * y - z * w), 2 * (x * z + y * w)],
+            [2 * (x * y + z * w), 1 - 2 * (x * x + z * z), 2 * (y * z - x * w)],
+            [2 * (x * z - y * w), 2 * (y * z + x * w), 1 - 2 * (x * x + y * y)],
+        ])
+        return column_major.T
+
+    def asEulerRotation(self):
+        from mock_maya.scene import matrix_to_euler
+
+        return MEulerRotation(*np.radians(matrix_to_euler(self.asRotation())))
+
+    def __iter__(self):
+        return iter((self.x, self.y, self.z, self.w))
+
+
+class MTransformationMatrix:
+    def __init__(self, matrix=None):
+        matrix = MMatrix(matrix)._values if matrix is not None else np.eye(4)
+        translation, rotation, scale = decompose_matrix(matrix)
+        self._translation = translation
+        self._rotation = rotation
+        self._scale = scale
+        self._shear = np.zeros(3)
+
+    def translation(self, space=MSpace.kTransform):
+        return MVector(*self._translation)
+
+    def setTranslation(self, vector, space=MSpace.kTransform):
+        self._translation = np.array(tuple(vector), dtype=float)
+        return self
+
+    def rotation(self, asQuaternion=False):
+        if asQuaternion:
+            return MQuaternion.from_rotation(self._rotation)
+        from mock_maya.scene import matrix_to_euler
+
+        return MEulerRotation(*np.radians(matrix_to_euler(self._rotation)))
+
+    def setRotation(self, rotation):
+        if isinstance(rotation, MQuaternion):
+            self._rotation = rotation.asRotation()
+        else:
+            self._rotation = rotation.asMatrix()._values[:3, :3]
+        return self
+
+    def scale(self, space=MSpace.kTransform):
+        return list(self._scale.tolist())
+
+    def setScale(self, scale, space=MSpace.kTransform):
+        self._scale = np.array(scale, dtype=float)
+        return self
+
+    def shear(self, space=MSpace.kTransform):
+        return list(self._shear.tolist())
+
+    def setShear(self, shear, space=MSpace.kTransform):
+        self._shear = np.array(shear, dtype=float)
+        return self
+
+    def asMatrix(self):
+        matrix = np.eye(4)
+        matrix[:3, :3] = np.diag(self._scale) @ self._rotation
+        matrix[3, :3] = self._translation
+        return MMatrix(matrix)
+
+
+# messages
+
+class MMessage:
+    @staticmethod
+    def removeCallback(callback_id):
+        get_scene().remove_callback(callback_id)
+
+    @staticmethod
+    def removeCallbacks(callback_ids):
+        for callback_id in callback_ids:
+            get_scene().remove_callback(callback_id)
+
+
+class MDGMessage(MMessage):
+    @staticmethod
+    def addNodeAddedCallback(func, node_type="dependNode", client_data=None):
+        def on_node_added(node):
+            if is_a(node.type, node_type):
+                func(MObject(node), client_data)
+
+        return get_scene().add_callback("node_added", on_node_added)
+
+    @staticmethod
+    def addConnectionCallback(func, client_data=None):
+        def on_connection(source, destination, made):
+            func(MPlug(*source), MPlug(*destination), made, client_data)
+
+        return get_scene().add_callback("connection", on_connection)
+
+
+class MCommandMessage(MMessage):
+    @staticmethod
+    def addCommandCallback(func, client_data=None):
+        return get_scene().add_callback("command", lambda name: func(name, client_data))
+
+
+# OpenMayaAnim
+
+class MFnSkinCluster(MFnDependencyNode):
+    def influenceObjects(self):
+        return [MDagPath(influence) for influence in self._node.data["influences"]]
+
+    def indexForInfluenceObject(self, path):
+        return self._node.data["influences"].index(path._node)
+
+    def _indices(self, components):
+        elements = components._component["elements"] if components._component else None
+        weights = _cmds.get_skin_weights(self._node)
+        return list(range(len(weights))) if elements is None else elements
+
+    def getWeights(self, path, components, influence=None):
+        weights = _cmds.get_skin_weights(self._node)[self._indices(components)]
+        if influence is not None:
+            indices = influence if isinstance(influence, (list, tuple)) else [influence]
+            return MDoubleArray(weights[:, list(indices)].ravel().tolist())
+        return MDoubleArray(weights.ravel().tolist()), weights.shape[1]
+
+    def setWeights(self, path, components, influences, weights, normalize=True, return_old_weights=False):
+        rows = self._indices(components)
+        values = np.reshape(np.asarray(weights, dtype=float), (len(rows), len(influences)))
+        current = _cmds.get_skin_weights(self._node)
+        current[np.ix_(rows, list(influences))] = values
+        if normalize:
+            current[rows] /= np.maximum(current[rows].sum(axis=1, keepdims=True), 1e-12)
+
+
+def build_modules():
+    """maya.api.OpenMaya and maya.api.OpenMayaAnim modules."""
+    this = sys.modules[__name__]
+    open_maya = placeholder_module("maya.api.OpenMaya")
+    for name in (
+        "MSpace", "MFn", "MObject", "MObjectHandle", "MDagPath", "MSelectionList", "MGlobal", "MFnBase",
+        "MFnDependencyNode", "MFnDagNode", "MPlug", "MFnMesh", "MFnNurbsCurve", "MFnSingleIndexedComponent",
+        "MFnTripleIndexedComponent", "MItMeshEdge", "MItGeometry", "MVector", "MPoint", "MPointArray", "MIntArray",
+        "MDoubleArray", "MFloatVectorArray", "MVectorArray", "MMatrix", "MEulerRotation", "MQuaternion",
+        "MTransformationMatrix", "MMessage", "MDGMessage", "MCommandMessage",
+    ):
+        setattr(open_maya, name, getattr(this, name))
+
+    open_maya_anim = placeholder_module("maya.api.OpenMayaAnim")
+    open_maya_anim.MFnSkinCluster = MFnSkinCluster
+    return open_maya, open_maya_anim
@@ -0,0 +1,1066 @@
+"""maya.cmds stand-in working on the mock scene.
+
+Only the commands and flags the rigging tools use are there, every call is
+counted and reported to command callbacks like Maya does. Flags take their
+long and short names, unknown flags are ignored.
+"""
+import copy
+import functools
+import os
+import re
+
+import numpy as np
+
+from mock_maya import scene as _scene_module
+from mock_maya.scene import (
+    VECTOR_DEFAULTS, create_box_data, create_circle_data, create_curve_data, create_sphere_data,
+    get_scene, is_a, matrix_to_euler,
+)
+
+_COMPONENT = re.compile(r"^(?P<node>[^.]+)\.(?P<kind>vtx|cv|e|f)\[(?P<start>\*|\d+)(?::(?P<end>\d+))?\]$")
+_MATRIX_SIZE = 16
+
+
+def _command(func):
+    name = func.__name__.rstrip("_")
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        get_scene().record_command(name)
+        return func(*args, **kwargs)
+
+    return wrapper
+
+
+def _flag(kwargs, long_name, short_name=None, default=None):
+    if long_name in kwargs:
+        return kwargs[long_name]
+    if short_name and short_name in kwargs:
+        return kwargs[short_name]
+    return default
+
+
+def _flatten(args):
+    items = []
+    for arg in args:
+        if isinstance(arg, (list, tuple)):
+            items.extend(_flatten(arg))
+        elif arg is not None:
+            items.append(arg)
+    return items
+
+
+def _nodes(args):
+    scene = get_scene()
+    return [scene.get(name) for name in _flatten(args)] if args else list(scene.selection)
+
+
+def _node_names(nodes, full_path=False):
+    scene = get_scene()
+    return [scene.path(node) if full_path else node.name for node in nodes]
+
+
+def _select(nodes):
+    get_scene().selection = dict.fromkeys(nodes)
+
+
+def _split_numbers(args):
+    numbers = [arg for arg in _flatten(args) if isinstance(arg, (int, float))]
+    names = [arg for arg in _flatten(args) if not isinstance(arg, (int, float))]
+    return numbers, names
+
+
+def _parse_component(name):
+    match = _COMPONENT.match(str(name))
+    if not match:
+        return None
+    node = get_scene().get(match["node"])
+    mesh = _get_geometry(node)
+    if match["start"] == "*":
+        indices = range(len(_get_points(mesh)))
+    else:
+        start = int(match["start"])
+        indices = range(start, int(match["end"] or start) + 1)
+    return mesh, match["kind"], indices
+
+
+def _get_geometry(node):
+    if node.is_shape:
+        return node
+    shapes = [shape for shape in node.get_shapes() if not shape.attrs.get("intermediateObject")]
+    if not shapes:
+        raise RuntimeError(f"{node.name} has no shape")
+    return shapes[0]
+
+
+def _get_points(shape):
+    if shape.type == "mesh":
+        return shape.data["points"]
+    return shape.data["cvs"]
+
+
+def _world_points(shape):
+    points = _get_points(shape)
+    matrix = get_scene().world_matrix(shape.parent)
+    return points @ matrix[:3, :3] + matrix[3, :3]
+
+
+# dependency graph
+
+@_command
+def createNode(node_type, name=None, n=None, parent=None, p=None, skipSelect=False, ss=False, **kwargs):
+    scene = get_scene()
+    name = name or n
+    parent = parent or p
+    parent = scene.get(parent) if parent else None
+    if node_type in _scene_module.SHAPE_TYPES and parent is None:
+        transform_name = name.replace("Shape", "") if name and "Shape" in name else f"{node_type}1"
+        parent = scene.create_node("transform", transform_name)
+        name = name or f"{parent.name}Shape"
+    node = scene.create_node(node_type, name, parent)
+    if node.type == "mesh":
+        node.data = _scene_module.create_mesh_data(np.zeros((0, 3)), [])
+    elif node.type == "nurbsCurve":
+        node.data = create_curve_data(np.zeros((0, 3)), 1, knots=[])
+    if not (skipSelect or ss):
+        _select([node])
+    return node.name
+
+
+@_command
+def setAttr(plug, *values, **kwargs):
+    scene = get_scene()
+    node, key = scene.split_plug(plug)
+    if not values:
+        return None
+    attr_type = kwargs.get("type", kwargs.get("typ"))
+    if attr_type == "matrix":
+        value = tuple(float(value) for value in _flatten(values))
+    elif attr_type in ("doubleArray", "Int32Array") and isinstance(values[0], (list, tuple)):
+        value = tuple(values[0])
+    elif attr_type in ("pointArray", "vectorArray", "doubleArray", "Int32Array"):
+        value = tuple(tuple(item) if isinstance(item, (list, tuple)) else item for item in values[1:])
+    elif len(values) == 1:
+        value = tuple(values[0]) if isinstance(values[0], (list, tuple)) else values[0]
+    else:
+        value = tuple(values)
+    if key in VECTOR_DEFAULTS:
+        value = tuple(float(item) for item in value)
+    scene.set_attr(node, key, value)
+    return None
+
+
+@_command
+def getAttr(plug, **kwargs):
+    scene = get_scene()
+    node, key = scene.split_plug(plug)
+    value = scene.get_attr(node, key)
+    if isinstance(value, tuple):
+        return list(value) if len(value) == _MATRIX_SIZE else [value]
+    return value
+
+
+@_command
+def connectAttr(source, destination, force=False, f=False, **kwargs):
+    scene = get_scene()
+    source_node, source_attr = scene.split_plug(source)
+    destination_node, destination_attr = scene.split_plug(destination)
+    scene.connect(source_node, source_attr, destination_node, destination_attr, force=force or f)
+    return f"Connected {source} to {destination}."
+
+
+@_command
+def disconnectAttr(source, destination, **kwargs):
+    scene = get_scene()
+    source_node, source_attr = scene.split_plug(source)
+    destination_node, destination_attr = scene.split_plug(destination)
+    scene.disconnect(source_node, source_attr, destination_node, destination_attr)
+
+
+@_command
+def addAttr(*args, **kwargs):
+    scene = get_scene()
+    if _flag(kwargs, "edit", "e"):
+        node, key = scene.split_plug(args[0])
+        settings = node.user_attrs.setdefault(key, {})
+        for flag, short_flag in (("minValue", "min"), ("maxValue", "max")):
+            if _flag(kwargs, flag, short_flag) is not None:
+                settings[flag] = _flag(kwargs, flag, short_flag)
+        return None
+
+    name = _flag(kwargs, "longName", "ln") or args[-1]
+    nodes = _nodes(args[:1] if "longName" in kwargs or "ln" in kwargs else args[:-1])
+    for node in nodes:
+        if name in node.user_attrs:
+            raise RuntimeError(f"Found more than one attribute named {node.name}.{name}")
+        node.user_attrs[name] = {
+            "type": _flag(kwargs, "attributeType", "at", _flag(kwargs, "dataType", "dt")),
+            "minValue": _flag(kwargs, "minValue", "min"),
+            "maxValue": _flag(kwargs, "maxValue", "max"),
+            "enumName": _flag(kwargs, "enumName", "en"),
+            "keyable": _flag(kwargs, "keyable", "k", False),
+        }
+        node.attrs[name] = _flag(kwargs, "defaultValue", "dv", 0.0)
+    return None
+
+
+@_command
+def listConnections(*args, **kwargs):
+    scene = get_scene()
+    source = _flag(kwargs, "source", "s", True)
+    destination = _flag(kwargs, "destination", "d", True)
+    node_type = _flag(kwargs, "type", "t")
+    plugs = _flag(kwargs, "plugs", "p", False)
+    connections = _flag(kwargs, "connections", "c", False)
+    shapes = _flag(kwargs, "shapes", "sh", False)
+
+    result = []
+    for item in _flatten(args):
+        node_name, _, attr = str(item).partition(".")
+        node = scene.get(node_name)
+        attr = _scene_module.normalize_attr(attr) if attr else None
+        for own_attr, other, other_attr in scene.iter_connections(node, source, destination):
+            if attr is not None and own_attr != attr and not own_attr.startswith(f"{attr}["):
+                continue
+            if node_type and not is_a(other.type, node_type):
+                continue
+            other_node = other.parent if other.is_shape and not shapes and not plugs else other
+            other_name = f"{other.name}.{other_attr}" if plugs else other_node.name
+            if connections:
+                result.append(f"{node.name}.{own_attr}")
+            result.append(other_name)
+    return result or None
+
+
+@_command
+def listHistory(*args, **kwargs):
+    scene = get_scene()
+    future = _flag(kwargs, "future", "f", False)
+    prune = _flag(kwargs, "pruneDagObjects", "pdo", False)
+    queue = []
+    for node in _nodes(args):
+        queue.append(node)
+        queue.extend(node.get_shapes())
+
+    visited = dict.fromkeys(queue)
+    index = 0
+    while index < len(queue):
+        node = queue[index]
+        index += 1
+        neighbours = (
+            [other for _, other, _ in scene.iter_connections(node, source=False)] if future
+            else [other for other, _ in node.inputs.values()]
+        )
+        for other in neighbours:
+            if other not in visited:
+                visited[other] = None
+                queue.append(other)
+    return [node.name for node in visited if not (prune and node.is_dag)] or None
+
+
+@_command
+def objExists(name):
+    node_name = str(name).partition(".")[0]
+    return get_scene().find(node_name) is not None
+
+
+@_command
+def nodeType(name, **kwargs):
+    return get_scene().get(str(name).partition(".")[0]).type
+
+
+@_command
+def objectType(name, isAType=None, isa=None, **kwargs):
+    node = get_scene().get(name)
+    base_type = isAType or isa
+    return is_a(node.type, base_type) if base_type else node.type
+
+
+@_command
+def ls(*args, **kwargs):
+    scene = get_scene()
+    node_type = _flag(kwargs, "type", "typ")
+    full_path = _flag(kwargs, "long", "l", False)
+
+    if _flag(kwargs, "selection", "sl", False):
+        items = list(scene.selection)
+    elif args:
+        items = []
+        for name in _flatten(args):
+            component = _parse_component(name)
+            if component is not None:
+                mesh, kind, indices = component
+                if _flag(kwargs, "flatten", "fl", False):
+                    items.extend(f"{mesh.parent.name}.{kind}[{index}]" for index in indices)
+                else:
+                    items.append(str(name))
+                continue
+            node = scene.find(name)
+            if node is not None:
+                items.append(node)
+    else:
+        items = list(scene.nodes.values())
+
+    result = []
+    for item in items:
+        if isinstance(item, str):
+            result.append(item)
+            continue
+        if node_type and not any(is_a(item.type, base_type) for base_type in _flatten([node_type])):
+            continue
+        if _flag(kwargs, "transforms", "tr", False) and not is_a(item.type, "transform"):
+            continue
+        if _flag(kwargs, "shapes", "s", False) and not item.is_shape:
+            continue
+        result.append(scene.path(item) if full_path and item.is_dag else item.name)
+    return result
+
+
+@_command
+def select(*args, **kwargs):
+    scene = get_scene()
+    if _flag(kwargs, "clear", "cl", False):
+        scene.selection = {}
+        return None
+    nodes = [scene.get(name) for name in _flatten(args)]
+    if _flag(kwargs, "deselect", "d", False):
+        for node in nodes:
+            scene.selection.pop(node, None)
+    elif _flag(kwargs, "add", None, False):
+        scene.selection.update(dict.fromkeys(nodes))
+    else:
+        _select(nodes)
+    return None
+
+
+@_command
+def rename(*args, ignoreShape=False, **kwargs):
+    scene = get_scene()
+    if len(args) == 1:
+        node, new_name = list(scene.selection)[-1], args[0]
+    else:
+        node, new_name = scene.get(args[0]), args[1]
+    old_base = node.name.rstrip("0123456789")
+    new_name = scene.rename(node, str(new_name))
+    if node.is_dag and not node.is_shape and not (ignoreShape or kwargs.get("ignoreShape")):
+        for shape in node.get_shapes():
+            if shape.name.startswith(old_base):
+                scene.rename(shape, f"{new_name}Shape")
+    return new_name
+
+
+@_command
+def delete(*args, **kwargs):
+    scene = get_scene()
+    nodes = _nodes(args)
+    if _flag(kwargs, "constructionHistory", "ch", False):
+        for node in nodes:
+            for shape in [node] + node.get_shapes():
+                history = listHistory.__wrapped__(shape.name, pruneDagObjects=True) or []
+                for name in history:
+                    history_node = scene.find(name)
+                    if history_node is not None and history_node.alive:
+                        scene.delete(history_node)
+        return None
+    for node in nodes:
+        scene.delete(node)
+    return None
+
+
+# dag
+
+@_command
+def listRelatives(*args, **kwargs):
+    scene = get_scene()
+    node_type = _flag(kwargs, "type")
+    result = []
+    for node in _nodes(args):
+        if _flag(kwargs, "parent", "p", False):
+            relatives = [node.parent] if node.parent is not None else []
+        elif _flag(kwargs, "allDescendents", "ad", False):
+            # deepest nodes first, like Maya
+            relatives = list(scene.iter_descendants(node))[::-1]
+        else:
+            relatives = list(node.children)
+        if _flag(kwargs, "shapes", "s", False):
+            relatives = [relative for relative in relatives if relative.is_shape]
+        if node_type:
+            relatives = [
+                relative for relative in relatives
+                if any(is_a(relative.type, base_type) for base_type in _flatten([node_type]))
+            ]
+        result.extend(relatives)
+    return _node_names(result, _flag(kwargs, "fullPath", "f", False)) or None
+
+
+@_command
+def parent(*args, **kwargs):
+    scene = get_scene()
+    names = _flatten(args)
+    if _flag(kwargs, "world", "w", False) or len(names) == 1:
+        nodes, new_parent = [scene.get(name) for name in names], None
+    else:
+        nodes, new_parent = [scene.get(name) for name in names[:-1]], scene.get(names[-1])
+    relative = _flag(kwargs, "relative", "r", False)
+
+    result = []
+    for node in nodes:
+        if not node.is_dag:
+            continue
+        if node.parent is not new_parent:
+            scene.set_parent(node, new_parent, relative=relative)
+        result.append(node.name)
+    return result
+
+
+@_command
+def group(*args, **kwargs):
+    scene = get_scene()
+    nodes = [scene.get(name) for name in _flatten(args)]
+    parent_name = _flag(kwargs, "parent", "p")
+    if parent_name:
+        new_parent = scene.get(parent_name)
+    elif nodes and not _flag(kwargs, "world", "w", False) and len({node.parent for node in nodes}) == 1:
+        new_parent = nodes[0].parent
+    else:
+        new_parent = None
+    group_node = scene.create_node("transform", _flag(kwargs, "name", "n", "group1"), new_parent)
+    for node in nodes:
+        scene.set_parent(node, group_node)
+    _select([group_node])
+    return group_node.name
+
+
+@_command
+def duplicate(*args, **kwargs):
+    scene = get_scene()
+    name = _flag(kwargs, "name", "n")
+    result = []
+    for node in _nodes(args):
+        duplicated = _duplicate_tree(node, node.parent, name)
+        result.append(duplicated.name)
+        if not _flag(kwargs, "returnRootsOnly", "rr", False):
+            result.extend(child.name for child in scene.iter_descendants(duplicated))
+    _select([scene.get(result[0])] if result else [])
+    return result
+
+
+def _duplicate_tree(node, new_parent, name=None):
+    scene = get_scene()
+    duplicated = scene.create_node(node.type, name or node.name, new_parent)
+    duplicated.attrs = dict(node.attrs)
+    duplicated.user_attrs = copy.deepcopy(node.user_attrs)
+    duplicated.data = copy.deepcopy(node.data)
+    for child in list(node.children):
+        _duplicate_tree(child, duplicated)
+    return duplicated
+
+
+# transforms
+
+@_command
+def xform(*args, **kwargs):
+    scene = get_scene()
+    query = _flag(kwargs, "query", "q", False)
+    world_space = _flag(kwargs, "worldSpace", "ws", False)
+    translation = _flag(kwargs, "translation", "t")
+    rotation = _flag(kwargs, "rotation", "ro")
+    matrix = _flag(kwargs, "matrix", "m")
+    relative = _flag(kwargs, "relative", "r", False)
+    names = _flatten(args) or [node.name for node in scene.selection]
+
+    if query:
+        components = [_parse_component(name) for name in names]
+        if all(components):
+            return [
+                float(value)
+                for mesh, _, indices in components
+                for value in ((_world_points(mesh) if world_space else _get_points(mesh))[list(indices)]).ravel()
+            ]
+        node = scene.get(names[0])
+        if translation:
+            return scene.world_matrix(node)[3, :3].tolist() if world_space else list(node.attrs.get("translate", (0.0,) * 3))
+        if rotation:
+            if not world_space:
+                return list(node.attrs.get("rotate", (0.0,) * 3))
+            axes = scene.world_matrix(node)[:3, :3]
+            return list(matrix_to_euler(axes / np.linalg.norm(axes, axis=1, keepdims=True)))
+        if matrix:
+            values = scene.world_matrix(node) if world_space else scene.local_matrix(node)
+            return values.ravel().tolist()
+        if _flag(kwargs, "scale", "s"):
+            return list(node.attrs.get("scale", (1.0,) * 3))
+        return None
+
+    for node in [scene.get(name) for name in names]:
+        if translation is not None:
+            if world_space:
+                position = np.asarray(translation, dtype=float)
+                if relative:
+                    position = position + scene.world_matrix(node)[3, :3]
+                scene.set_world_translation(node, position)
+            else:
+                _set_vector(node, "translate", translation, relative)
+        if rotation is not None:
+            if world_space:
+                scene.set_world_rotation(node, rotation)
+            else:
+                _set_vector(node, "rotate", rotation, relative)
+        if matrix is not None:
+            values = np.reshape(np.asarray(matrix, dtype=float), (4, 4))
+            if not world_space:
+                values = values @ scene.parent_matrix(node)
+            scene.set_world_matrix(node, values)
+        if _flag(kwargs, "scale", "s") is not None:
+            _set_vector(node, "scale", _flag(kwargs, "scale", "s"), False)
+    return None
+
+
+def _set_vector(node, attr, values, relative=False):
+    values = [float(value) for value in values]
+    if relative:
+        values = [old + value for old, value in zip(node.attrs.get(attr, VECTOR_DEFAULTS[attr]), values)]
+    node.attrs[attr] = tuple(values)
+
+
+@_command
+def move(*args, **kwargs):
+    scene = get_scene()
+    values, names = _split_numbers(args)
+    relative = _flag(kwargs, "relative", "r", False)
+    for node in [scene.get(name) for name in names] or list(scene.selection):
+        if relative and _flag(kwargs, "objectSpace", "os", False):
+            axes = scene.local_matrix(node)[:3, :3]
+            axes = axes / np.linalg.norm(axes, axis=1, keepdims=True)
+            _set_vector(node, "translate", np.asarray(values, dtype=float) @ axes, relative=True)
+        elif relative:
+            scene.set_world_translation(node, scene.world_matrix(node)[3, :3] + values)
+        else:
+            scene.set_world_translation(node, values)
+
+
+@_command
+def rotate(*args, **kwargs):
+    scene = get_scene()
+    values, names = _split_numbers(args)
+    for node in [scene.get(name) for name in names] or list(scene.selection):
+        if _flag(kwargs, "relative", "r", False):
+            _set_vector(node, "rotate", values, relative=True)
+        elif _flag(kwargs, "worldSpace", "ws", False):
+            scene.set_world_rotation(node, values)
+        else:
+            _set_vector(node, "rotate", values)
+
+
+@_command
+def scale(*args, **kwargs):
+    scene = get_scene()
+    values, names = _split_numbers(args)
+    for node in [scene.get(name) for name in names] or list(scene.selection):
+        if _flag(kwargs, "relative", "r", False):
+            values = [old * value for old, value in zip(node.attrs.get("scale", (1.0,) * 3), values)]
+        _set_vector(node, "scale", values)
+
+
+@_command
+def makeIdentity(*args, **kwargs):
+    """Freeze transforms into the shapes and children, joints keep their rotation as jointOrient."""
+    scene = get_scene()
+    if not _flag(kwargs, "apply", "a", False):
+        return None
+    freeze = {
+        "translate": _flag(kwargs, "translate", "t", True),
+        "rotate": _flag(kwargs, "rotate", "r", True),
+        "scale": _flag(kwargs, "scale", "s", True),
+    }
+    for node in _nodes(args):
+        old_matrix = scene.local_matrix(node)
+        child_matrices = {child: scene.world_matrix(child) for child in node.children if not child.is_shape}
+        if freeze["rotate"] and node.type == "joint":
+            axes = old_matrix[:3, :3] / np.linalg.norm(old_matrix[:3, :3], axis=1, keepdims=True)
+            node.attrs["jointOrient"] = matrix_to_euler(axes)
+            node.attrs["rotate"] = VECTOR_DEFAULTS["rotate"]
+        for attr, frozen in freeze.items():
+            if frozen and not (attr == "rotate" and node.type == "joint"):
+                node.attrs[attr] = VECTOR_DEFAULTS[attr]
+
+        baked = old_matrix @ np.linalg.inv(scene.local_matrix(node))
+        for shape in node.get_shapes():
+            if shape.data and shape.type in ("mesh", "nurbsCurve") and len(_get_points(shape)):
+                points = _get_points(shape) @ baked[:3, :3] + baked[3, :3]
+                shape.data = {**shape.data, ("points" if shape.type == "mesh" else "cvs"): points}
+                shape.data.pop("normals", None)
+        for child, matrix in child_matrices.items():
+            scene.set_world_matrix(child, matrix)
+    return None
+
+
+@_command
+def matchTransform(*args, **kwargs):
+    scene = get_scene()
+    nodes = _nodes(args)
+    flags = [_flag(kwargs, "position", "pos"), _flag(kwargs, "rotation", "rot"), _flag(kwargs, "scale", "scl")]
+    translate, rotate_flag, scale_flag = [bool(flag) for flag in flags] if any(flags) else [True] * 3
+    target = scene.world_matrix(nodes[-1])
+    for node in nodes[:-1]:
+        scene.set_world_matrix(node, target, translate=translate, rotate=rotate_flag, scale=scale_flag)
+
+
+@_command
+def joint(*args, **kwargs):
+    scene = get_scene()
+    if _flag(kwargs, "edit", "e", False) or _flag(kwargs, "query", "q", False):
+        return None
+    # new joints go below the selected joint
+    selected_joints = [node for node in scene.selection if node.type == "joint"]
+    node = scene.create_node("joint", _flag(kwargs, "name", "n", "joint1"), selected_joints[-1] if selected_joints else None)
+    position = _flag(kwargs, "position", "p")
+    if position is not None:
+        scene.set_world_translation(node, position)
+    _select([node])
+    return node.name
+
+
+# geometry
+
+def _create_geometry(transform_name, shape_type, data, maker_type=None, maker_attr=None, ch=True):
+    scene = get_scene()
+    transform = scene.create_node("transform", transform_name)
+    shape = scene.create_node(shape_type, f"{transform.name}Shape", transform)
+    shape.data = data
+    result = [transform.name]
+    if ch and maker_type:
+        maker = scene.create_node(maker_type)
+        scene.connect(maker, maker_attr, shape, "inMesh" if shape_type == "mesh" else "create")
+        result.append(maker.name)
+    _select([transform])
+    return result
+
+
+@_command
+def circle(*args, **kwargs):
+    data = create_circle_data(
+        _flag(kwargs, "radius", "r", 1.0), _flag(kwargs, "normal", "nr", (0, 0, 1)), _flag(kwargs, "sections", "s", 8)
+    )
+    return _create_geometry(
+        _flag(kwargs, "name", "n", "nurbsCircle1"), "nurbsCurve", data, "makeNurbCircle", "outputCurve",
+        _flag(kwargs, "constructionHistory", "ch", True)
+    )
+
+
+@_command
+def curve(*args, **kwargs):
+    data = create_curve_data(
+        _flag(kwargs, "point", "p"), _flag(kwargs, "degree", "d", 3), _flag(kwargs, "knot", "k"),
+        _flag(kwargs, "bezier", "bez", False)
+    )
+    return _create_geometry(_flag(kwargs, "name", "n", "curve1"), "nurbsCurve", data, ch=False)[0]
+
+
+@_command
+def closeCurve(*args, **kwargs):
+    return [get_scene().get(name).name for name in _flatten(args)]
+
+
+@_command
+def loft(*args, **kwargs):
+    scene = get_scene()
+    curves = [_get_geometry(scene.get(name)) for name in _flatten(args)]
+    result = _create_geometry(
+        _flag(kwargs, "name", "n", "loftedSurface1"), "nurbsSurface", {}, "loft", "outputSurface",
+        _flag(kwargs, "constructionHistory", "ch", True)
+    )
+    if len(result) > 1:
+        loft_node = scene.get(result[1])
+        for index, curve_shape in enumerate(curves):
+            scene.connect(curve_shape, "worldSpace[0]", loft_node, f"inputCurve[{index}]")
+    return result
+
+
+@_command
+def nurbsPlane(*args, **kwargs):
+    return _create_geometry(
+        _flag(kwargs, "name", "n", "nurbsPlane1"), "nurbsSurface", {}, "makeNurbPlane", "outputSurface",
+        _flag(kwargs, "constructionHistory", "ch", True)
+    )
+
+
+@_command
+def polySphere(*args, **kwargs):
+    data = create_sphere_data(
+        _flag(kwargs, "radius", "r", 1.0),
+        _flag(kwargs, "subdivisionsX", "sx", _flag(kwargs, "subdivisionsAxis", "sa", 20)),
+        _flag(kwargs, "subdivisionsY", "sy", _flag(kwargs, "subdivisionsHeight", "sh", 20)),
+        _flag(kwargs, "axis", "ax", (0, 1, 0)),
+    )
+    return _create_geometry(
+        _flag(kwargs, "name", "n", "pSphere1"), "mesh", data, "polySphere", "output",
+        _flag(kwargs, "constructionHistory", "ch", True)
+    )
+
+
+@_command
+def polyCube(*args, **kwargs):
+    data = create_box_data(
+        _flag(kwargs, "width", "w", 1.0),
+        _flag(kwargs, "height", "h", 1.0),
+        _flag(kwargs, "depth", "d", 1.0),
+        (_flag(kwargs, "subdivisionsX", "sx", _flag(kwargs, "subdivisionsWidth", "sw", 1)),
+         _flag(kwargs, "subdivisionsY", "sy", _flag(kwargs, "subdivisionsHeight", "sh", 1)),
+         _flag(kwargs, "subdivisionsZ", "sz", _flag(kwargs, "subdivisionsDepth", "sd", 1))),
+    )
+    return _create_geometry(
+        _flag(kwargs, "name", "n", "pCube1"), "mesh", data, "polyCube", "output",
+        _flag(kwargs, "constructionHistory", "ch", True)
+    )
+
+
+@_command
+def polySmooth(*args, **kwargs):
+    """Adds the history node only, the topology stays as it is."""
+    scene = get_scene()
+    smooth = scene.create_node("polySmoothFace")
+    for node in _nodes(args):
+        shape = _get_geometry(node)
+        previous = shape.inputs.get("inMesh")
+        if previous is not None:
+            scene.connect(previous[0], previous[1], smooth, "inputPolymesh")
+        scene.connect(smooth, "output", shape, "inMesh", force=True)
+    return [smooth.name]
+
+
+@_command
+def spaceLocator(*args, **kwargs):
+    scene = get_scene()
+    transform = scene.create_node("transform", _flag(kwargs, "name", "n", "locator1"))
+    scene.create_node("locator", f"{transform.name}Shape", transform)
+    position = _flag(kwargs, "position", "p")
+    if position is not None:
+        transform.attrs["translate"] = tuple(float(value) for value in position)
+    _select([transform])
+    return [transform.name]
+
+
+# deformers
+
+def _bind_geometry(deformer, shape, index=0):
+    """Move the shape input to an orig shape feeding the deformer, like Maya's deformer chain."""
+    scene = get_scene()
+    orig = next((child for child in shape.parent.children if child.name == f"{shape.name}Orig"), None)
+    if orig is None:
+        orig = scene.create_node(shape.type, f"{shape.name}Orig", shape.parent)
+        orig.attrs["intermediateObject"] = True
+        orig.data = shape.data
+        previous = shape.inputs.get("inMesh")
+        if previous is not None:
+            scene.disconnect(previous[0], previous[1], shape, "inMesh")
+            scene.connect(previous[0], previous[1], orig, "inMesh")
+        upstream = (orig, "worldMesh[0]")
+    else:
+        upstream = shape.inputs.get("inMesh", (orig, "worldMesh[0]"))
+        scene.disconnect(upstream[0], upstream[1], shape, "inMesh")
+
+    group_id = scene.create_node("groupId")
+    group_parts = scene.create_node("groupParts")
+    scene.connect(upstream[0], upstream[1], group_parts, "inputGeometry")
+    scene.connect(group_id, "groupId", group_parts, "groupId")
+    scene.connect(group_parts, "outputGeometry", deformer, f"input[{index}].inputGeometry")
+    scene.connect(group_id, "groupId", deformer, f"input[{index}].groupId")
+    scene.connect(deformer, f"outputGeometry[{index}]", shape, "inMesh", force=True)
+
+
+def _get_skin_shape(node):
+    return node if node.is_shape else _get_geometry(node)
+
+
+@_command
+def skinCluster(*args, **kwargs):
+    scene = get_scene()
+    if _flag(kwargs, "query", "q", False):
+        skin = scene.get(_flatten(args)[0])
+        if _flag(kwargs, "influence", "inf", False):
+            return [influence.name for influence in skin.data["influences"]]
+        if _flag(kwargs, "geometry", "g", False):
+            return [skin.data["geometry"].name]
+        return None
+    if _flag(kwargs, "edit", "e", False):
+        if _flag(kwargs, "unbind", "ub", False):
+            skin = scene.get(_flatten(args)[0])
+            _unbind(skin)
+        return None
+
+    nodes = [scene.get(name) for name in _flatten(args)] or list(scene.selection)
+    influences = [node for node in nodes if node.type == "joint" or (node.is_dag and not node.get_shapes() and not node.is_shape)]
+    geometry = [_get_skin_shape(node) for node in nodes if node not in influences]
+    result = []
+    for shape in geometry:
+        if any(is_a(other.type, "skinCluster") for other, _ in shape.inputs.values()):
+            raise RuntimeError(f"Skin on {shape.name} was already bound")
+        skin = scene.create_node("skinCluster", _flag(kwargs, "name", "n", "skinCluster1"))
+        skin.data = {"influences": list(influences), "geometry": shape, "weights": None}
+        for index, influence in enumerate(influences):
+            scene.connect(influence, "worldMatrix[0]", skin, f"matrix[{index}]")
+            scene.connect(influence, "lockInfluenceWeights", skin, f"lockWeights[{index}]")
+            scene.connect(influence, "objectColorRGB", skin, f"influenceColor[{index}]")
+        _bind_geometry(skin, shape)
+        result.append(skin.name)
+    return result
+
+
+def _unbind(skin):
+    scene = get_scene()
+    shape = skin.data["geometry"]
+    for attr, (other, _) in list(skin.inputs.items()):
+        if other.type in ("groupParts", "groupId"):
+            scene.delete(other)
+    scene.delete(skin)
+    orig = scene.find(f"{shape.name}Orig")
+    if orig is not None and not orig.outputs:
+        scene.delete(orig)
+
+
+def get_skin_weights(skin):
+    """Dense (vertices, influences) weights, bound with the two closest influences by default."""
+    if skin.data["weights"] is None:
+        scene = get_scene()
+        points = _world_points(skin.data["geometry"])
+        influences = np.array([scene.world_matrix(influence)[3, :3] for influence in skin.data["influences"]])
+        distances = np.linalg.norm(points[:, None, :] - influences[None, :, :], axis=-1)
+        closest = np.argsort(distances, axis=1)[:, :2]
+        inverse = 1.0 / np.maximum(np.take_along_axis(distances, closest, axis=1), 1e-6)
+        weights = np.zeros_like(distances)
+        np.put_along_axis(weights, closest, inverse / inverse.sum(axis=1, keepdims=True), axis=1)
+        skin.data["weights"] = weights
+    return skin.data["weights"]
+
+
+@_command
+def skinPercent(skin_name, *components, **kwargs):
+    scene = get_scene()
+    skin = scene.get(skin_name)
+    weights = get_skin_weights(skin)
+    influences = skin.data["influences"]
+    indices = [index for component in _flatten(components) for index in _parse_component(component)[2]]
+    if _flag(kwargs, "query", "q", False):
+        transform = _flag(kwargs, "transform", "t")
+        if transform is not None:
+            return float(weights[indices[0], influences.index(scene.get(transform))])
+        return weights[indices[0]].tolist()
+    for influence_name, value in _flag(kwargs, "transformValue", "tv", []):
+        weights[indices, influences.index(scene.get(influence_name))] = value
+    return None
+
+
+@_command
+def copySkinWeights(*args, **kwargs):
+    """Copies by vertex index and influence, enough for weight sizes and counts."""
+    scene = get_scene()
+    source = scene.get(_flag(kwargs, "sourceSkin", "ss"))
+    destination = scene.get(_flag(kwargs, "destinationSkin", "ds"))
+    source_weights = get_skin_weights(source)
+    vertex_count = len(_get_points(destination.data["geometry"]))
+    rows = source_weights[np.arange(vertex_count) % len(source_weights)]
+    weights = np.zeros((vertex_count, len(destination.data["influences"])))
+    for index, influence in enumerate(destination.data["influences"]):
+        if influence in source.data["influences"]:
+            weights[:, index] = rows[:, source.data["influences"].index(influence)]
+    destination.data["weights"] = weights
+
+
+@_command
+def deformer(*args, **kwargs):
+    scene = get_scene()
+    node = scene.create_node(_flag(kwargs, "type"), _flag(kwargs, "name", "n"))
+    for index, geometry in enumerate(_nodes(args)):
+        _bind_geometry(node, _get_skin_shape(geometry), index)
+    return [node.name]
+
+
+# constraints
+
+_CONSTRAINT_INPUTS = {
+    "parentConstraint": (
+        ["translate", "rotate", "scale", "rotatePivot", "rotatePivotTranslate", "rotateOrder"],
+        ["rotatePivot", "rotatePivotTranslate", "rotateOrder"],
+        ["Translate", "Rotate"],
+    ),
+    "pointConstraint": (["translate", "rotatePivot", "rotatePivotTranslate"], ["rotatePivot", "rotatePivotTranslate"], ["Translate"]),
+    "orientConstraint": (["rotate", "rotateOrder"], ["rotateOrder"], ["Rotate"]),
+    "scaleConstraint": (["scale"], [], ["Scale"]),
+    "aimConstraint": (["translate", "rotatePivot", "rotatePivotTranslate"], ["translate", "rotatePivot", "rotateOrder"], ["Rotate"]),
+    "poleVectorConstraint": (["translate", "rotatePivot", "rotatePivotTranslate"], [], ["PoleVector"]),
+}
+
+
+def _constrain(constraint_type, args, kwargs):
+    scene = get_scene()
+    nodes = _nodes(args)
+    targets, driven = nodes[:-1], nodes[-1]
+    name = _flag(kwargs, "name", "n", f"{driven.name}_{constraint_type}1")
+    constraint = scene.create_node(constraint_type, name, driven)
+    target_attrs, driven_attrs, outputs = _CONSTRAINT_INPUTS[constraint_type]
+    skipped = {
+        "Translate": _flatten([_flag(kwargs, "skipTranslate", "st", [])]),
+        "Rotate": _flatten([_flag(kwargs, "skipRotate", "sr", [])]),
+    }
+
+    weight = _flag(kwargs, "weight", "w", 1.0)
+    for index, target in enumerate(targets):
+        constraint.attrs[f"w{index}"] = weight
+        constraint.user_attrs[f"w{index}"] = {"type": "double", "alias": f"{target.name}W{index}"}
+        scene.connect(constraint, f"w{index}", constraint, f"target[{index}].targetWeight")
+        scene.connect(target, "parentMatrix[0]", constraint, f"target[{index}].targetParentMatrix")
+        for attr in target_attrs + (["jointOrient"] if target.type == "joint" and "rotate" in target_attrs else []):
+            scene.connect(target, attr, constraint, f"target[{index}].target{attr[0].upper()}{attr[1:]}")
+
+    scene.connect(driven, "parentInverseMatrix[0]", constraint, "constraintParentInverseMatrix")
+    for attr in driven_attrs:
+        scene.connect(driven, attr, constraint, f"constraint{attr[0].upper()}{attr[1:]}")
+    if constraint_type == "aimConstraint" and _flag(kwargs, "worldUpObject", "wuo"):
+        scene.connect(scene.get(_flag(kwargs, "worldUpObject", "wuo")), "worldMatrix[0]", constraint, "worldUpMatrix")
+    for output in outputs:
+        for axis in "XYZ":
+            if axis.lower() in skipped.get(output, []) or "all" in skipped.get(output, []):
+                continue
+            driven_attr = f"poleVector{axis}" if output == "PoleVector" else f"{output.lower()}{axis}"
+            scene.connect(constraint, f"constraint{output}{axis}", driven, driven_attr, force=True)
+
+    if not _flag(kwargs, "maintainOffset", "mo", False) and constraint_type in ("parentConstraint", "pointConstraint", "orientConstraint"):
+        _snap_to_targets(driven, targets, "Translate" in outputs and not skipped["Translate"], "Rotate" in outputs and not skipped["Rotate"])
+    return [constraint.name]
+
+
+def _snap_to_targets(driven, targets, translate, rotate):
+    """What the constraint evaluates to, averaged positions and the rotation of the first target."""
+    scene = get_scene()
+    matrices = [scene.world_matrix(target) for target in targets]
+    matrix = scene.world_matrix(driven)
+    if translate:
+        matrix[3, :3] = np.mean([target_matrix[3, :3] for target_matrix in matrices], axis=0)
+    if rotate:
+        scale_values = np.linalg.norm(matrix[:3, :3], axis=1)
+        axes = matrices[0][:3, :3] / np.linalg.norm(matrices[0][:3, :3], axis=1, keepdims=True)
+        matrix[:3, :3] = np.diag(scale_values) @ axes
+    scene.set_world_matrix(driven, matrix, translate=translate, rotate=rotate, scale=False)
+
+
+@_command
+def parentConstraint(*args, **kwargs):
+    return _constrain("parentConstraint", args, kwargs)
+
+
+@_command
+def pointConstraint(*args, **kwargs):
+    return _constrain("pointConstraint", args, kwargs)
+
+
+@_command
+def orientConstraint(*args, **kwargs):
+    return _constrain("orientConstraint", args, kwargs)
+
+
+@_command
+def scaleConstraint(*args, **kwargs):
+    return _constrain("scaleConstraint", args, kwargs)
+
+
+@_command
+def aimConstraint(*args, **kwargs):
+    return _constrain("aimConstraint", args, kwargs)
+
+
+@_command
+def poleVectorConstraint(*args, **kwargs):
+    return _constrain("poleVectorConstraint", args, kwargs)
+
+
+@_command
+def ikHandle(*args, **kwargs):
+    scene = get_scene()
+    start = scene.get(_flag(kwargs, "startJoint", "sj"))
+    end = scene.get(_flag(kwargs, "endEffector", "ee"))
+    solver_name = _flag(kwargs, "solver", "sol", "ikRPsolver")
+    solver = scene.find(solver_name) or scene.create_node(solver_name, solver_name)
+
+    effector = scene.create_node("ikEffector", "effector1", end.parent)
+    handle = scene.create_node("ikHandle", _flag(kwargs, "name", "n", "ikHandle1"))
+    end_position = scene.world_matrix(end)[3, :3]
+    scene.set_world_translation(effector, end_position)
+    scene.set_world_translation(handle, end_position)
+
+    scene.connect(end, "translate", effector, "translate")
+    scene.connect(start, "message", handle, "startJoint")
+    scene.connect(effector, "handlePath[0]", handle, "endEffector")
+    scene.connect(solver, "message", handle, "ikSolver")
+    _select([handle])
+    return [handle.name, effector.name]
+
+
+# session
+
+@_command
+def undoInfo(*args, **kwargs):
+    return None
+
+
+@_command
+def refresh(*args, **kwargs):
+    return None
+
+
+@_command
+def dgeval(*args, **kwargs):
+    return None
+
+
+@_command
+def pluginInfo(name, **kwargs):
+    plugin = os.path.splitext(os.path.basename(str(name)))[0]
+    return plugin in get_scene().plugins
+
+
+@_command
+def loadPlugin(path, **kwargs):
+    plugin = os.path.splitext(os.path.basename(str(path)))[0]
+    get_scene().plugins.add(plugin)
+    return [plugin]
+
+
+@_command
+def file(*args, **kwargs):
+    if _flag(kwargs, "new", "f", False):
+        get_scene().reset()
+    return None
+
+
+@_command
+def currentTime(*args, **kwargs):
+    scene = get_scene()
+    if _flag(kwargs, "query", "q", False):
+        return getattr(scene, "time", 1.0)
+    scene.time = float(args[0])
+    return scene.time
+
+
+@_command
+def playbackOptions(**kwargs):
+    if _flag(kwargs, "minTime", "min", False):
+        return 1.0
+    if _flag(kwargs, "maxTime", "max", False):
+        return 120.0
+    return None
+
+
+@_command
+def setKeyframe(*args, **kwargs):
+    return 1
+
+
+@_command
+def sets(*args, **kwargs):
+    return None
+
+
+@_command
+def warning(*args, **kwargs):
+    return None
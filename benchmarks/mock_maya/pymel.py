@@ -0,0 +1,538 @@
+"""pymel.core stand-in wrapping the mock maya.cmds.
+
+Every pm command calls its cmds counterpart once, so command counts match
+what Maya reports for PyMEL code. PyNode methods reading geometry or
+transforms go through the API and aren't counted, like in PyMEL.
+"""
+import functools
+import math
+import types
+
+import numpy as np
+
+from mock_maya import api
+from mock_maya import cmds
+from mock_maya.scene import get_scene, normalize_attr
+
+
+class MayaNodeError(ValueError):
+    pass
+
+
+class MayaAttributeError(AttributeError):
+    pass
+
+
+_SPACES = {"world": api.MSpace.kWorld, "object": api.MSpace.kObject, "transform": api.MSpace.kTransform}
+
+
+def _to_string(value):
+    if isinstance(value, (PyNode, Attribute, Component)):
+        return str(value)
+    if isinstance(value, _Vector):
+        return list(value)
+    if isinstance(value, (list, tuple)) and any(isinstance(item, (PyNode, Attribute, Component, _Vector)) for item in value):
+        return [_to_string(item) for item in value]
+    return value
+
+
+def _to_pymel(value):
+    if isinstance(value, list):
+        return [_to_pymel(item) for item in value]
+    if isinstance(value, str):
+        scene = get_scene()
+        node_name, _, attr = value.partition(".")
+        node = scene.find(node_name)
+        if node is None:
+            return value
+        return PyNode(node) if not attr else PyNode(value)
+    return value
+
+
+class PyNode:
+    """Node reference following renames, dotted names give an Attribute or Component."""
+
+    def __new__(cls, name, *args):
+        if isinstance(name, PyNode):
+            return name
+        if isinstance(name, str) and "." in name:
+            if cmds._COMPONENT.match(name.rsplit("|", 1)[-1]):
+                return Component(name)
+            node_name, _, attr = name.partition(".")
+            return Attribute(PyNode(node_name), attr)
+        node = name if not isinstance(name, str) else get_scene().find(name)
+        if node is None:
+            raise MayaNodeError(f"No object matches name: {name}")
+        instance = object.__new__(cls)
+        instance._node = node
+        return instance
+
+    def __str__(self):
+        return self._node.name
+
+    def __repr__(self):
+        return f"nt.{self._node.type[0].upper()}{self._node.type[1:]}({self._node.name!r})"
+
+    def __eq__(self, other):
+        if isinstance(other, PyNode):
+            return self._node is other._node
+        if isinstance(other, str):
+            return other in (self._node.name, self.longName())
+        return False
+
+    def __hash__(self):
+        return hash(id(self._node))
+
+    def __add__(self, other):
+        return str(self) + str(other)
+
+    def __radd__(self, other):
+        return str(other) + str(self)
+
+    def __format__(self, spec):
+        return format(str(self), spec)
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return Attribute(self, name)
+
+    # names and attributes
+
+    def name(self, *args, **kwargs):
+        return self._node.name
+
+    def nodeName(self):
+        return self._node.name
+
+    def longName(self):
+        return get_scene().path(self._node) if self._node.is_dag else self._node.name
+
+    fullPath = longName
+
+    def nodeType(self):
+        return self._node.type
+
+    type = nodeType
+
+    def exists(self):
+        return self._node.alive
+
+    def attr(self, name):
+        return Attribute(self, name)
+
+    def hasAttr(self, name):
+        return name in self._node.attrs or name in self._node.user_attrs
+
+    def getAttr(self, name, **kwargs):
+        return getAttr(f"{self}.{name}", **kwargs)
+
+    def setAttr(self, name, *values, **kwargs):
+        return setAttr(f"{self}.{name}", *values, **kwargs)
+
+    def addAttr(self, name, **kwargs):
+        return addAttr(self, longName=name, **kwargs)
+
+    def rename(self, name, **kwargs):
+        return rename(self, name, **kwargs)
+
+    def duplicate(self, **kwargs):
+        return duplicate(self, **kwargs)
+
+    # hierarchy
+
+    def getShape(self, **kwargs):
+        shapes = self.getShapes(**kwargs)
+        return shapes[0] if shapes else None
+
+    def getShapes(self, **kwargs):
+        return [PyNode(shape) for shape in self._node.get_shapes()]
+
+    def getTransform(self):
+        return PyNode(self._node.parent) if self._node.is_shape else self
+
+    def getParent(self, *args, **kwargs):
+        return PyNode(self._node.parent) if self._node.parent is not None else None
+
+    def getChildren(self, **kwargs):
+        return listRelatives(self, children=True, **kwargs)
+
+    def listRelatives(self, **kwargs):
+        return listRelatives(self, **kwargs)
+
+    def listConnections(self, **kwargs):
+        return listConnections(self, **kwargs)
+
+    def listHistory(self, **kwargs):
+        return listHistory(self, **kwargs)
+
+    def setParent(self, *args, **kwargs):
+        if not args or args[0] is None:
+            return parent(self, world=True, **kwargs)
+        return parent(self, args[0], **kwargs)
+
+    def addChild(self, child, **kwargs):
+        parent(child, self, **kwargs)
+        return PyNode(child)
+
+    # geometry, read through the api without commands
+
+    def _mesh(self):
+        return api.MFnMesh(api.MObject(self._node))
+
+    def numVertices(self):
+        return self._mesh().numVertices
+
+    def getPoint(self, index, space="preTransform"):
+        point = self._mesh().getPoint(index, _SPACES.get(space, api.MSpace.kObject))
+        return datatypes.Point(point.x, point.y, point.z)
+
+    def getPoints(self, space="preTransform"):
+        return [datatypes.Point(*point) for point in self._mesh().getPoints(_SPACES.get(space, api.MSpace.kObject))]
+
+    def getVertexNormal(self, index, angleWeighted=False, space="preTransform"):
+        normal = self._mesh().getVertexNormal(index, angleWeighted, _SPACES.get(space, api.MSpace.kObject))
+        return datatypes.Vector(normal.x, normal.y, normal.z)
+
+    def vtx(self):
+        return [Component(f"{self.getTransform()}.vtx[{index}]") for index in range(self.numVertices())]
+
+    # transforms
+
+    def getTranslation(self, space="transform", **kwargs):
+        scene = get_scene()
+        if space == "world":
+            return datatypes.Vector(*scene.world_matrix(self._node)[3, :3])
+        return datatypes.Vector(*self._node.attrs.get("translate", (0.0, 0.0, 0.0)))
+
+    def setTranslation(self, vector, space="transform", **kwargs):
+        scene = get_scene()
+        if space == "world":
+            scene.set_world_translation(self._node, list(vector))
+        else:
+            self._node.attrs["translate"] = tuple(float(value) for value in vector)
+
+    def getRotation(self, space="transform", **kwargs):
+        return datatypes.Vector(*self._node.attrs.get("rotate", (0.0, 0.0, 0.0)))
+
+    def setRotation(self, rotation, space="transform", **kwargs):
+        rotation = [float(value) for value in rotation]
+        if space == "world":
+            get_scene().set_world_rotation(self._node, rotation)
+        else:
+            self._node.attrs["rotate"] = tuple(rotation)
+
+    def getMatrix(self, worldSpace=False, **kwargs):
+        scene = get_scene()
+        values = scene.world_matrix(self._node) if worldSpace else scene.local_matrix(self._node)
+        return api.MMatrix(values)
+
+    # skin clusters
+
+    def influenceObjects(self):
+        return [PyNode(influence) for influence in self._node.data["influences"]]
+
+    def getInfluence(self):
+        return self.influenceObjects()
+
+    def indexForInfluenceObject(self, influence):
+        return self._node.data["influences"].index(PyNode(influence)._node)
+
+
+class Attribute:
+    def __init__(self, node, attr):
+        self._pynode = node if isinstance(node, PyNode) else PyNode(node)
+        self._attr = attr
+
+    def __str__(self):
+        return f"{self._pynode}.{self._attr}"
+
+    def __repr__(self):
+        return f"Attribute({str(self)!r})"
+
+    def __eq__(self, other):
+        if isinstance(other, Attribute):
+            return self._pynode == other._pynode and normalize_attr(self._attr) == normalize_attr(other._attr)
+        return str(self) == other
+
+    def __hash__(self):
+        return hash((id(self._pynode._node), normalize_attr(self._attr)))
+
+    def __add__(self, other):
+        return str(self) + str(other)
+
+    def __getitem__(self, index):
+        return Attribute(self._pynode, f"{self._attr}[{index}]")
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return Attribute(self._pynode, f"{self._attr}.{name}")
+
+    def __call__(self, *args, **kwargs):
+        raise MayaAttributeError(f"{self} is an attribute, {self._attr} is no method of {self._pynode!r}")
+
+    def node(self):
+        return self._pynode
+
+    def plugNode(self):
+        return self._pynode
+
+    def name(self):
+        return str(self)
+
+    def attrName(self, longName=False):
+        return self._attr.rsplit(".", 1)[-1]
+
+    def get(self, **kwargs):
+        return getAttr(self, **kwargs)
+
+    def set(self, *values, **kwargs):
+        return setAttr(self, *values, **kwargs)
+
+    def connect(self, destination, force=False, **kwargs):
+        return connectAttr(self, destination, force=force, **kwargs)
+
+    def disconnect(self, destination=None, **kwargs):
+        if destination is None:
+            source = self._pynode._node.inputs.get(normalize_attr(self._attr))
+            return disconnectAttr(f"{source[0].name}.{source[1]}", self) if source else None
+        return disconnectAttr(self, destination)
+
+    def __rshift__(self, destination):
+        self.connect(destination, force=True)
+
+    def isConnected(self):
+        return normalize_attr(self._attr) in self._pynode._node.inputs
+
+    def inputs(self, **kwargs):
+        return listConnections(self, source=True, destination=False, **kwargs)
+
+    def outputs(self, **kwargs):
+        return listConnections(self, source=False, destination=True, **kwargs)
+
+    def setMin(self, value):
+        cmds.addAttr(str(self), edit=True, minValue=value)
+
+    def setMax(self, value):
+        cmds.addAttr(str(self), edit=True, maxValue=value)
+
+    def setKeyable(self, keyable):
+        cmds.setAttr(str(self), keyable=keyable)
+
+    def lock(self):
+        cmds.setAttr(str(self), lock=True)
+
+    def exists(self):
+        return True
+
+
+class Component:
+    def __init__(self, name):
+        self._name = name
+        mesh, kind, indices = cmds._parse_component(name)
+        self._mesh = mesh
+        self._indices = list(indices)
+
+    def __str__(self):
+        return self._name
+
+    def __repr__(self):
+        return f"MeshVertex({self._name!r})"
+
+    def index(self):
+        return self._indices[0]
+
+    def indices(self):
+        return list(self._indices)
+
+    def node(self):
+        return PyNode(self._mesh)
+
+    def getPosition(self, space="preTransform"):
+        return self.node().getPoint(self.index(), space)
+
+
+# datatypes and nodetypes
+
+class _Vector:
+    def __init__(self, x=0.0, y=0.0, z=0.0, *args):
+        if isinstance(x, (list, tuple, np.ndarray, _Vector)):
+            x, y, z = list(x)[:3]
+        self.x, self.y, self.z = float(x), float(y), float(z)
+
+    def __iter__(self):
+        return iter((self.x, self.y, self.z))
+
+    def __len__(self):
+        return 3
+
+    def __getitem__(self, index):
+        return (self.x, self.y, self.z)[index]
+
+    def __add__(self, other):
+        return type(self)(*(a + b for a, b in zip(self, other)))
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        return datatypes.Vector(*(a - b for a, b in zip(self, other)))
+
+    def __rsub__(self, other):
+        return datatypes.Vector(*(b - a for a, b in zip(self, other)))
+
+    def __mul__(self, value):
+        if isinstance(value, (_Vector, list, tuple)):
+            return sum(a * b for a, b in zip(self, value))
+        return type(self)(*(a * value for a in self))
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, value):
+        return type(self)(*(a / value for a in self))
+
+    def __neg__(self):
+        return type(self)(-self.x, -self.y, -self.z)
+
+    def __eq__(self, other):
+        try:
+            return all(math.isclose(a, b, abs_tol=1e-9) for a, b in zip(self, other)) and len(other) == 3
+        except TypeError:
+            return False
+
+    def __hash__(self):
+        return hash(tuple(self))
+
+    def __repr__(self):
+        return f"dt.{type(self).__name__}([{self.x}, {self.y}, {self.z}])"
+
+    def length(self):
+        return math.sqrt(self.x ** 2 + self.y ** 2 + self.z ** 2)
+
+    def normal(self):
+        return self / (self.length() or 1.0)
+
+    def cross(self, other):
+        return datatypes.Vector(*np.cross(list(self), list(other)))
+
+    def dot(self, other):
+        return sum(a * b for a, b in zip(self, other))
+
+    def distanceTo(self, other):
+        return (self - other).length()
+
+    def get(self):
+        return tuple(self)
+
+
+datatypes = types.ModuleType("pymel.core.datatypes")
+datatypes.Vector = type("Vector", (_Vector,), {})
+datatypes.Point = type("Point", (_Vector,), {})
+datatypes.FloatVector = datatypes.Vector
+datatypes.Matrix = api.MMatrix
+
+nodetypes = types.ModuleType("pymel.core.nodetypes")
+for _name in (
+    "DependNode", "DagNode", "Transform", "Joint", "Shape", "Mesh", "NurbsCurve", "NurbsSurface", "SkinCluster",
+    "Locator", "Constraint", "ParentConstraint", "IkHandle",
+):
+    setattr(nodetypes, _name, PyNode)
+
+
+# commands
+
+# commands returning values rather than nodes
+_PLAIN = {
+    "getAttr", "xform", "skinPercent", "objExists", "nodeType", "objectType", "pluginInfo", "currentTime",
+    "playbackOptions", "setAttr", "addAttr", "connectAttr", "disconnectAttr", "undoInfo", "refresh",
+    "copySkinWeights", "makeIdentity", "matchTransform", "select", "move", "rotate", "scale", "delete",
+    "loadPlugin", "file", "setKeyframe", "sets",
+}
+# commands returning their first node in PyMEL
+_SINGLE = {
+    "createNode", "group", "curve", "joint", "rename", "spaceLocator", "parentConstraint", "pointConstraint",
+    "orientConstraint", "scaleConstraint", "aimConstraint", "poleVectorConstraint",
+}
+# commands returning lists, empty instead of None
+_LISTS = {"listRelatives", "listConnections", "listHistory", "ls", "parent", "duplicate"}
+
+
+def _wrap(name):
+    command = getattr(cmds, name)
+
+    @functools.wraps(command)
+    def wrapper(*args, **kwargs):
+        args = [_to_string(arg) for arg in args]
+        kwargs = {key: _to_string(value) for key, value in kwargs.items()}
+        result = command(*args, **kwargs)
+        if name in _PLAIN:
+            return result
+        if name == "skinCluster":
+            if kwargs.get("query") or kwargs.get("q"):
+                return _to_pymel(result)
+            return PyNode(result[0]) if result else None
+        result = _to_pymel(result)
+        if name in _LISTS:
+            return result or []
+        if name in _SINGLE and isinstance(result, list):
+            return result[0]
+        return result
+
+    return wrapper
+
+
+def getAttr(plug, **kwargs):
+    result = cmds.getAttr(_to_string(plug), **kwargs)
+    if isinstance(result, list) and len(result) == 1 and isinstance(result[0], tuple):
+        result = result[0]
+        return datatypes.Vector(*result) if len(result) == 3 else result
+    return result
+
+
+def setAttr(plug, *values, **kwargs):
+    values = [list(value) if isinstance(value, _Vector) else value for value in values]
+    return cmds.setAttr(_to_string(plug), *values, **kwargs)
+
+
+def selected(**kwargs):
+    return ls(selection=True, **kwargs)
+
+
+def _build_module():
+    module = types.ModuleType("pymel.core")
+    for name in dir(cmds):
+        command = getattr(cmds, name)
+        if callable(command) and hasattr(command, "__wrapped__") and not name.startswith("_"):
+            setattr(module, name, _wrap(name))
+    module.getAttr = getAttr
+    module.setAttr = setAttr
+    module.selected = selected
+    module.PyNode = PyNode
+    module.Attribute = Attribute
+    module.MeshVertex = Component
+    module.MayaNodeError = MayaNodeError
+    module.MayaAttributeError = MayaAttributeError
+    module.datatypes = module.dt = datatypes
+    module.nodetypes = module.nt = nodetypes
+    return module
+
+
+core = _build_module()
+for _name in ("addAttr", "connectAttr", "disconnectAttr", "listRelatives", "listConnections", "listHistory", "parent",
+              "rename", "duplicate", "ls"):
+    globals()[_name] = getattr(core, _name)
+
+
+def build_modules():
+    """pymel, pymel.core, pymel.core.datatypes and pymel.core.nodetypes modules."""
+    pymel = types.ModuleType("pymel")
+    pymel.__path__ = []
+    pymel.core = core
+    core.__path__ = []
+    return {
+        "pymel": pymel,
+        "pymel.core": core,
+        "pymel.core.datatypes": datatypes,
+        "pymel.core.nodetypes": nodetypes,
+    }
+
@@ -0,0 +1,556 @@
+"""Pure Python dependency graph standing in for a Maya scene.
+
+Nodes have a type, attributes and connections, DAG nodes a parent and
+ordered children. Transforms compose translate, rotate (xyz order only),
+scale and jointOrient with the offsetParentMatrix, there is no other
+evaluation, connected plugs keep the values they were set to.
+"""
+from collections import Counter
+import itertools
+
+import numpy as np
+
+_INHERITED = {
+    "transform": ("dagNode",),
+    "joint": ("transform", "dagNode"),
+    "ikHandle": ("transform", "dagNode"),
+    "ikEffector": ("transform", "dagNode"),
+    "locator": ("shape", "dagNode"),
+    "mesh": ("surfaceShape", "deformableShape", "controlPoint", "geometryShape", "shape", "dagNode"),
+    "nurbsCurve": ("curveShape", "deformableShape", "controlPoint", "geometryShape", "shape", "dagNode"),
+    "nurbsSurface": ("surfaceShape", "deformableShape", "controlPoint", "geometryShape", "shape", "dagNode"),
+    "lattice": ("deformableShape", "controlPoint", "geometryShape", "shape", "dagNode"),
+    "baseLattice": ("geometryShape", "shape", "dagNode"),
+    "skinCluster": ("geometryFilter",),
+    "frogCageDeformer": ("geometryFilter",),
+    "ffd": ("geometryFilter",),
+    "tweak": ("geometryFilter",),
+}
+CONSTRAINT_TYPES = (
+    "parentConstraint", "pointConstraint", "orientConstraint", "scaleConstraint", "aimConstraint",
+    "poleVectorConstraint",
+)
+for _constraint_type in CONSTRAINT_TYPES:
+    _INHERITED[_constraint_type] = ("constraint", "transform", "dagNode")
+SHAPE_TYPES = {node_type for node_type, bases in _INHERITED.items() if "shape" in bases}
+
+_ALIASES = {
+    "t": "translate", "r": "rotate", "s": "scale", "v": "visibility", "jo": "jointOrient", "ro": "rotateOrder",
+    "tx": "translateX", "ty": "translateY", "tz": "translateZ",
+    "rx": "rotateX", "ry": "rotateY", "rz": "rotateZ",
+    "sx": "scaleX", "sy": "scaleY", "sz": "scaleZ",
+    "wm": "worldMatrix", "wim": "worldInverseMatrix", "pm": "parentMatrix", "pim": "parentInverseMatrix",
+    "opm": "offsetParentMatrix",
+}
+# array attributes that stand for their first element without an index
+_INSTANCED = {
+    "worldMatrix", "worldInverseMatrix", "parentMatrix", "parentInverseMatrix", "worldSpace", "worldMesh",
+}
+VECTOR_DEFAULTS = {
+    "translate": (0.0, 0.0, 0.0),
+    "rotate": (0.0, 0.0, 0.0),
+    "scale": (1.0, 1.0, 1.0),
+    "shear": (0.0, 0.0, 0.0),
+    "jointOrient": (0.0, 0.0, 0.0),
+    "rotateAxis": (0.0, 0.0, 0.0),
+    "preferredAngle": (0.0, 0.0, 0.0),
+    "rotatePivot": (0.0, 0.0, 0.0),
+    "scalePivot": (0.0, 0.0, 0.0),
+}
+IDENTITY = tuple(np.eye(4).ravel().tolist())
+ATTR_DEFAULTS = {
+    "visibility": True,
+    "rotateOrder": 0,
+    "segmentScaleCompensate": True,
+    "radius": 1.0,
+    "intermediateObject": False,
+    "overrideEnabled": False,
+    "envelope": 1.0,
+    "nodeState": 0,
+    "frozen": False,
+    "minMaxRangeU": (0.0, 1.0),
+    "minMaxRangeV": (0.0, 1.0),
+    "offsetParentMatrix": IDENTITY,
+}
+_MATRIX_ATTRS = {
+    "worldMatrix[0]", "worldInverseMatrix[0]", "parentMatrix[0]", "parentInverseMatrix[0]", "matrix",
+    "inverseMatrix", "xformMatrix",
+}
+
+
+class Node:
+    __slots__ = ("name", "type", "parent", "children", "attrs", "user_attrs", "inputs", "outputs", "data", "alive")
+
+    def __init__(self, name, node_type):
+        self.name = name
+        self.type = node_type
+        self.parent = None
+        # dicts keep the child order and remove in constant time
+        self.children = {}
+        self.attrs = {}
+        self.user_attrs = {}
+        self.inputs = {}
+        self.outputs = {}
+        self.data = None
+        self.alive = True
+
+    @property
+    def is_dag(self):
+        return is_a(self.type, "dagNode")
+
+    @property
+    def is_shape(self):
+        return self.type in SHAPE_TYPES
+
+    def get_shapes(self):
+        return [child for child in self.children if child.is_shape]
+
+    def __repr__(self):
+        return f"Node({self.name!r}, {self.type!r})"
+
+
+def is_a(node_type, base_type):
+    return base_type in (node_type, "dependNode", "node") or base_type in _INHERITED.get(node_type, ())
+
+
+def normalize_attr(attr):
+    """Long attribute path without redundant compound parents, e.g. output.outputX is outputX."""
+    parts = [_ALIASES.get(part, part) for part in attr.split(".")]
+    keep = []
+    for index, part in enumerate(parts):
+        following = parts[index + 1] if index + 1 < len(parts) else None
+        if following is not None and "[" not in part and following.startswith(part):
+            continue
+        keep.append(f"{part}[0]" if part in _INSTANCED else part)
+    return ".".join(keep)
+
+
+def vector_child(key):
+    """Compound and axis index of vector children like translateX."""
+    if key[-1:] in ("X", "Y", "Z") and key[:-1] in VECTOR_DEFAULTS:
+        return key[:-1], "XYZ".index(key[-1])
+    return None, None
+
+
+class Scene:
+    """Nodes by unique short name plus command counts and registered callbacks."""
+
+    def __init__(self):
+        self.nodes = {}
+        self.world = {}
+        self.selection = {}
+        self.plugins = set()
+        self.commands = Counter()
+        self.created = Counter()
+        self.connection_count = 0
+        self.callbacks = {"node_added": {}, "connection": {}, "command": {}}
+        self.deferred = []
+        self._callback_ids = itertools.count(1)
+        self._name_hints = {}
+
+    def reset(self):
+        """New empty scene, like file -new. Callbacks and loaded plugins stay."""
+        self.nodes = {}
+        self.world = {}
+        self.selection = {}
+        self.created = Counter()
+        self.connection_count = 0
+        self._name_hints = {}
+
+    # callbacks
+
+    def add_callback(self, kind, func, *args):
+        callback_id = next(self._callback_ids)
+        self.callbacks[kind][callback_id] = (func, args)
+        return callback_id
+
+    def remove_callback(self, callback_id):
+        for callbacks in self.callbacks.values():
+            callbacks.pop(callback_id, None)
+
+    def record_command(self, name):
+        self.commands[name] += 1
+        for func, args in list(self.callbacks["command"].values()):
+            func(name, *args)
+
+    # names and lookups
+
+    def unique_name(self, name):
+        if name not in self.nodes:
+            return name
+        base = name.rstrip("0123456789")
+        index = self._name_hints.get(base, 1)
+        while f"{base}{index}" in self.nodes:
+            index += 1
+        self._name_hints[base] = index + 1
+        return f"{base}{index}"
+
+    def find(self, name):
+        name = str(name)
+        short = name.rsplit("|", 1)[-1]
+        return self.nodes.get(short)
+
+    def get(self, name):
+        node = self.find(name)
+        if node is None:
+            raise ValueError(f"No object matches name: {name}")
+        return node
+
+    def split_plug(self, plug):
+        node_name, _, attr = str(plug).partition(".")
+        return self.get(node_name), normalize_attr(attr)
+
+    def path(self, node):
+        names = []
+        while node is not None:
+            names.append(node.name)
+            node = node.parent
+        return "|" + "|".join(reversed(names))
+
+    # node lifetime
+
+    def create_node(self, node_type, name=None, parent=None):
+        name = self.unique_name(name or f"{node_type}1")
+        node = Node(name, node_type)
+        self.nodes[name] = node
+        if node.is_dag:
+            self._attach(node, parent)
+        self.created[node_type] += 1
+        for func, args in list(self.callbacks["node_added"].values()):
+            func(node, *args)
+        return node
+
+    def rename(self, node, name):
+        if name == node.name:
+            return name
+        del self.nodes[node.name]
+        node.name = self.unique_name(name)
+        self.nodes[node.name] = node
+        return node.name
+
+    def delete(self, node):
+        if not node.alive:
+            return
+        for child in list(node.children):
+            self.delete(child)
+        for attr, (source, source_attr) in list(node.inputs.items()):
+            self.disconnect(source, source_attr, node, attr)
+        for attr, destinations in list(node.outputs.items()):
+            for destination, destination_attr in list(destinations):
+                self.disconnect(node, attr, destination, destination_attr)
+        if node.is_dag:
+            self._detach(node)
+        self.selection.pop(node, None)
+        del self.nodes[node.name]
+        node.alive = False
+
+    def _attach(self, node, parent):
+        node.parent = parent
+        (parent.children if parent is not None else self.world)[node] = None
+
+    def _detach(self, node):
+        (node.parent.children if node.parent is not None else self.world).pop(node, None)
+        node.parent = None
+
+    def set_parent(self, node, parent, relative=False):
+        """Reparent a DAG node, keeping its world transform unless relative."""
+        world = self.world_matrix(node) if not relative and not node.is_shape else None
+        self._detach(node)
+        self._attach(node, parent)
+        if world is not None:
+            self.set_world_matrix(node, world)
+
+    def iter_descendants(self, node):
+        """Depth first, parents before children."""
+        for child in node.children:
+            yield child
+            yield from self.iter_descendants(child)
+
+    # attributes and connections
+
+    def get_attr(self, node, key):
+        if key in _MATRIX_ATTRS and node.is_dag:
+            return tuple(self.get_matrix_attr(node, key).ravel().tolist())
+        compound, index = vector_child(key)
+        if compound is not None:
+            return node.attrs.get(compound, VECTOR_DEFAULTS[compound])[index]
+        if key in node.attrs:
+            return node.attrs[key]
+        if key in VECTOR_DEFAULTS:
+            return VECTOR_DEFAULTS[key]
+        return ATTR_DEFAULTS.get(key, 0.0)
+
+    def set_attr(self, node, key, value):
+        compound, index = vector_child(key)
+        if compound is not None:
+            vector = list(node.attrs.get(compound, VECTOR_DEFAULTS[compound]))
+            vector[index] = float(value)
+            node.attrs[compound] = tuple(vector)
+        else:
+            node.attrs[key] = value
+
+    def connect(self, source, source_attr, destination, destination_attr, force=False):
+        existing = destination.inputs.get(destination_attr)
+        if existing == (source, source_attr):
+            raise RuntimeError(
+                f"{source.name}.{source_attr} is already connected to {destination.name}.{destination_attr}"
+            )
+        if existing is not None:
+            if not force:
+                raise RuntimeError(f"{destination.name}.{destination_attr} is already connected")
+            self.disconnect(existing[0], existing[1], destination, destination_attr)
+        destination.inputs[destination_attr] = (source, source_attr)
+        source.outputs.setdefault(source_attr, {})[(destination, destination_attr)] = None
+        self.connection_count += 1
+        for func, args in list(self.callbacks["connection"].values()):
+            func((source, source_attr), (destination, destination_attr), True, *args)
+
+    def disconnect(self, source, source_attr, destination, destination_attr):
+        if destination.inputs.get(destination_attr) != (source, source_attr):
+            raise RuntimeError(
+                f"{source.name}.{source_attr} is not connected to {destination.name}.{destination_attr}"
+            )
+        del destination.inputs[destination_attr]
+        destinations = source.outputs[source_attr]
+        del destinations[(destination, destination_attr)]
+        if not destinations:
+            del source.outputs[source_attr]
+        for func, args in list(self.callbacks["connection"].values()):
+            func((source, source_attr), (destination, destination_attr), False, *args)
+
+    def iter_connections(self, node, source=True, destination=True):
+        """(own attr, other node, other attr) of every connection, inputs first."""
+        if source:
+            for attr, (other, other_attr) in node.inputs.items():
+                yield attr, other, other_attr
+        if destination:
+            for attr, destinations in node.outputs.items():
+                for other, other_attr in destinations:
+                    yield attr, other, other_attr
+
+    # transforms
+
+    def local_matrix(self, node):
+        if node.is_shape or not node.is_dag:
+            return np.eye(4)
+        attrs = node.attrs
+        rotation = euler_to_matrix(attrs.get("rotate", VECTOR_DEFAULTS["rotate"]))
+        if node.type == "joint":
+            rotation = rotation @ euler_to_matrix(attrs.get("jointOrient", VECTOR_DEFAULTS["jointOrient"]))
+        matrix = np.eye(4)
+        matrix[:3, :3] = np.diag(attrs.get("scale", VECTOR_DEFAULTS["scale"])) @ rotation
+        matrix[3, :3] = attrs.get("translate", VECTOR_DEFAULTS["translate"])
+        return matrix
+
+    def parent_matrix(self, node):
+        """Offset parent matrix times the parent world matrix."""
+        matrix = np.reshape(node.attrs.get("offsetParentMatrix", IDENTITY), (4, 4))
+        if node.parent is not None:
+            matrix = matrix @ self.world_matrix(node.parent)
+        return matrix
+
+    def world_matrix(self, node):
+        return self.local_matrix(node) @ self.parent_matrix(node)
+
+    def get_matrix_attr(self, node, key):
+        if key == "worldMatrix[0]":
+            return self.world_matrix(node)
+        if key == "worldInverseMatrix[0]":
+            return np.linalg.inv(self.world_matrix(node))
+        if key == "parentMatrix[0]":
+            return self.parent_matrix(node)
+        if key == "parentInverseMatrix[0]":
+            return np.linalg.inv(self.parent_matrix(node))
+        if key == "inverseMatrix":
+            return np.linalg.inv(self.local_matrix(node))
+        return self.local_matrix(node)
+
+    def set_world_matrix(self, node, matrix, translate=True, rotate=True, scale=True):
+        if node.is_shape:
+            node = node.parent
+        translation, rotation, scale_values = decompose_matrix(matrix @ np.linalg.inv(self.parent_matrix(node)))
+        if translate:
+            node.attrs["translate"] = tuple(translation.tolist())
+        if rotate:
+            if node.type == "joint":
+                orient = euler_to_matrix(node.attrs.get("jointOrient", VECTOR_DEFAULTS["jointOrient"]))
+                rotation = rotation @ orient.T
+            node.attrs["rotate"] = matrix_to_euler(rotation)
+        if scale:
+            node.attrs["scale"] = tuple(scale_values.tolist())
+
+    def set_world_translation(self, node, position):
+        matrix = self.world_matrix(node)
+        matrix[3, :3] = position
+        self.set_world_matrix(node, matrix, rotate=False, scale=False)
+
+    def set_world_rotation(self, node, rotation):
+        matrix = self.world_matrix(node)
+        scale_values = np.linalg.norm(matrix[:3, :3], axis=1)
+        matrix[:3, :3] = np.diag(scale_values) @ euler_to_matrix(rotation)
+        self.set_world_matrix(node, matrix, translate=False, scale=False)
+
+
+def euler_to_matrix(degrees):
+    """Row major rotation of xyz euler angles in degrees."""
+    x, y, z = np.radians(degrees)
+    cx, sx, cy, sy, cz, sz = np.cos(x), np.sin(x), np.cos(y), np.sin(y), np.cos(z), np.sin(z)
+    rotate_x = np.array([[1, 0, 0], [0, cx, sx], [0, -sx, cx]])
+    rotate_y = np.array([[cy, 0, -sy], [0, 1, 0], [sy, 0, cy]])
+    rotate_z = np.array([[cz, sz, 0], [-sz, cz, 0], [0, 0, 1]])
+    return rotate_x @ rotate_y @ rotate_z
+
+
+def matrix_to_euler(rotation):
+    """xyz euler angles in degrees of a row major rotation."""
+    rotate_y = np.arcsin(np.clip(-rotation[0, 2], -1.0, 1.0))
+    rotate_x = np.arctan2(rotation[1, 2], rotation[2, 2])
+    rotate_z = np.arctan2(rotation[0, 1], rotation[0, 0])
+    return tuple(np.degrees([rotate_x, rotate_y, rotate_z]).tolist())
+
+
+def decompose_matrix(matrix):
+    """Translation, orthonormal rotation and scale of a row major matrix, shear is dropped."""
+    matrix = np.asarray(matrix, dtype=float).reshape(4, 4)
+    axes = matrix[:3, :3]
+    scale = np.linalg.norm(axes, axis=1)
+    rotation = axes / np.maximum(scale[:, None], 1e-12)
+    if np.linalg.det(rotation) < 0:
+        scale[0] *= -1
+        rotation[0] *= -1
+    left, _, right = np.linalg.svd(rotation)
+    return matrix[3, :3].copy(), left @ right, scale
+
+
+# geometry
+
+def create_mesh_data(points, faces):
+    return {"points": np.asarray(points, dtype=float), "faces": [tuple(face) for face in faces]}
+
+
+def get_edges(mesh_data):
+    """Vertex pairs of every edge, in order of their first face."""
+    if "edges" not in mesh_data:
+        faces = mesh_data["faces"]
+        starts = np.fromiter(itertools.chain.from_iterable(faces), dtype=np.int64)
+        ends = np.fromiter(itertools.chain.from_iterable(face[1:] + face[:1] for face in faces), dtype=np.int64)
+        pairs = np.sort(np.stack([starts, ends], axis=1), axis=1)
+        _, first = np.unique(pairs, axis=0, return_index=True)
+        mesh_data["edges"] = pairs[np.sort(first)]
+    return mesh_data["edges"]
+
+
+def get_vertex_normals(mesh_data):
+    if "normals" not in mesh_data:
+        points = mesh_data["points"]
+        normals = np.zeros_like(points)
+        for face in mesh_data["faces"]:
+            face_points = points[list(face)]
+            # Newell normal, fine for non planar quads
+            following = np.roll(face_points, -1, axis=0)
+            face_normal = np.sum(np.cross(face_points, following), axis=0)
+            normals[list(face)] += face_normal
+        mesh_data["normals"] = normals / np.maximum(np.linalg.norm(normals, axis=1, keepdims=True), 1e-12)
+    return mesh_data["normals"]
+
+
+def create_box_data(width=1.0, height=1.0, depth=1.0, divisions=(1, 1, 1)):
+    """Subdivided box with welded vertices."""
+    size = np.array([width, height, depth], dtype=float) * 0.5
+    divisions = np.asarray(divisions, dtype=int)
+    points = []
+    faces = []
+    for axis in range(3):
+        first, second = [other for other in range(3) if other != axis]
+        for side in (-1.0, 1.0):
+            first_values = np.linspace(-1.0, 1.0, divisions[first] + 1)
+            second_values = np.linspace(-1.0, 1.0, divisions[second] + 1)
+            grid = np.zeros((len(first_values), len(second_values), 3))
+            grid[..., axis] = side
+            grid[..., first] = first_values[:, None]
+            grid[..., second] = second_values[None, :]
+            offset = sum(len(block) for block in points)
+            points.append(grid.reshape(-1, 3))
+            columns = len(second_values)
+            for row in range(len(first_values) - 1):
+                for column in range(columns - 1):
+                    corner = offset + row * columns + column
+                    face = (corner, corner + columns, corner + columns + 1, corner + 1)
+                    faces.append(face if side > 0 else face[::-1])
+
+    points = np.concatenate(points)
+    _, first_index, welded = np.unique(np.round(points, 9), axis=0, return_index=True, return_inverse=True)
+    # number welded vertices in order of appearance
+    order = np.argsort(np.argsort(first_index))
+    welded = order[welded.ravel()]
+    unique_points = np.empty((welded.max() + 1, 3))
+    unique_points[welded] = points
+    faces = [tuple(int(welded[index]) for index in face) for face in faces]
+    return create_mesh_data(unique_points * size, faces)
+
+
+def create_sphere_data(radius=1.0, axis_divisions=20, height_divisions=20, axis=(0, 1, 0)):
+    """UV sphere with rings from bottom to top followed by the two poles, like polySphere."""
+    heights = np.linspace(-0.5 * np.pi, 0.5 * np.pi, height_divisions + 1)[1:-1]
+    angles = np.linspace(0.0, 2.0 * np.pi, axis_divisions, endpoint=False)
+    rings = np.stack([
+        np.cos(heights)[:, None] * np.cos(angles)[None, :],
+        np.repeat(np.sin(heights)[:, None], axis_divisions, axis=1),
+        np.cos(heights)[:, None] * np.sin(angles)[None, :],
+    ], axis=-1).reshape(-1, 3)
+    points = np.concatenate([rings, [[0.0, -1.0, 0.0], [0.0, 1.0, 0.0]]]) * radius
+
+    faces = []
+    ring_count = len(heights)
+    for ring in range(ring_count - 1):
+        for index in range(axis_divisions):
+            following = (index + 1) % axis_divisions
+            lower = ring * axis_divisions
+            upper = lower + axis_divisions
+            faces.append((lower + index, upper + index, upper + following, lower + following))
+    bottom, top = len(rings), len(rings) + 1
+    top_ring = (ring_count - 1) * axis_divisions
+    for index in range(axis_divisions):
+        following = (index + 1) % axis_divisions
+        faces.append((bottom, index, following))
+        faces.append((top_ring + following, top_ring + index, top))
+
+    axis = int(np.argmax(np.abs(axis)))
+    if axis != 1:
+        columns = [0, 1, 2]
+        columns[1], columns[axis] = columns[axis], columns[1]
+        points = points[:, columns]
+    return create_mesh_data(points, faces)
+
+
+def create_circle_data(radius=1.0, normal=(0, 0, 1), sections=8):
+    """Periodic cubic circle cvs around the normal."""
+    normal = np.asarray(normal, dtype=float)
+    normal /= np.linalg.norm(normal)
+    helper = np.array([0.0, 1.0, 0.0]) if abs(normal[1]) < 0.9 else np.array([1.0, 0.0, 0.0])
+    first = np.cross(normal, helper)
+    first /= np.linalg.norm(first)
+    second = np.cross(normal, first)
+    angles = np.linspace(0.0, 2.0 * np.pi, sections, endpoint=False)
+    cvs = radius * (np.cos(angles)[:, None] * first + np.sin(angles)[:, None] * second)
+    cvs = np.concatenate([cvs, cvs[:3]])
+    return {"cvs": cvs, "degree": 3, "knots": list(range(-2, len(cvs) - 1)), "form": "periodic"}
+
+
+def create_curve_data(points, degree=3, knots=None, bezier=False):
+    points = np.asarray(points, dtype=float)
+    if knots is None:
+        spans = len(points) - degree
+        if bezier:
+            segments = (len(points) - 1) // degree
+            knots = [0] * degree + [value for value in range(1, segments + 1) for _ in range(degree)]
+        else:
+            knots = [0] * (degree - 1) + list(range(spans + 1)) + [spans] * (degree - 1)
+    return {"cvs": points, "degree": degree, "knots": list(knots), "form": "open"}
+
+
+_scene = Scene()
+
+
+def get_scene():
+    return _scene
@@ -1,32 +1,43 @@
-from pymel import core as pm
 import json
+from functools import lru_cache
+from maya import cmds
 from maya import OpenMaya as om
 
+from maya_frog_rigging_tools._lazy import lazy_import
 
-def create_ctl_from_json(file_path, name, ctl_size=1):
+pm = lazy_import("pymel.core")
+
+
+@lru_cache(maxsize=None)
+def load_shape_data(file_path):
     with open(file_path, "r") as f:
-        shape_data = json.load(f)
+        return json.load(f)
+
+
+def create_ctl_from_json(file_path, name, ctl_size=1):
+    """Control curve with the shapes of the json file, built with maya.cmds as controls are created in bulk."""
+    shape_data = load_shape_data(str(file_path))
 
     shape_list = []
 
     for shape in shape_data:
-        new_curve = pm.curve(degree=3, point=shape["points"])
-        pm.closeCurve(new_curve, ch=False, ps=False, rpo=True)
-        shape_list.append(pm.rename(new_curve, shape["name"]))
+        new_curve = cmds.curve(degree=3, point=shape["points"])
+        cmds.closeCurve(new_curve, ch=False, ps=False, rpo=True)
+        shape_list.append(cmds.rename(new_curve, shape["name"]))
 
     ctl = shape_list.pop(0)
 
     for shape in shape_list:
-        shapes = pm.listRelatives(shape, shapes=True, fullPath=True)
-        pm.parent(shapes, ctl, add=True, shape=True)
-        pm.delete(shape)
+        shapes = cmds.listRelatives(shape, shapes=True, fullPath=True)
+        cmds.parent(shapes, ctl, add=True, shape=True)
+        cmds.delete(shape)
 
-    pm.scale(ctl, ctl_size, ctl_size, ctl_size)
-    pm.makeIdentity(ctl, apply=True, t=1, r=1, s=1, n=0)
-    pm.xform(ctl, zeroTransformPivots=True)
-    pm.rename(ctl, name, ignoreShape=True)
+    cmds.scale(ctl_size, ctl_size, ctl_size, ctl)
+    cmds.makeIdentity(ctl, apply=True, t=1, r=1, s=1, n=0)
+    cmds.xform(ctl, zeroTransformPivots=True)
+    ctl = cmds.rename(ctl, name, ignoreShape=True)
 
-    return ctl
+    return pm.PyNode(ctl)
 
 
 def write_json_from_dag(out_path):
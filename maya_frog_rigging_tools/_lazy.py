@@ -0,0 +1,50 @@
+"""Deferred imports of heavy dependencies like pymel.core and NumPy.
+
+Tool modules get imported on Maya startup by menus and shelves, their
+dependencies only have to load once a tool actually runs.
+"""
+import importlib
+import sys
+import types
+
+
+class LazyModule(types.ModuleType):
+    """Module placeholder importing the real module on first attribute access.
+
+    After loading, the attributes of the module are copied over, so later
+    lookups are as fast as on the module itself.
+    """
+
+    def __init__(self, name):
+        super().__init__(name)
+        self.__dict__["_lazy_module"] = None
+
+    def _load(self):
+        module = self.__dict__["_lazy_module"]
+        if module is None:
+            module = importlib.import_module(self.__name__)
+            self.__dict__.update(module.__dict__)
+            self.__dict__["_lazy_module"] = module
+        return module
+
+    def __getattr__(self, name):
+        # only called for attributes that weren't copied, like the ones of a module __getattr__
+        return getattr(self._load(), name)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self):
+        state = "loaded" if self.__dict__["_lazy_module"] is not None else "not loaded"
+        return f"<lazy module {self.__name__!r}, {state}>"
+
+
+def lazy_import(name):
+    """The module if it is imported already, otherwise a LazyModule loading it on first use."""
+    if name in sys.modules:
+        return sys.modules[name]
+    return LazyModule(name)
+
+
+def is_loaded(module):
+    return not isinstance(module, LazyModule) or module.__dict__["_lazy_module"] is not None
@@ -1,29 +1,51 @@
+from maya.api import OpenMaya as om2
 import logging
 
-from capito.maya.rig.icons import RigIcons
-from pymel import core as pm
+from maya_frog_rigging_tools import omaya_utils
+from maya_frog_rigging_tools._lazy import lazy_import
+from maya_frog_rigging_tools.bounding_box import BoundingBoxCache, get_world_bounds
+from maya_frog_rigging_tools.matrix_constraint import matrix_constraint, validate_mode
+from maya_frog_rigging_tools.profiling import profile_stage
+from maya_frog_rigging_tools.rig_icons import ControlIcons, get_icon_provider
+
+pm = lazy_import("pymel.core")
+lattice_solver = lazy_import("maya_frog_rigging_tools.solvers.lattice")
 
 
 class BasicRig:
     """Building a basic squash and stretch rig."""
 
     log = logging.getLogger("Basic Rigger")
-    scale = 1
-    ctl_data = {}
-    jnt_data = {}
-    lattice_data = {}
-
-    def __init__(self, rig_geo=None, name=None):
-        self.rig_geo = rig_geo or pm.ls(sl=1)
-        if name:
-            self.name = name
-            return
-
-        if isinstance(self.rig_geo, list):
-            self.name = self.rig_geo[0].name().split(":")[-1]
-        else:
-            self.name = self.rig_geo.name().split(":")[-1]
 
+    def __init__(
+            self,
+            rig_geo=None,
+            name=None,
+            constraint_mode="constraint",
+            lattice_divisions=(2, 3, 2),
+            joint_grid=(2, 3, 2),
+            icon_provider="builtin"
+    ):
+        self.rig_geo = pm.ls(rig_geo) if rig_geo else pm.ls(sl=1)
+        if not self.rig_geo:
+            raise ValueError("No geometry to rig, please pass or select the prop geometry")
+        self.scale = 1
+        self.ctl_data = {}
+        self.jnt_data = {}
+        self.lattice_data = {}
+        self.bounds = BoundingBoxCache()
+        self.icons = get_icon_provider(icon_provider)
+        self.constraint_mode = validate_mode(constraint_mode)
+        self.lattice_divisions = tuple(lattice_divisions)
+        self.joint_grid = tuple(joint_grid)
+        if min(self.lattice_divisions) < 2:
+            raise ValueError(f"Lattice needs at least 2 divisions per axis, got {self.lattice_divisions}")
+        if self.joint_grid[1] != 3 or min(self.joint_grid) < 1:
+            # the lower, middle and upper controls each drive one y level of joints
+            raise ValueError(f"Joint grid needs exactly 3 levels along y, got {self.joint_grid}")
+        self.name = name or self.rig_geo[0].name().split(":")[-1]
+
+    @profile_stage()
     def build(self):
         self.log.info(f"Building basic rig {self.name}")
         self._build_main_ctl()
@@ -85,10 +107,11 @@ class BasicRig:
         pm.setAttr(f"{rig_parent}.overrideDisplayType", 2)
         pm.connectAttr(f"{main_ctl}.geoUnselectable", f"{rig_parent}.overrideEnabled")
 
+    @profile_stage()
     def _build_lattice(self):
         pm.select(self.rig_geo)
         lattice, lattice_shape, lattice_base = pm.animation.lattice(
-            dv=(2, 3, 2), oc=True, name=f"{self.name}_ffd"
+            dv=self.lattice_divisions, oc=True, name=f"{self.name}_ffd"
         )
 
         self.lattice_data["lattice"] = lattice
@@ -98,8 +121,8 @@ class BasicRig:
         lattice_shape.rename(f"{self.name}_lattice")
         lattice_base.rename(f"{self.name}_lattice_base")
 
-        lattice_bb = pm.exactWorldBoundingBox(lattice_shape)
-        pos_list = get_corner_positions(lattice_bb)
+        lattice_bb = self.bounds.get(lattice_shape)
+        pos_list = lattice_solver.get_grid_positions(lattice_bb, self.joint_grid).tolist()
         jnt_list = []
 
         for index, position in enumerate(pos_list):
@@ -107,32 +130,34 @@ class BasicRig:
             pm.move(*position, bnd_jnt, absolute=True, worldSpace=True)
             jnt_list.append(bnd_jnt)
 
-        low_grp = pm.group(jnt_list[:4], name=f"{lattice_shape}_lower_bnd")
-        mid_grp = pm.group(jnt_list[4:8], name=f"{lattice_shape}_middle_bnd")
-        up_grp = pm.group(jnt_list[8:], name=f"{lattice_shape}_upper_bnd")
+        level_size = self.joint_grid[0] * self.joint_grid[2]
+        low_grp = pm.group(jnt_list[:level_size], name=f"{lattice_shape}_lower_bnd")
+        mid_grp = pm.group(jnt_list[level_size:2 * level_size], name=f"{lattice_shape}_middle_bnd")
+        up_grp = pm.group(jnt_list[2 * level_size:], name=f"{lattice_shape}_upper_bnd")
 
         self.jnt_data["low"] = low_grp
         self.jnt_data["mid"] = mid_grp
         self.jnt_data["up"] = up_grp
 
-        pm.skinCluster(
+        lattice_skin = pm.skinCluster(
             jnt_list, lattice_shape, toSelectedBones=True, name=f"{lattice_shape}_cluster"
         )
+        self._set_lattice_weights(lattice_skin, lattice_shape, jnt_list, lattice_bb)
 
         lattice_ctl_scale = [self.scale * 0.7, self.scale * 0.7, self.scale * 0.7]
 
         lattice_up_ctl_data = create_ctl_structure(
-            1, f"{self.name}_upper_ctl", scale=lattice_ctl_scale, color_index=9
+            1, f"{self.name}_upper_ctl", scale=lattice_ctl_scale, color_index=9, icons=self.icons
         )
         self.ctl_data["lattice_up"] = lattice_up_ctl_data
 
         lattice_mid_ctl_data = create_ctl_structure(
-            1, f"{self.name}_mid_ctl", scale=lattice_ctl_scale, color_index=9
+            1, f"{self.name}_mid_ctl", scale=lattice_ctl_scale, color_index=9, icons=self.icons
         )
         self.ctl_data["lattice_mid"] = lattice_mid_ctl_data
 
         lattice_low_ctl_data = create_ctl_structure(
-            1, f"{self.name}_low_ctl", scale=lattice_ctl_scale, color_index=9
+            1, f"{self.name}_low_ctl", scale=lattice_ctl_scale, color_index=9, icons=self.icons
         )
         self.ctl_data["lattice_low"] = lattice_low_ctl_data
 
@@ -148,46 +173,30 @@ class BasicRig:
 
         for ctl_dict, rig_grp in constraint_list:
             ctl = ctl_dict["ctl"]
-            pm.parentConstraint(
-                ctl,
-                rig_grp,
-                mo=True,
-                weight=1,
-                name=f"{ctl}_{low_grp}_parent_constraint"
-            )
-
-            pm.scaleConstraint(
-                ctl,
-                rig_grp,
-                mo=True,
-                weight=1,
-                name=f"{ctl}_{low_grp}_scale_constraint"
-            )
+            self._parent_scale_constraint(ctl, rig_grp, f"{ctl}_{low_grp}")
 
         for target in [lattice_low_ctl_data['srt'], lattice_up_ctl_data['srt']]:
             ctl = self.ctl_data["local_1"]['ctl']
-            pm.parentConstraint(
-                ctl,
-                target,
-                mo=True,
-                weight=1,
-                name=f"{ctl}_{target}_parent_constraint"
+            self._parent_scale_constraint(ctl, target, f"{ctl}_{target}")
+
+        mid_constraint_name = (
+            f"{lattice_low_ctl_data['ctl']}_{lattice_up_ctl_data['ctl']}_{lattice_mid_ctl_data['srt']}"
+        )
+        if self.constraint_mode == "matrix":
+            matrix_constraint(
+                [lattice_low_ctl_data['ctl'], lattice_up_ctl_data['ctl']],
+                lattice_mid_ctl_data['srt'],
+                name=f"{mid_constraint_name}_parent_mtx"
             )
-            pm.scaleConstraint(
-                ctl,
-                target,
+        else:
+            pm.parentConstraint(
+                lattice_low_ctl_data['ctl'],
+                lattice_up_ctl_data['ctl'],
+                lattice_mid_ctl_data['srt'],
                 mo=True,
                 weight=1,
-                name=f"{ctl}_{target}_scale_constraint"
+                name=f"{mid_constraint_name}_parent_constraint"
             )
-        pm.parentConstraint(
-            lattice_low_ctl_data['ctl'],
-            lattice_up_ctl_data['ctl'],
-            lattice_mid_ctl_data['srt'],
-            mo=True,
-            weight=1,
-            name=f"{lattice_low_ctl_data['ctl']}_{lattice_up_ctl_data['ctl']}_{lattice_mid_ctl_data['srt']}_parent_constraint"
-        )
         stretch_dist = pm.createNode(
             "distanceBetween",
             name=f"{self.name}_stretch_dist"
@@ -244,17 +253,65 @@ class BasicRig:
         )
         pm.connectAttr(f"{self.ctl_data['main']['ctl']}.sqStrFac", f"{sq_str_blend}.blender")
 
+        main_scale_name = f"{self.ctl_data['main']['ctl']}_{lattice_mid_ctl_data['null']}"
+        if self.constraint_mode == "matrix":
+            matrix_constraint(
+                self.ctl_data["main"]['ctl'],
+                lattice_mid_ctl_data['null'],
+                name=f"{main_scale_name}_scale_mtx",
+                translate=False,
+                rotate=False,
+                scale=True
+            )
+        else:
+            pm.scaleConstraint(
+                self.ctl_data["main"]['ctl'],
+                lattice_mid_ctl_data['null'],
+                mo=True,
+                weight=1,
+                name=f"{main_scale_name}_scale_constraint"
+            )
+
+    def _set_lattice_weights(self, skin_cluster, lattice_shape, jnt_list, lattice_bb):
+        """Replace the bind heuristics with trilinear weights towards the joint grid.
+
+        The weight rows follow the MItGeometry point order, the components list
+        the points in that same order.
+        """
+        points = omaya_utils.get_point_array(lattice_shape)
+        components = omaya_utils.get_complete_lattice_components(lattice_shape)
+        component_count = om2.MFnTripleIndexedComponent(components).elementCount
+        if component_count != len(points):
+            raise RuntimeError(f"{lattice_shape} has {len(points)} points but {component_count} components")
+
+        weights = lattice_solver.solve_lattice_weights(points, lattice_bb, self.joint_grid)
+        omaya_utils.set_skin_weights(skin_cluster, lattice_shape, components, jnt_list, weights.ravel().tolist())
+        self.log.info(f"Set weights of {len(points)} lattice points to {len(jnt_list)} joints")
+
+    def _parent_scale_constraint(self, driver, driven, name):
+        if self.constraint_mode == "matrix":
+            matrix_constraint(driver, driven, name=f"{name}_parent_scale_mtx", scale=True)
+            return
+
+        pm.parentConstraint(
+            driver,
+            driven,
+            mo=True,
+            weight=1,
+            name=f"{name}_parent_constraint"
+        )
         pm.scaleConstraint(
-            self.ctl_data["main"]['ctl'],
-            lattice_mid_ctl_data['null'],
+            driver,
+            driven,
             mo=True,
             weight=1,
-            name=f"{self.ctl_data['main']['ctl']}_{lattice_mid_ctl_data['null']}_scale_constraint"
+            name=f"{name}_scale_constraint"
         )
 
+    @profile_stage()
     def _build_main_ctl(self):
         main_ctl_data = create_ctl_structure(
-            11, f"{self.name}_main_ctl", match_bb=self.rig_geo, color_index=2
+            11, f"{self.name}_main_ctl", match_bb=self.rig_geo, color_index=2, bounds=self.bounds, icons=self.icons
         )
         self.ctl_data["main"] = main_ctl_data
 
@@ -264,12 +321,12 @@ class BasicRig:
         local_1_scale = [self.scale * 0.7, self.scale * 0.7, self.scale * 0.7]
 
         local_0_ctl_data = create_ctl_structure(
-            3, f"{self.name}_local_0_ctl", scale=local_0_scale, color_index=4
+            3, f"{self.name}_local_0_ctl", scale=local_0_scale, color_index=4, icons=self.icons
         )
         self.ctl_data["local_0"] = local_0_ctl_data
 
         local_1_ctl_data = create_ctl_structure(
-            3, f"{self.name}_local_1_ctl", scale=local_1_scale, color_index=5
+            3, f"{self.name}_local_1_ctl", scale=local_1_scale, color_index=5, icons=self.icons
         )
         self.ctl_data["local_1"] = local_1_ctl_data
 
@@ -295,17 +352,18 @@ def match_transforms(source_obj, target_obj, **kwargs):
     pm.delete(constraint)
 
 
-def match_bounding_box_scale(to, frm, scale=True):
-    to = pm.ls(to, flatten=True)
-    frm = pm.ls(frm, flatten=True)
+def match_bounding_box_scale(to, frm, scale=True, bounds=None):
+    bounds = bounds or BoundingBoxCache()
+    to = pm.ls(to)
 
-    x_min, y_min, z_min, x_max, y_max, z_max = pm.exactWorldBoundingBox(frm)
+    # only the reference is cached, the matched objects get scaled right after
+    x_min, y_min, z_min, x_max, y_max, z_max = bounds.get(frm)
     ax, ay, az = [x_max - x_min, y_max - y_min, z_max - z_min]
 
     result = []
-    for obj in to:
+    for obj, obj_bounds in zip(to, get_world_bounds([obj.longName() for obj in to])):
 
-        x_min, y_min, z_min, x_max, y_max, z_max = pm.exactWorldBoundingBox(obj)
+        x_min, y_min, z_min, x_max, y_max, z_max = obj_bounds
         bx, by, bz = [x_max - x_min, y_max - y_min, z_max - z_min]
 
         old_x, old_y, old_z = pm.xform(obj, q=1, s=1, r=1)
@@ -320,30 +378,15 @@ def match_bounding_box_scale(to, frm, scale=True):
 
 
 def get_corner_positions(coordinates):
-    x_min, y_min, z_min, x_max, y_max, z_max = coordinates
-    y_mid = (y_max + y_min) / 2
-
-    return [
-        [x_min, y_min, z_min],
-        [x_min, y_min, z_max],
-        [x_max, y_min, z_min],
-        [x_max, y_min, z_max],
-        [x_min, y_mid, z_min],
-        [x_min, y_mid, z_max],
-        [x_max, y_mid, z_min],
-        [x_max, y_mid, z_max],
-        [x_min, y_max, z_min],
-        [x_min, y_max, z_max],
-        [x_max, y_max, z_min],
-        [x_max, y_max, z_max],
-    ]
-
-
-def create_ctl_structure(index, name, match_bb=None, scale=None, freeze_transforms=True, color_index=2):
-    icon = RigIcons()
-    main_ctl = icon.create_rig_icon(index, name)
-    pm.select(main_ctl)
-    icon.colorize_selected_curves(color_index)
+    return lattice_solver.get_grid_positions(coordinates).tolist()
+
+
+def create_ctl_structure(
+        index, name, match_bb=None, scale=None, freeze_transforms=True, color_index=2, bounds=None, icons=None
+):
+    icons = icons or ControlIcons()
+    main_ctl = icons.create(index, name)
+    icons.colorize(main_ctl, color_index)
     main_ctl.rename(name)
 
     srt = main_ctl.listRelatives(parent=True)[0]
@@ -353,7 +396,7 @@ def create_ctl_structure(index, name, match_bb=None, scale=None, freeze_transfor
     null.rename(f"{name}_null")
 
     if match_bb:
-        scale = match_bounding_box_scale(null, match_bb, scale=False)
+        scale = match_bounding_box_scale(null, match_bb, scale=False, bounds=bounds)
         scale[0] = scale[0] * 2.5
         scale[1] = 0
         scale[2] = scale[0]
@@ -0,0 +1,428 @@
+from maya import cmds
+import logging
+import time
+
+LOGGER = logging.getLogger("Rig Benchmark")
+
+
+def measure_fps(sinks, start=None, end=None, iterations=3):
+    """Evaluate a frame range by pulling the given plugs and return frames per second.
+
+    Pulling the sinks forces DG evaluation in batch sessions as well, where no
+    viewport would request it during playback.
+    """
+    if start is None:
+        start = cmds.playbackOptions(query=True, minTime=True)
+    if end is None:
+        end = cmds.playbackOptions(query=True, maxTime=True)
+
+    frames = range(int(start), int(end) + 1)
+    current_time = cmds.currentTime(query=True)
+    best_duration = None
+
+    for _ in range(iterations):
+        start_time = time.perf_counter()
+        for frame in frames:
+            cmds.currentTime(frame, update=True)
+            for sink in sinks:
+                cmds.getAttr(sink)
+        duration = time.perf_counter() - start_time
+        best_duration = duration if best_duration is None else min(best_duration, duration)
+
+    cmds.currentTime(current_time, update=True)
+    return len(frames) / best_duration
+
+
+def count_nodes(node_types=None):
+    """Number of dependency nodes in the scene, by type when node_types is given."""
+    if node_types is None:
+        return len(cmds.ls(dependencyNodes=True))
+    return {node_type: len(cmds.ls(type=node_type)) for node_type in node_types}
+
+
+CONSTRAINT_TYPES = ["parentConstraint", "scaleConstraint", "pointConstraint"]
+MATRIX_TYPES = ["multMatrix", "blendMatrix", "pickMatrix"]
+
+
+def create_test_chain(name, length=3):
+    cmds.select(clear=True)
+    joints = []
+    for index in range(length):
+        joints.append(
+            cmds.joint(name=f"{name}_{index}_bnd", position=(index * 2, 0, -0.5 * (index % 2)))
+        )
+    cmds.joint(joints[0], edit=True, orientJoint="xyz", secondaryAxisOrient="yup", children=True, zeroScaleOrient=True)
+    cmds.select(clear=True)
+    return joints
+
+
+def animate_attributes(plugs, start, end, amplitude=1.0):
+    for plug in plugs:
+        cmds.setKeyframe(plug, time=start, value=0)
+        cmds.setKeyframe(plug, time=(start + end) / 2.0, value=amplitude)
+        cmds.setKeyframe(plug, time=end, value=0)
+
+
+def compare_limb_constraint_modes(chain_length=3, start=1, end=240, iterations=3):
+    """Build the same limb with constraints and with matrices and measure both.
+
+    Every mode is built in a new scene, the current scene is discarded.
+    """
+    from maya_frog_rigging_tools.limb_setup import LimbSetup
+
+    results = {}
+    for mode in ("constraint", "matrix"):
+        cmds.file(new=True, force=True)
+        chain = create_test_chain("bench_limb", chain_length)
+        limb = LimbSetup(chain[0], prefix_name="bench", constraint_mode=mode)
+        limb.build_structure()
+        limb.build_ctl_rig()
+        limb.cleanup()
+
+        animated = [f"{record.node}.rotateZ" for record in limb.ctl_data.chain("fk")]
+        animated += [f"{limb.ctl_data.node('ik')}.translateY", f"{limb.ctl_data.node('host')}.IkFkSwitch"]
+        animate_attributes(animated, start, end)
+
+        sinks = [f"{joint}.worldMatrix[0]" for joint in limb.root_chain]
+        results[mode] = {
+            "fps": measure_fps(sinks, start, end, iterations),
+            "nodes": count_nodes(),
+            "node_types": count_nodes(CONSTRAINT_TYPES + MATRIX_TYPES),
+        }
+
+    log_results("Limb", results)
+    return results
+
+
+def compare_prop_constraint_modes(start=1, end=240, iterations=3):
+    """Build the same basic prop rig with constraints and with matrices and measure both.
+
+    Every mode is built in a new scene, the current scene is discarded.
+    """
+    from pymel import core as pm
+    from maya_frog_rigging_tools.basic_rig import BasicRig
+
+    results = {}
+    for mode in ("constraint", "matrix"):
+        cmds.file(new=True, force=True)
+        geo = cmds.polyCube(name="bench_prop_geo", height=4, subdivisionsHeight=8)[0]
+        cmds.group(geo, name="bench_prop")
+        rig = BasicRig([pm.PyNode(geo)], name="bench_prop", constraint_mode=mode)
+        rig.build()
+
+        animate_attributes(
+            [
+                f"{rig.ctl_data['lattice_up']['ctl']}.translateY",
+                f"{rig.ctl_data['lattice_low']['ctl']}.rotateX",
+                f"{rig.ctl_data['main']['ctl']}.translateX",
+            ],
+            start,
+            end,
+        )
+
+        sinks = [f"{geo}.worldMesh[0]"]
+        results[mode] = {
+            "fps": measure_fps(sinks, start, end, iterations),
+            "nodes": count_nodes(),
+            "node_types": count_nodes(CONSTRAINT_TYPES + MATRIX_TYPES),
+        }
+
+    log_results("Prop", results)
+    return results
+
+
+def create_sample_cage_scene(subdivisions=24, lod="proxy"):
+    """New scene with a skinned box cage around a cylinder, deformed with create_deform_cage.
+
+    Smoothing is skipped so the scene builds without ngSkinTools.
+    """
+    from maya_frog_rigging_tools import deformation_cage
+
+    cmds.file(new=True, force=True)
+    joints = create_test_chain("bench_cage", 3)
+    cage = cmds.polyCube(name="bench_cage_geo", width=6, height=2, depth=2, subdivisionsWidth=3)[0]
+    body = cmds.polyCylinder(
+        name="bench_body_geo", axis=(1, 0, 0), height=5, radius=0.8,
+        subdivisionsAxis=subdivisions, subdivisionsHeight=subdivisions
+    )[0]
+    for mesh in (cage, body):
+        cmds.move(2, 0, -0.25, mesh)
+        cmds.makeIdentity(mesh, apply=True, translate=True)
+    cmds.skinCluster(joints, cage, toSelectedBones=True, name="bench_cage_cluster")
+
+    cage_ctl_group = deformation_cage.create_deform_cage(cage, [body], smooth_iterations=0, lod=lod)
+    return str(cage_ctl_group), body, joints
+
+
+def compare_cage_lod_levels(subdivisions=24, start=1, end=240, iterations=3):
+    """Measure playback of the sample cage scene at every cage lod level.
+
+    The current scene is discarded.
+    """
+    from maya_frog_rigging_tools.deformation_cage import CAGE_LOD_LEVELS
+
+    cage_ctl_group, body, joints = create_sample_cage_scene(subdivisions)
+    animate_attributes([f"{joints[0]}.rotateY", f"{joints[1]}.rotateZ"], start, end, amplitude=45)
+
+    display_shapes = cmds.listRelatives(
+        cmds.ls(f"{cage_ctl_group}|*_cageDisplay", long=True), shapes=True, fullPath=True
+    ) or []
+    sinks = [f"{body}.worldMesh[0]"] + [f"{shape}.worldSpace[0]" for shape in display_shapes]
+
+    results = {}
+    for index, level in enumerate(CAGE_LOD_LEVELS):
+        cmds.setAttr(f"{cage_ctl_group}.cageLod", index)
+        results[level] = {
+            "fps": measure_fps(sinks, start, end, iterations),
+            "nodes": count_nodes(),
+            "node_types": count_nodes(["skinCluster", "multMatrix", "decomposeMatrix", "blendMatrix"]),
+        }
+
+    log_results("Cage lod", results)
+    return results
+
+
+def create_sample_eyelid_scene(vertex_count=40):
+    """New scene with an eye sphere, a center and an up locator, returns the upper lid vertices.
+
+    The lid is half of a ring of sphere vertices above the equator.
+    """
+    cmds.file(new=True, force=True)
+    eye = cmds.polySphere(name="bench_eye_geo", subdivisionsAxis=vertex_count * 2, subdivisionsHeight=12)[0]
+    center = cmds.spaceLocator(name="bench_eye_center")[0]
+    up = cmds.spaceLocator(name="bench_eye_up")[0]
+    cmds.setAttr(f"{up}.translateY", 5)
+    ring_start = vertex_count * 2 * 7
+    return [f"{eye}.vtx[{index}]" for index in range(ring_start, ring_start + vertex_count)], center, up
+
+
+def compare_eyelid_modes(vertex_count=40, start=1, end=240, iterations=3):
+    """Build the same lid with locators and aimConstraints and with aimMatrix nodes and measure both.
+
+    Every mode is built in a new scene, the current scene is discarded. Also
+    logs the node and fps difference and the largest joint position difference
+    between both modes half way through the animation.
+    """
+    import numpy as np
+    from maya_frog_rigging_tools.eyelid_setup import build_eyelid
+
+    results = {}
+    for mode in ("constraint", "matrix"):
+        vertices, center, up = create_sample_eyelid_scene(vertex_count)
+        nodes = build_eyelid("bench_lid", vertices, center, up, constraint_mode=mode)
+        animate_attributes([f"{nodes['curve']}.translateY", f"{nodes['curve']}.rotateX"], start, end, amplitude=0.2)
+
+        sinks = [f"{joint}.worldMatrix[0]" for joint in nodes["joints"]]
+        results[mode] = {
+            "fps": measure_fps(sinks, start, end, iterations),
+            "nodes": count_nodes(),
+            "node_types": count_nodes(
+                ["aimConstraint", "aimMatrix", "composeMatrix", "locator", "pointOnCurveInfo", "joint"]
+            ),
+        }
+        cmds.currentTime((start + end) // 2, update=True)
+        results[mode]["positions"] = np.array(
+            [cmds.xform(joint, query=True, worldSpace=True, translation=True) for joint in nodes["joints"]]
+        )
+
+    log_results("Eyelid", results)
+    constraint, matrix = results["constraint"], results["matrix"]
+    LOGGER.info(
+        f"Eyelid matrix mode: {constraint['nodes'] - matrix['nodes']} nodes less, "
+        f"{matrix['fps'] / constraint['fps']:.2f}x fps, largest joint difference "
+        f"{np.max(np.abs(constraint['positions'] - matrix['positions'])):.6f}"
+    )
+    return results
+
+
+def profile_sample_builds(output_dir, chain_length=3):
+    """Profile the sample limb, prop and cage builds and write json and Chrome trace files.
+
+    Every build runs in a new scene, the current scene is discarded. Returns
+    the profilers by build name.
+    """
+    import os
+    from pymel import core as pm
+    from maya_frog_rigging_tools.basic_rig import BasicRig
+    from maya_frog_rigging_tools.limb_setup import LimbSetup
+    from maya_frog_rigging_tools.profiling import BuildProfiler
+
+    def build_limb():
+        chain = create_test_chain("bench_limb", chain_length)
+        limb = LimbSetup(chain[0], prefix_name="bench")
+        limb.build_structure()
+        limb.build_ctl_rig()
+
+    def build_prop():
+        geo = cmds.polyCube(name="bench_prop_geo", height=4, subdivisionsHeight=8)[0]
+        cmds.group(geo, name="bench_prop")
+        BasicRig([pm.PyNode(geo)], name="bench_prop").build()
+
+    profilers = {}
+    for name, build in (("limb", build_limb), ("prop", build_prop), ("cage", None)):
+        cmds.file(new=True, force=True)
+        with BuildProfiler(f"bench_{name}") as profiler:
+            if build:
+                build()
+            else:
+                create_sample_cage_scene()
+        profiler.log_summary()
+        profiler.write_json(os.path.join(output_dir, f"bench_{name}_profile.json"))
+        profiler.write_chrome_trace(os.path.join(output_dir, f"bench_{name}_trace.json"))
+        profilers[name] = profiler
+    return profilers
+
+
+def log_results(label, results):
+    for mode, result in results.items():
+        LOGGER.info(f"{label} {mode}: {result['fps']:.1f} fps, {result['nodes']} nodes, {result['node_types']}")
+
+
+def check_stretch_solver(samples=50, seed=0, tolerance=1e-5):
+    """Compare the frogStretchSolver outputs against the utility node network on random poses.
+
+    Builds one limb per stretch solver in a new scene, the current scene is
+    discarded. Both limbs get the same random ik and pole positions and
+    settings, returns the largest absolute difference of the upper scale,
+    lower scale and pole weights.
+    """
+    import numpy as np
+    from maya_frog_rigging_tools.limb_setup import LimbSetup
+
+    cmds.file(new=True, force=True)
+    limbs = {}
+    for mode in ("network", "node"):
+        chain = create_test_chain(f"check_{mode}")
+        limb = LimbSetup(chain[0], prefix_name=f"check_{mode}", stretch_solver=mode)
+        limb.build_structure()
+        limb.build_ctl_rig()
+        limb.cleanup()
+        limbs[mode] = limb
+
+    rng = np.random.default_rng(seed)
+    largest_difference = 0.0
+
+    for _ in range(samples):
+        ik_position = rng.uniform(-3, 3, 3)
+        pole_position = rng.uniform(-3, 3, 3)
+        settings = {
+            "maxStretch": rng.uniform(1, 3),
+            "maxSquash": rng.uniform(0, 1),
+            "poleLock": rng.uniform(0, 1),
+            "poleSpace": rng.uniform(0, 1),
+        }
+
+        outputs = {}
+        for mode, limb in limbs.items():
+            cmds.setAttr(f"{limb.ctl_data.node('ik')}.translate", *ik_position)
+            cmds.setAttr(f"{limb.ctl_data.node('pole')}.translate", *pole_position)
+            for attr, value in settings.items():
+                cmds.setAttr(f"{limb.ctl_data.node('host')}.{attr}", value)
+            outputs[mode] = np.array([cmds.getAttr(plug) for plug in limb.stretch_outputs])
+
+        difference = float(np.max(np.abs(outputs["node"] - outputs["network"])))
+        largest_difference = max(largest_difference, difference)
+
+    if largest_difference > tolerance:
+        LOGGER.error(f"Stretch solver differs from the node network by {largest_difference}")
+    else:
+        LOGGER.info(f"Stretch solver matches the node network, largest difference {largest_difference}")
+    return largest_difference
+
+
+def check_eye_solver(
+        samples=50,
+        seed=0,
+        tolerance=1e-5,
+        subdiv_res=20,
+        pupil_edge=10,
+        profile="linear",
+        layout_profile="linear",
+        pupil_threshold=None
+):
+    """Compare the frogEyeSolver backend of setup_eye against the utility node network.
+
+    Builds one eye per backend in a new scene, the current scene is discarded.
+    Both eyes get the same random pupil and iris values, returns the largest
+    absolute difference of the joint translations and scales.
+    """
+    import numpy as np
+    from maya_frog_rigging_tools.eyeball_setup import setup_eye
+
+    cmds.file(new=True, force=True)
+    for backend in ("network", "node"):
+        setup_eye(
+            f"check_{backend}",
+            iris_exists=True,
+            pupil_edge=pupil_edge,
+            subdiv_res=subdiv_res,
+            backend=backend,
+            profile=profile,
+            layout_profile=layout_profile,
+            pupil_threshold=pupil_threshold
+        )
+
+    rng = np.random.default_rng(seed)
+    attrs = ["translateX", "scaleX", "scaleY", "scaleZ"]
+    largest_difference = 0.0
+
+    for _ in range(samples):
+        pupil, iris = rng.uniform(0, 1, 2)
+        results = {}
+        for backend in ("network", "node"):
+            cmds.setAttr(f"check_{backend}_ctl.Pupil", pupil)
+            cmds.setAttr(f"check_{backend}_ctl.Iris", iris)
+            results[backend] = np.array([
+                [cmds.getAttr(f"check_{backend}_{index}_bnd.{attr}") for attr in attrs]
+                for index in range(subdiv_res + 1)
+            ])
+        largest_difference = max(
+            largest_difference, float(np.max(np.abs(results["network"] - results["node"])))
+        )
+
+    if largest_difference > tolerance:
+        LOGGER.error(f"Eye solver differs from the node network by {largest_difference}")
+    else:
+        LOGGER.info(f"Eye solver matches the node network, largest difference {largest_difference}")
+    return largest_difference
+
+
+def check_curve_params(points=1000, seed=0, tolerance=1e-4, degree=3, spans=8):
+    """Compare omaya_utils.get_u_params against MFnNurbsCurve.closestPoint on a random curve.
+
+    Returns the largest distance difference of the found curve points and the
+    time of both, the batch query should never end up further away.
+    """
+    import numpy as np
+    from maya.api import OpenMaya as om2
+    from maya_frog_rigging_tools import omaya_utils
+
+    rng = np.random.default_rng(seed)
+    curve = cmds.curve(degree=degree, point=rng.normal(size=(spans + degree, 3)).tolist(), name="check_params_crv")
+    curve_fn = om2.MFnNurbsCurve(omaya_utils.get_mdag_path(curve))
+    query_points = rng.normal(size=(points, 3))
+
+    batch_start = time.perf_counter()
+    params = omaya_utils.get_u_params(query_points, curve)
+    batch_time = time.perf_counter() - batch_start
+
+    api_start = time.perf_counter()
+    api_distances = np.array([
+        curve_fn.closestPoint(om2.MPoint(*point), tolerance=1e-6).distanceTo(om2.MPoint(*point))
+        for point in query_points.tolist()
+    ])
+    api_time = time.perf_counter() - api_start
+
+    batch_distances = np.array([
+        curve_fn.getPointAtParam(param).distanceTo(om2.MPoint(*point))
+        for param, point in zip(params.tolist(), query_points.tolist())
+    ])
+    cmds.delete(curve)
+
+    largest_difference = float(np.max(batch_distances - api_distances))
+    LOGGER.info(f"get_u_params {batch_time:.4f}s, closestPoint {api_time:.4f}s for {points} points")
+    if largest_difference > tolerance:
+        LOGGER.error(f"Batch curve params are up to {largest_difference} further away than closestPoint")
+    else:
+        LOGGER.info(f"Batch curve params match closestPoint, largest difference {largest_difference}")
+    return largest_difference, batch_time, api_time
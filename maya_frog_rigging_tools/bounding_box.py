@@ -0,0 +1,103 @@
+import logging
+
+from maya import cmds
+from maya.api import OpenMaya as om2
+
+from maya_frog_rigging_tools import omaya_utils
+from maya_frog_rigging_tools._lazy import lazy_import
+
+np = lazy_import("numpy")
+
+LOGGER = logging.getLogger("Bounding Box")
+
+# shapes whose exact bounds come from their points
+POINT_SHAPES = ("mesh", "nurbsCurve", "nurbsSurface", "lattice")
+
+
+class BoundingBoxCache:
+    """World space bounds of DAG nodes including their descendants, cached per build.
+
+    Bounds are (x_min, y_min, z_min, x_max, y_max, z_max) like exactWorldBoundingBox.
+    Exact bounds come from the shape points, otherwise the shape bounding boxes
+    are transformed by their world matrices.
+    """
+
+    def __init__(self, exact=True):
+        self.exact = exact
+        self._bounds = {}
+
+    def get(self, nodes):
+        """Combined bounds of one or many nodes."""
+        return combine_bounds(self.get_each(nodes))
+
+    def get_each(self, nodes):
+        names = cmds.ls(nodes, long=True)
+        if not names:
+            raise ValueError(f"No nodes to get bounds of in {nodes}")
+        missing = [name for name in names if name not in self._bounds]
+        if missing:
+            self._bounds.update(zip(missing, get_world_bounds(missing, self.exact)))
+        return [self._bounds[name] for name in names]
+
+    def invalidate(self, nodes=None):
+        if nodes is None:
+            self._bounds.clear()
+            return
+        for name in cmds.ls(nodes, long=True):
+            # moved nodes change the bounds of their parents too
+            for path in get_path_prefixes(name):
+                self._bounds.pop(path, None)
+
+
+def get_world_bounds(nodes, exact=True):
+    """World bounds of every node and its shapes, shapes are queried in one listRelatives pass."""
+    shapes = cmds.listRelatives(nodes, allDescendents=True, type="shape", noIntermediate=True, fullPath=True) or []
+    shapes += cmds.ls(nodes, shapes=True, noIntermediate=True, long=True)
+    # bounds of every shape are added to the shape and all of its ancestors
+    path_bounds = {}
+    for shape in set(shapes):
+        bounds = get_shape_bounds(shape, exact)
+        for path in get_path_prefixes(shape):
+            path_bounds.setdefault(path, []).append(bounds)
+
+    result = []
+    for node in cmds.ls(nodes, long=True):
+        node_bounds = path_bounds.get(node)
+        if not node_bounds:
+            LOGGER.warning(f"{node} has no shapes, using its position as bounds")
+            position = cmds.xform(node, query=True, worldSpace=True, rotatePivot=True)
+            result.append(tuple(position + position))
+            continue
+        result.append(combine_bounds(node_bounds))
+    return result
+
+
+def get_path_prefixes(path):
+    """The full path and the full paths of all its ancestors."""
+    parts = path.split("|")
+    return ["|".join(parts[:index]) for index in range(len(parts), 0, -1) if parts[index - 1]]
+
+
+def get_shape_bounds(shape, exact=True):
+    if exact and cmds.nodeType(shape) in POINT_SHAPES:
+        return get_point_bounds(omaya_utils.get_point_array(shape))
+
+    dag_path = om2.MGlobal.getSelectionListByName(shape).getDagPath(0)
+    box = om2.MFnDagNode(dag_path).boundingBox
+    minimum, maximum = box.min, box.max
+    corners = np.array([
+        [x, y, z, 1.0] for x in (minimum.x, maximum.x) for y in (minimum.y, maximum.y) for z in (minimum.z, maximum.z)
+    ])
+    matrix = dag_path.inclusiveMatrix()
+    world = corners @ np.array([[matrix.getElement(row, column) for column in range(4)] for row in range(4)])
+    return get_point_bounds(world[:, :3])
+
+
+def get_point_bounds(points):
+    points = np.asarray(points, dtype=float)
+    return tuple(np.concatenate([points.min(axis=0), points.max(axis=0)]).tolist())
+
+
+def combine_bounds(bounds):
+    bounds = np.asarray(bounds, dtype=float)
+    return tuple(np.concatenate([bounds[:, :3].min(axis=0), bounds[:, 3:].max(axis=0)]).tolist())
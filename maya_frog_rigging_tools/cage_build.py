@@ -0,0 +1,303 @@
+from maya import cmds
+from maya import utils as maya_utils
+from maya.api import OpenMaya as om2
+import logging
+import time
+
+from maya_frog_rigging_tools import deformation_cage
+from maya_frog_rigging_tools import omaya_utils
+from maya_frog_rigging_tools import utils
+from maya_frog_rigging_tools._lazy import lazy_import
+
+np = lazy_import("numpy")
+pm = lazy_import("pymel.core")
+
+LOGGER = logging.getLogger("Cage Build")
+
+# seconds per created node and per bound cage weight, finished builds keep them up to date
+BUILD_RATES = {"node": 0.004, "weight": 2e-5}
+
+# orig, srt and control transform with four circle shapes, two joints in skin mode, a multMatrix in mvc mode
+VERTEX_NODES = {"skin": 9, "mvc": 8}
+# line shape, two multMatrix and two decomposeMatrix nodes
+EDGE_NODES = 5
+# skinCluster or frogCageDeformer with orig shape, groupParts, groupId and tweak
+BIND_NODES = 5
+
+# output and input geometry attribute of the shapes cage deformers can bind
+GEOMETRY_PLUGS = {
+    "mesh": ("outMesh", "inMesh"),
+    "nurbsSurface": ("local", "create"),
+    "nurbsCurve": ("local", "create"),
+}
+
+
+class ChunkedCageBuild:
+    """Build a deform cage in chunks of vertices and edges from idle events.
+
+    Maya stays responsive between chunks, on_progress(stage, done, total) is
+    called after each of them. Nodes created by the chunks are recorded with
+    a node added callback, so cancel or a failing chunk deletes all of them
+    again. on_finish gets the cage group, or None when the build was rolled back.
+
+    The whole run from start to finish or rollback is one undo chunk, a single
+    undo removes a finished cage and undoing a cancelled build restores the
+    scene from before it instead of a partial cage. Edits made while the build
+    runs become part of that chunk.
+    """
+
+    def __init__(
+            self, mesh_name, t_pose_objs, ctl_size=1, smooth_iterations=2, lod="proxy", deformer="skin",
+            chunk_size=25, on_progress=None, on_finish=None
+    ):
+        deformation_cage.validate_cage_options(lod, deformer)
+        self.mesh_name = mesh_name
+        self.t_pose_objs = t_pose_objs
+        self.ctl_size = ctl_size
+        self.smooth_iterations = smooth_iterations
+        self.lod = lod
+        self.deformer = deformer
+        self.chunk_size = chunk_size
+        self.on_progress = on_progress
+        self.on_finish = on_finish
+
+        self.cage_ctl_group = None
+        self.cancelled = False
+        self.running = False
+        self.stage_stats = {}
+        self._created = []
+        self._steps = None
+        self._undo_chunk_open = False
+
+    def start(self):
+        self.running = True
+        self._steps = self._build_steps()
+        cmds.undoInfo(openChunk=True, chunkName="frog_cage_build")
+        self._undo_chunk_open = True
+        maya_utils.executeDeferred(self._run_step)
+
+    def cancel(self):
+        """Roll back before the next chunk runs."""
+        self.cancelled = True
+
+    def _run_step(self):
+        if self.cancelled:
+            self.rollback()
+            return
+
+        # only record while a chunk runs, nodes made by hand in between are left alone
+        callback_id = om2.MDGMessage.addNodeAddedCallback(self._record_node, "dependNode")
+        created_before = len(self._created)
+        step_start = time.perf_counter()
+        failed = False
+        progress = None
+        try:
+            with utils.batch_build("frog_cage_chunk"):
+                progress = next(self._steps, None)
+        except Exception:
+            LOGGER.exception("Cage build failed, rolling back")
+            failed = True
+        finally:
+            om2.MMessage.removeCallback(callback_id)
+
+        if failed:
+            self.rollback()
+            return
+        if progress is None:
+            self._finish()
+            return
+
+        stage, done, total = progress
+        seconds, nodes = self.stage_stats.get(stage, (0.0, 0))
+        self.stage_stats[stage] = (
+            seconds + time.perf_counter() - step_start, nodes + len(self._created) - created_before
+        )
+        try:
+            if self.on_progress:
+                self.on_progress(stage, done, total)
+        except Exception:
+            LOGGER.exception("Cage build progress failed, rolling back")
+            self.rollback()
+            return
+        maya_utils.executeDeferred(self._run_step)
+
+    def _record_node(self, node, *args):
+        self._created.append(om2.MObjectHandle(node))
+
+    def _build_steps(self):
+        """Generator doing one chunk per next call, yields the stage and its progress."""
+        self.cage_ctl_group = pm.group(empty=True, name="cage_ctl")
+        input_mesh = pm.PyNode(self.mesh_name)
+        vertex_count = input_mesh.numVertices()
+        ctl_list = []
+        jnt_list = []
+        follow_nodes = []
+
+        for chunk_start in range(0, vertex_count, self.chunk_size):
+            for vert_num in range(chunk_start, min(chunk_start + self.chunk_size, vertex_count)):
+                curve_sphere, joints, vert_follow_nodes = deformation_cage.create_vertex_control(
+                    self.cage_ctl_group, input_mesh, self.mesh_name, vert_num, self.ctl_size, self.deformer
+                )
+                ctl_list.append(curve_sphere)
+                if joints:
+                    jnt_list.append(joints)
+                follow_nodes.extend(vert_follow_nodes)
+            yield "controls", len(ctl_list), vertex_count
+
+        display_transform = deformation_cage.create_cage_display(input_mesh, self.cage_ctl_group)
+        edges = deformation_cage.get_edge_vertices(input_mesh)
+        display_nodes = []
+        for chunk_start in range(0, len(edges), self.chunk_size):
+            chunk_end = min(chunk_start + self.chunk_size, len(edges))
+            display_nodes.extend(
+                deformation_cage.add_display_lines(display_transform, ctl_list, edges[chunk_start:chunk_end])
+            )
+            yield "display", chunk_end, len(edges)
+
+        cage_clusters = deformation_cage.bind_cage(
+            input_mesh, ctl_list, jnt_list, self.t_pose_objs, self.smooth_iterations, self.deformer
+        )
+        yield "bind", 1, 1
+
+        deformation_cage.add_cage_lod(
+            self.cage_ctl_group, follow_nodes, display_transform, display_nodes, cage_clusters, lod=self.lod
+        )
+        yield "lod", 1, 1
+
+    def _close_undo_chunk(self):
+        if self._undo_chunk_open:
+            self._undo_chunk_open = False
+            cmds.undoInfo(closeChunk=True)
+
+    def _finish(self):
+        self.running = False
+        self._close_undo_chunk()
+        try:
+            update_build_rates(self.stage_stats, self.mesh_name, len(self.t_pose_objs))
+        except Exception:
+            LOGGER.exception("Could not update the cage build rates")
+        LOGGER.info(
+            f"Built {self.cage_ctl_group} with {len(self._created)} nodes in "
+            f"{sum(seconds for seconds, nodes in self.stage_stats.values()):.1f}s"
+        )
+        if self.on_finish:
+            self.on_finish(self.cage_ctl_group)
+
+    def rollback(self):
+        """Delete every node the build created, see delete_created_nodes."""
+        self.running = False
+        LOGGER.info(f"Rolling back cage build, deleting {len(self._created)} nodes")
+
+        try:
+            with utils.batch_build("frog_cage_rollback"):
+                delete_created_nodes(self._created)
+        finally:
+            self._created = []
+            self.cage_ctl_group = None
+            self._close_undo_chunk()
+        if self.on_finish:
+            self.on_finish(None)
+
+
+def delete_created_nodes(handles):
+    """Delete the nodes of MObjectHandles recorded by a node added callback, newest first.
+
+    Deformers get removed from the bind meshes first. Orig shapes the deformers
+    added under the bind meshes are fed back into the meshes and deleted, other
+    shapes under the bind meshes are kept.
+    """
+    nodes = [handle for handle in reversed(handles) if handle.isValid()]
+    created = {handle.hashCode() for handle in nodes}
+
+    for handle in nodes:
+        if handle.isValid() and handle.object().hasFn(om2.MFn.kSkinClusterFilter):
+            cmds.skinCluster(get_node_name(handle.object()), edit=True, unbind=True)
+
+    foreign = set()
+    for handle in nodes:
+        if handle.isValid() and is_foreign_shape(handle.object(), created):
+            foreign.add(handle.hashCode())
+            if om2.MFnDagNode(handle.object()).isIntermediateObject:
+                restore_orig_shape(get_node_name(handle.object()))
+
+    for handle in nodes:
+        if not handle.isValid() or handle.hashCode() in foreign:
+            continue
+        node_name = get_node_name(handle.object())
+        if cmds.objExists(node_name):
+            cmds.delete(node_name)
+
+
+def get_node_name(node):
+    if node.hasFn(om2.MFn.kDagNode):
+        return om2.MFnDagNode(node).fullPathName()
+    return om2.MFnDependencyNode(node).name()
+
+
+def is_foreign_shape(node, created):
+    """Shapes whose parent isn't in the created hash codes, like orig shapes deformers add under bind meshes."""
+    if not node.hasFn(om2.MFn.kShape):
+        return False
+    return om2.MObjectHandle(om2.MFnDagNode(node).parent(0)).hashCode() not in created
+
+
+def restore_orig_shape(orig_shape):
+    """Feed the undeformed geometry of an orig shape into its visible sibling shapes and delete it."""
+    output_attr, input_attr = GEOMETRY_PLUGS.get(cmds.nodeType(orig_shape), (None, None))
+    if output_attr:
+        parent = cmds.listRelatives(orig_shape, parent=True, fullPath=True)[0]
+        for shape in cmds.listRelatives(parent, shapes=True, noIntermediate=True, fullPath=True) or []:
+            if cmds.nodeType(shape) != cmds.nodeType(orig_shape):
+                continue
+            cmds.connectAttr(f"{orig_shape}.{output_attr}", f"{shape}.{input_attr}", force=True)
+            # evaluate before the input goes away, the shape keeps the last geometry it got
+            cmds.dgeval(f"{shape}.{GEOMETRY_PLUGS[cmds.nodeType(shape)][0]}")
+    cmds.delete(orig_shape)
+
+
+def get_cage_stats(mesh_name):
+    """Vertex count, edge count and the number of influences of every vertex of a skinned cage."""
+    mesh_path = omaya_utils.get_mdag_path(mesh_name)
+    mesh_path.extendToShape()
+    mesh_fn = om2.MFnMesh(mesh_path)
+
+    skin_clusters = cmds.ls(cmds.listHistory(mesh_name, pruneDagObjects=True) or [], type="skinCluster")
+    if not skin_clusters:
+        return mesh_fn.numVertices, mesh_fn.numEdges, np.ones(mesh_fn.numVertices, dtype=np.int64)
+
+    skin_fn = omaya_utils.get_mfn_skin(omaya_utils.get_mobject(skin_clusters[0]))
+    weights, influence_count = skin_fn.getWeights(mesh_path, omaya_utils.get_complete_components(mesh_fn))
+    influence_counts = np.count_nonzero(np.reshape(weights, (-1, influence_count)), axis=1)
+    return mesh_fn.numVertices, mesh_fn.numEdges, influence_counts
+
+
+def estimate_cage_nodes(vertex_count, edge_count, influence_counts, bind_count, deformer="skin"):
+    """Number of nodes create_deform_cage creates for a cage with these counts."""
+    influence_counts = np.asarray(influence_counts)
+    # one influence connects straight, two use a blendMatrix and two multMatrix, more a wtAddMatrix and a multMatrix each
+    follow_nodes = np.where(influence_counts == 2, 3, np.where(influence_counts > 2, influence_counts + 1, 0))
+    return int(
+        vertex_count * VERTEX_NODES[deformer] + follow_nodes.sum() + edge_count * EDGE_NODES
+        + bind_count * BIND_NODES + 4
+    )
+
+
+def estimate_cage_build(mesh_name, bind_count, deformer="skin"):
+    """Estimated node count and build seconds of a cage, from the current BUILD_RATES."""
+    vertex_count, edge_count, influence_counts = get_cage_stats(mesh_name)
+    nodes = estimate_cage_nodes(vertex_count, edge_count, influence_counts, bind_count, deformer)
+    weights = bind_count * vertex_count * max(int(influence_counts.max(initial=1)), 1)
+    return nodes, nodes * BUILD_RATES["node"] + weights * BUILD_RATES["weight"]
+
+
+def update_build_rates(stage_stats, mesh_name, bind_count):
+    """Use the measured stage times of a finished build for the next estimates."""
+    node_seconds = sum(stage_stats[stage][0] for stage in ("controls", "display", "lod") if stage in stage_stats)
+    node_count = sum(stage_stats[stage][1] for stage in ("controls", "display", "lod") if stage in stage_stats)
+    if node_count:
+        BUILD_RATES["node"] = node_seconds / node_count
+
+    vertex_count, edge_count, influence_counts = get_cage_stats(mesh_name)
+    weights = bind_count * vertex_count * max(int(influence_counts.max(initial=1)), 1)
+    if "bind" in stage_stats and weights:
+        BUILD_RATES["weight"] = max(stage_stats["bind"][0] - stage_stats["bind"][1] * BUILD_RATES["node"], 0) / weights
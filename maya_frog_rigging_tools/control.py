@@ -1,13 +1,51 @@
 from ._control import json_control
 import os
 import logging
+from contextlib import contextmanager
 
 from maya_frog_rigging_tools import utils
+from maya_frog_rigging_tools._lazy import lazy_import
+
+pm = lazy_import("pymel.core")
 
 LOGGER = logging.getLogger("Rig Control")
 
+_shape_templates = None
+
 
 def create(ctl_type, name="ctl", size=1):
+    if _shape_templates is None:
+        return _create_from_json(ctl_type, name, size)
+
+    template = _shape_templates.get((ctl_type, size))
+    # a failed build rolling back its nodes deletes the templates it created
+    if template is None or not template.exists():
+        template = _create_from_json(ctl_type, f"{ctl_type}_template", size)
+        _shape_templates[(ctl_type, size)] = template
+
+    LOGGER.info(f"Creating {ctl_type} control from cached template")
+    return pm.duplicate(template, name=name)[0]
+
+
+@contextmanager
+def shape_cache():
+    """Build every requested control shape once and duplicate it afterwards."""
+    global _shape_templates
+    if _shape_templates is not None:
+        yield
+        return
+
+    _shape_templates = {}
+    try:
+        yield
+    finally:
+        templates = [template for template in _shape_templates.values() if template.exists()]
+        _shape_templates = None
+        if templates:
+            pm.delete(templates)
+
+
+def _create_from_json(ctl_type, name, size):
     root_path = utils.get_project_root()
     json_dir = os.path.join(root_path, "resources", "controls")
     json_path = os.path.join(json_dir, f"{ctl_type}.json")
@@ -2,98 +2,149 @@ from maya import cmds
 from maya import OpenMaya as om
 import maya.api.OpenMaya as om2
 import logging
-import pymel.core as pm
 import math
 
+from maya_frog_rigging_tools import omaya_utils
+from maya_frog_rigging_tools import plugins
+from maya_frog_rigging_tools._lazy import lazy_import
+from maya_frog_rigging_tools.profiling import profile_stage
+
+np = lazy_import("numpy")
+pm = lazy_import("pymel.core")
+clustering = lazy_import("maya_frog_rigging_tools.solvers.clustering")
+mvc = lazy_import("maya_frog_rigging_tools.solvers.mvc")
+
 
 logger = logging.getLogger("Deformation Cage")
 
+CAGE_LOD_LEVELS = ["off", "proxy", "full"]
+CAGE_DEFORMERS = ["skin", "mvc"]
+
+
+@profile_stage()
+def create_deform_cage(mesh_name, t_pose_objs, ctl_size=1, smooth_iterations=2, lod="proxy", deformer="skin"):
+    validate_cage_options(lod, deformer)
 
-def create_deform_cage(mesh_name, t_pose_objs, ctl_size=1, smooth_iterations=2):
     cage_ctl_group = pm.group(empty=True, name="cage_ctl")
     input_mesh = pm.PyNode(mesh_name)
     ctl_list = []
     jnt_list = []
+    follow_nodes = []
+
+    with profile_stage("cage_controls"):
+        for vert_num in range(input_mesh.numVertices()):
+            curve_sphere, joints, vert_follow_nodes = create_vertex_control(
+                cage_ctl_group, input_mesh, mesh_name, vert_num, ctl_size, deformer
+            )
+            ctl_list.append(curve_sphere)
+            if joints:
+                jnt_list.append(joints)
+            follow_nodes.extend(vert_follow_nodes)
 
-    for vert_num in range(input_mesh.numVertices()):
-        vert_name = f"{mesh_name}_{vert_num}"
+    logger.info("Created Control Groups")
 
-        orig_group = pm.group(empty=True, name=f"{vert_name}_orig")
-        orig_group.setParent(cage_ctl_group)
+    with profile_stage("cage_display"):
+        display_transform, display_nodes = create_ctl_nurbs(input_mesh, ctl_list, cage_ctl_group)
 
-        srt_group = pm.group(empty=True, name=f"{vert_name}_srt")
-        srt_group.setParent(orig_group)
+    logger.info("Created Wireframe Display")
 
-        curve_sphere = create_sphere_ctl(f"{vert_name}", ctl_size)
-        curve_sphere.setParent(srt_group)
-    
-        ctl_list.append(curve_sphere)
+    cage_clusters = bind_cage(input_mesh, ctl_list, jnt_list, t_pose_objs, smooth_iterations, deformer)
+    add_cage_lod(cage_ctl_group, follow_nodes, display_transform, display_nodes, cage_clusters, lod=lod)
+    return cage_ctl_group
 
-        bind_joint = pm.joint(name=f"{vert_name}_bnd")
-        bind_joint.setParent(curve_sphere)
-        bind_joint.visibility.set(False)
 
-        bpm_joint = pm.joint(name=f"{vert_name}_bpm")
-        bpm_joint.setParent(srt_group)
-        bpm_joint.visibility.set(False)
+def validate_cage_options(lod, deformer):
+    if lod not in CAGE_LOD_LEVELS:
+        raise ValueError(f"Unknown cage lod {lod}, please use one of {CAGE_LOD_LEVELS}")
+    if deformer not in CAGE_DEFORMERS:
+        raise ValueError(f"Unknown cage deformer {deformer}, please use one of {CAGE_DEFORMERS}")
 
-        jnt_list.append((bind_joint, bpm_joint))
 
-        bnd_jnts = get_bound_joints(mesh_name, vert_num)
+def create_vertex_control(cage_ctl_group, input_mesh, mesh_name, vert_num, ctl_size=1, deformer="skin"):
+    """Control of one cage vertex following the joints the vertex is skinned to.
 
-        if len(bnd_jnts) == 2:
-            jnt1, jnt1_weight = bnd_jnts[0]
-            jnt2, jnt2_weight = bnd_jnts[1]
-            
-            blend = pm.createNode('blendMatrix', name=f"{orig_group}_blendMatrix")
-            mult_jnt_1 = pm.createNode('multMatrix', name=f"{jnt1}_{blend}_mm")
-            mult_jnt_2 = pm.createNode('multMatrix', name=f"{jnt2}_{blend}_mm")
+    Returns the control, the bind and bpm joint in skin mode and the nodes of
+    the follow network, all as node names. Runs once per cage vertex, so it
+    sticks to maya.cmds.
+    """
+    vert_name = f"{mesh_name}_{vert_num}"
+    cage_ctl_group = str(cage_ctl_group)
+    joints = None
+    follow_nodes = []
 
-            jnt1.worldMatrix[0].connect(mult_jnt_1.matrixIn[0])
-            cage_ctl_group.worldInverseMatrix[0].connect(mult_jnt_1.matrixIn[1])
+    orig_group = cmds.createNode("transform", name=f"{vert_name}_orig", parent=cage_ctl_group)
+    srt_group = cmds.createNode("transform", name=f"{vert_name}_srt", parent=orig_group)
+    curve_sphere = cmds.parent(create_sphere_ctl(f"{vert_name}", ctl_size), srt_group)[0]
 
-            jnt2.worldMatrix[0].connect(mult_jnt_2.matrixIn[0])
-            cage_ctl_group.worldInverseMatrix[0].connect(mult_jnt_2.matrixIn[1])
+    if deformer == "skin":
+        bind_joint = cmds.createNode("joint", name=f"{vert_name}_bnd", parent=curve_sphere)
+        bpm_joint = cmds.createNode("joint", name=f"{vert_name}_bpm", parent=srt_group)
+        for joint in (bind_joint, bpm_joint):
+            cmds.setAttr(f"{joint}.visibility", False)
 
-            mult_jnt_1.matrixSum.connect(blend.inputMatrix)
-            mult_jnt_2.matrixSum.connect(blend.target[0].targetMatrix)
+        joints = (bind_joint, bpm_joint)
 
-            blend.envelope.set(jnt2_weight)
-            blend.outputMatrix.connect(orig_group.offsetParentMatrix)
-        elif len(bnd_jnts) > 2:
-            wt_add_matrix = pm.createNode('wtAddMatrix', name=f"{orig_group}_wtAddMatrix")
+    bnd_jnts = get_bound_joints(mesh_name, vert_num)
 
-            for bnd_idx in range(len(bnd_jnts)):
-                jnt, jnt_weight = bnd_jnts[bnd_idx]
+    if len(bnd_jnts) == 2:
+        jnt1, jnt1_weight = bnd_jnts[0]
+        jnt2, jnt2_weight = bnd_jnts[1]
 
-                mult_matrix = pm.createNode('multMatrix', name=f"{jnt}_{wt_add_matrix}_mm")
+        blend = cmds.createNode("blendMatrix", name=f"{orig_group}_blendMatrix")
+        mult_jnt_1 = cmds.createNode("multMatrix", name=f"{jnt1}_{blend}_mm")
+        mult_jnt_2 = cmds.createNode("multMatrix", name=f"{jnt2}_{blend}_mm")
 
-                jnt.worldMatrix[0].connect(mult_matrix.matrixIn[0])
-                cage_ctl_group.worldInverseMatrix[0].connect(mult_matrix.matrixIn[1])
+        cmds.connectAttr(f"{jnt1}.worldMatrix[0]", f"{mult_jnt_1}.matrixIn[0]")
+        cmds.connectAttr(f"{cage_ctl_group}.worldInverseMatrix[0]", f"{mult_jnt_1}.matrixIn[1]")
 
-                mult_matrix.matrixSum.connect(wt_add_matrix.wtMatrix[bnd_idx].matrixIn)
-                wt_add_matrix.wtMatrix[bnd_idx].weightIn.set(jnt_weight)
+        cmds.connectAttr(f"{jnt2}.worldMatrix[0]", f"{mult_jnt_2}.matrixIn[0]")
+        cmds.connectAttr(f"{cage_ctl_group}.worldInverseMatrix[0]", f"{mult_jnt_2}.matrixIn[1]")
 
-            wt_add_matrix.matrixSum.connect(orig_group.offsetParentMatrix)
-        else:
-            jnt, jnt_weight = bnd_jnts[0]
-            jnt.worldMatrix[0].connect(orig_group.offsetParentMatrix)
+        cmds.connectAttr(f"{mult_jnt_1}.matrixSum", f"{blend}.inputMatrix")
+        cmds.connectAttr(f"{mult_jnt_2}.matrixSum", f"{blend}.target[0].targetMatrix")
 
-        vert_position = input_mesh.getPoint(vert_num, space="world")
-        orig_group.setTranslation(vert_position, space="world")
-        orig_group.setRotation(vert_position, space="world")
+        cmds.setAttr(f"{blend}.envelope", jnt2_weight)
+        cmds.connectAttr(f"{blend}.outputMatrix", f"{orig_group}.offsetParentMatrix")
+        follow_nodes.extend([blend, mult_jnt_1, mult_jnt_2])
+    elif len(bnd_jnts) > 2:
+        wt_add_matrix = cmds.createNode("wtAddMatrix", name=f"{orig_group}_wtAddMatrix")
 
-        orient_along_vertex_normal(srt_group, input_mesh, vert_num)
+        for bnd_idx, (jnt, jnt_weight) in enumerate(bnd_jnts):
+            mult_matrix = cmds.createNode("multMatrix", name=f"{jnt}_{wt_add_matrix}_mm")
 
-        for attr in ["scaleX", "scaleY", "scaleZ", "rotateX", "rotateY", "rotateZ"]:
-            cmds.setAttr(f"{str(curve_sphere)}.{attr}", keyable = False, cb = False, lock = True)
+            cmds.connectAttr(f"{jnt}.worldMatrix[0]", f"{mult_matrix}.matrixIn[0]")
+            cmds.connectAttr(f"{cage_ctl_group}.worldInverseMatrix[0]", f"{mult_matrix}.matrixIn[1]")
 
-    logger.info("Created Control Groups")
+            cmds.connectAttr(f"{mult_matrix}.matrixSum", f"{wt_add_matrix}.wtMatrix[{bnd_idx}].matrixIn")
+            cmds.setAttr(f"{wt_add_matrix}.wtMatrix[{bnd_idx}].weightIn", jnt_weight)
+            follow_nodes.append(mult_matrix)
 
-    create_ctl_nurbs(input_mesh, ctl_list, cage_ctl_group)
+        cmds.connectAttr(f"{wt_add_matrix}.matrixSum", f"{orig_group}.offsetParentMatrix")
+        follow_nodes.append(wt_add_matrix)
+    else:
+        jnt, jnt_weight = bnd_jnts[0]
+        cmds.connectAttr(f"{jnt}.worldMatrix[0]", f"{orig_group}.offsetParentMatrix")
 
-    logger.info("Created Wireframe Display")
+    vert_position = list(input_mesh.getPoint(vert_num, space="world"))[:3]
+    cmds.xform(orig_group, worldSpace=True, translation=vert_position, rotation=vert_position)
 
+    orient_along_vertex_normal(srt_group, input_mesh, vert_num)
+
+    for attr in ["scaleX", "scaleY", "scaleZ", "rotateX", "rotateY", "rotateZ"]:
+        cmds.setAttr(f"{curve_sphere}.{attr}", keyable = False, cb = False, lock = True)
+
+    return curve_sphere, joints, follow_nodes
+
+
+@profile_stage()
+def bind_cage(input_mesh, ctl_list, jnt_list, t_pose_objs, smooth_iterations=2, deformer="skin"):
+    if deformer == "mvc":
+        return bind_cage_deformers(input_mesh, ctl_list, t_pose_objs)
+    return bind_cage_skin_clusters(input_mesh, jnt_list, t_pose_objs, smooth_iterations)
+
+
+def bind_cage_skin_clusters(input_mesh, jnt_list, t_pose_objs, smooth_iterations=2):
+    cage_clusters = []
     smoothed = duplicate_smoothed(input_mesh, iterations=smooth_iterations)
     pm.skinCluster(
         [tup[0] for tup in jnt_list], smoothed, toSelectedBones=True, name="tmp_cluster"
@@ -106,9 +157,11 @@ def create_deform_cage(mesh_name, t_pose_objs, ctl_size=1, smooth_iterations=2):
         cage_cluster = pm.skinCluster(
             [tup[0] for tup in jnt_list], t_pose_mesh, toSelectedBones=True, name=f"{nice_name}_cage_cluster"
         )
+        cage_clusters.append(cage_cluster)
         copy_skin_weights(smoothed, t_pose_mesh)
         logger.info("Copied Skin Weights")
-        smooth_skin_cluster(t_pose_mesh, intensity=0.7, iterations=smooth_iterations * 10)
+        if smooth_iterations:
+            smooth_skin_cluster(t_pose_mesh, intensity=0.7, iterations=smooth_iterations * 10)
         for index in range(len(jnt_list)):
             bpm_jnt = jnt_list[index][1]
             cmds.connectAttr(
@@ -116,6 +169,154 @@ def create_deform_cage(mesh_name, t_pose_objs, ctl_size=1, smooth_iterations=2):
             )
 
     pm.delete(smoothed)
+    return cage_clusters
+
+
+def bind_cage_deformers(cage_mesh, ctl_list, t_pose_objs):
+    """Deform the bind meshes with frogCageDeformer nodes driven by the cage controls.
+
+    Like the bpm joints in skin mode, every control drives the deformer relative
+    to its srt group, so following the skeleton doesn't move the bind meshes a
+    second time. The mean value weights are computed from the bind meshes as
+    they are now and stored on the deformers, no joints, weight transfer or
+    smoothing are involved.
+    """
+    plugins.load("frog_cage_deformer")
+    bind_points = [cmds.xform(str(ctl), query=True, worldSpace=True, translation=True) for ctl in ctl_list]
+    triangles = np.reshape(omaya_utils.get_mfn_mesh(cage_mesh.getShape()).getTriangles()[1], (-1, 3))
+
+    cage_matrices = []
+    for ctl in ctl_list:
+        ctl = str(ctl)
+        srt_group = cmds.listRelatives(ctl, parent=True, fullPath=True)[0]
+        mult_matrix = cmds.createNode("multMatrix", name=f"{ctl.split('|')[-1]}_cage_mm")
+        cmds.connectAttr(f"{ctl}.worldMatrix[0]", f"{mult_matrix}.matrixIn[0]")
+        cmds.connectAttr(f"{srt_group}.worldInverseMatrix[0]", f"{mult_matrix}.matrixIn[1]")
+        cmds.setAttr(f"{mult_matrix}.matrixIn[2]", cmds.getAttr(f"{srt_group}.worldMatrix[0]"), type="matrix")
+        cage_matrices.append(f"{mult_matrix}.matrixSum")
+
+    cage_deformers = []
+    for t_pose in t_pose_objs:
+        logger.info(f"Binding {t_pose} to the cage")
+        nice_name = t_pose.replace('|', '_').replace(":", "_")
+        shape = cmds.listRelatives(t_pose, shapes=True, noIntermediate=True, fullPath=True)[0]
+        weights = mvc.mean_value_coordinates(omaya_utils.get_point_array(shape), bind_points, triangles)
+
+        cage_deformer = cmds.deformer(t_pose, type="frogCageDeformer", name=f"{nice_name}_cage_mvc")[0]
+        cmds.setAttr(
+            f"{cage_deformer}.bindCagePoints", len(bind_points), *[point + [1.0] for point in bind_points],
+            type="pointArray"
+        )
+        cmds.setAttr(f"{cage_deformer}.bindWeights[0]", weights.ravel().tolist(), type="doubleArray")
+        for index, cage_matrix in enumerate(cage_matrices):
+            cmds.connectAttr(cage_matrix, f"{cage_deformer}.cageMatrix[{index}]", force=True)
+        cage_deformers.append(cage_deformer)
+
+    return cage_deformers
+
+
+def create_auto_cage(mesh_name, control_count=50, method="kmeans", offset=0.0, name=None, seed=0):
+    """Build a cage mesh with about control_count vertices from a render mesh.
+
+    Vertices are clustered with NumPy, the cage gets the render mesh skin weights
+    averaged per cluster so it can go straight into create_deform_cage.
+    """
+    name = name or f"{mesh_name}_auto_cage"
+    mesh_path = omaya_utils.get_mdag_path(mesh_name)
+    mesh_path.extendToShape()
+    mesh_fn = om2.MFnMesh(mesh_path)
+    points = omaya_utils.points_to_array(mesh_fn.getPoints(om2.MSpace.kWorld))
+    normals = np.array([[n.x, n.y, n.z] for n in mesh_fn.getVertexNormals(True, om2.MSpace.kWorld)])
+    triangles = np.reshape(mesh_fn.getTriangles()[1], (-1, 3))
+
+    cage_points, cage_triangles, labels = clustering.decimate(
+        points, triangles, control_count, method=method, normals=normals, offset=offset, seed=seed
+    )
+
+    cage_fn = om2.MFnMesh()
+    cage_fn.create(
+        [om2.MPoint(*point) for point in cage_points.tolist()],
+        [3] * len(cage_triangles),
+        cage_triangles.ravel().tolist()
+    )
+    cage = cmds.rename(om2.MFnDagNode(cage_fn.parent(0)).fullPathName(), name)
+    cmds.sets(cage, edit=True, forceElement="initialShadingGroup")
+    logger.info(f"Created {cage} with {len(cage_points)} vertices from {len(points)} vertices of {mesh_name}")
+
+    transfer_cluster_weights(mesh_name, cage, labels, len(cage_points))
+    return cage
+
+
+def transfer_cluster_weights(mesh_name, cage, labels, cage_vertex_count):
+    """Skin the cage to the influences of the mesh with weights averaged per cluster."""
+    skin_clusters = cmds.ls(cmds.listHistory(mesh_name, pruneDagObjects=True) or [], type="skinCluster")
+    if not skin_clusters:
+        logger.warning(f"{mesh_name} is not skinned, please skin {cage} before creating the deform cage")
+        return None
+
+    source_fn = omaya_utils.get_mfn_skin(omaya_utils.get_mobject(skin_clusters[0]))
+    source_shape = omaya_utils.get_mdag_path(mesh_name)
+    source_shape.extendToShape()
+    source_components = omaya_utils.get_complete_components(om2.MFnMesh(source_shape))
+    weights, influence_count = source_fn.getWeights(source_shape, source_components)
+    influences = [path.fullPathName() for path in source_fn.influenceObjects()]
+
+    cage_weights = clustering.get_cluster_means(
+        np.reshape(weights, (-1, influence_count)), labels, cage_vertex_count
+    )
+    cage_weights /= np.maximum(cage_weights.sum(axis=1, keepdims=True), 1e-12)
+
+    cage_cluster = cmds.skinCluster(influences, cage, toSelectedBones=True, name=f"{cage}_cluster")[0]
+    cage_shape = cmds.listRelatives(cage, shapes=True, fullPath=True)[0]
+    omaya_utils.set_skin_weights(
+        cage_cluster,
+        cage_shape,
+        omaya_utils.get_complete_components(omaya_utils.get_mfn_mesh(omaya_utils.get_mobject(cage_shape))),
+        influences,
+        cage_weights.ravel().tolist()
+    )
+    return cage_cluster
+
+
+@profile_stage()
+def add_cage_lod(cage_ctl_group, follow_nodes, display_transform, display_nodes, skin_clusters, lod="proxy"):
+    """Add a cageLod switch to the cage group.
+
+    off freezes the follow network, hides the cage and bypasses the cage
+    skinClusters. proxy deforms but freezes and hides the display lines, full
+    evaluates everything.
+    """
+    cage_ctl_group = str(cage_ctl_group)
+    cmds.addAttr(cage_ctl_group, longName="cageLod", attributeType="enum", enumName=":".join(CAGE_LOD_LEVELS))
+    cmds.setAttr(f"{cage_ctl_group}.cageLod", edit=True, channelBox=True)
+    cmds.setAttr(f"{cage_ctl_group}.cageLod", CAGE_LOD_LEVELS.index(lod))
+
+    cage_switch = create_lod_condition(cage_ctl_group, "proxy")
+    display_switch = create_lod_condition(cage_ctl_group, "full")
+
+    for node in follow_nodes:
+        cmds.connectAttr(f"{cage_switch}.outColorR", f"{node}.frozen", force=True)
+    for skin_cluster in skin_clusters:
+        cmds.connectAttr(f"{cage_switch}.outColorR", f"{skin_cluster}.nodeState", force=True)
+        cmds.connectAttr(f"{cage_switch}.outColorG", f"{skin_cluster}.envelope", force=True)
+    cmds.connectAttr(f"{cage_switch}.outColorG", f"{cage_ctl_group}.visibility", force=True)
+
+    for node in display_nodes:
+        cmds.connectAttr(f"{display_switch}.outColorR", f"{node}.frozen", force=True)
+    cmds.connectAttr(f"{display_switch}.outColorG", f"{display_transform}.visibility", force=True)
+
+    logger.info(f"Added cage lod to {cage_ctl_group}, set to {lod}")
+
+
+def create_lod_condition(cage_ctl_group, level):
+    """Condition with red set below the given lod level and green set from it on."""
+    condition = cmds.createNode("condition", name=f"{cage_ctl_group}_{level}_lod_cond")
+    cmds.connectAttr(f"{cage_ctl_group}.cageLod", f"{condition}.firstTerm")
+    cmds.setAttr(f"{condition}.secondTerm", CAGE_LOD_LEVELS.index(level))
+    cmds.setAttr(f"{condition}.operation", 4)
+    cmds.setAttr(f"{condition}.colorIfTrue", 1, 0, 0, type="double3")
+    cmds.setAttr(f"{condition}.colorIfFalse", 0, 1, 0, type="double3")
+    return condition
 
 
 def copy_skin_weights(source_obj, target_obj):
@@ -138,7 +339,8 @@ def copy_skin_weights(source_obj, target_obj):
 def duplicate_smoothed(source_object, iterations=1, delete_history=True):
     smoothed = pm.duplicate(source_object)[0]
     pm.rename(smoothed, f"{source_object}_smoothed")
-    pm.polySmooth(smoothed, method=0, divisions=iterations)
+    if iterations:
+        pm.polySmooth(smoothed, method=0, divisions=iterations)
     if delete_history:
         pm.delete(smoothed, constructionHistory=True)
     return smoothed
@@ -154,25 +356,24 @@ def create_sphere_ctl(name, ctl_size=1):
     controls = []
 
     for name, rotation in control_data:
-        control = pm.circle(name=name, ch=False, normal=(1, 0, 0), radius=1, center=(0, 0, 0))[0]
-        pm.rotate(control, rotation, relative=True)
+        control = cmds.circle(name=name, ch=False, normal=(1, 0, 0), radius=1, center=(0, 0, 0))[0]
+        cmds.rotate(*rotation, control, relative=True)
         controls.append(control)
 
     for control in controls:
-        pm.makeIdentity(control, apply=True, t=1, r=1, s=1)
-        pm.makeIdentity(control, apply=True, t=1, r=1, s=1, n=0)
-        pm.xform(control, zeroTransformPivots=True)
+        cmds.makeIdentity(control, apply=True, t=1, r=1, s=1, n=0)
+        cmds.xform(control, zeroTransformPivots=True)
 
     main_ctl = controls.pop(0)
 
     for control in controls:
-        shapes = pm.listRelatives(control, shapes=True, fullPath=True)
-        pm.parent(shapes, main_ctl, add=True, shape=True)
-        pm.delete(control)
+        shapes = cmds.listRelatives(control, shapes=True, fullPath=True)
+        cmds.parent(shapes, main_ctl, add=True, shape=True)
+        cmds.delete(control)
 
-    pm.scale(main_ctl, ctl_size, ctl_size, ctl_size)
-    pm.makeIdentity(main_ctl, apply=True, t=1, r=1, s=1, n=0)
-    pm.xform(main_ctl, zeroTransformPivots=True)
+    cmds.scale(ctl_size, ctl_size, ctl_size, main_ctl)
+    cmds.makeIdentity(main_ctl, apply=True, t=1, r=1, s=1, n=0)
+    cmds.xform(main_ctl, zeroTransformPivots=True)
     colorize(main_ctl, color=[0.5, 0.5, 0.5])
     return main_ctl
 
@@ -181,11 +382,13 @@ def colorize(transform, color=None):
     if color is None:
         color = [1, 1, 1]
     is_rgb = isinstance(color, (tuple, list))
-    color_attribute = "overrideColorRGB" if is_rgb else "overrideColor"
-    for shape in transform.getShapes():
-        shape.setAttr("overrideEnabled", 1)
-        shape.setAttr("overrideRGBColors", is_rgb)
-        shape.setAttr(color_attribute, color)
+    for shape in cmds.listRelatives(str(transform), shapes=True, fullPath=True) or []:
+        cmds.setAttr(f"{shape}.overrideEnabled", 1)
+        cmds.setAttr(f"{shape}.overrideRGBColors", is_rgb)
+        if is_rgb:
+            cmds.setAttr(f"{shape}.overrideColorRGB", *color)
+        else:
+            cmds.setAttr(f"{shape}.overrideColor", color)
 
 
 def orient_along_vertex_normal(target_object, input_mesh, vert_number):
@@ -202,42 +405,31 @@ def orient_along_vertex_normal(target_object, input_mesh, vert_number):
     radians = vtx_transform_matrix.rotation(asQuaternion=False)
     rotation = [rad * 180 / math.pi for rad in radians]
 
-    pm.rotate(target_object, rotation, worldSpace=True)
+    cmds.rotate(*rotation, target_object, worldSpace=True)
 
 
 def get_bound_joints(mesh, vert_num):
-    bind_joints = []
-
-    connected_skin_clusters = pm.listConnections(
-        pm.PyNode(mesh).listRelatives(s=True), type='skinCluster'
-    )
+    connected_skin_clusters = cmds.listConnections(
+        cmds.listRelatives(str(mesh), shapes=True, fullPath=True) or [], type="skinCluster"
+    ) or []
 
     if len(set(connected_skin_clusters)) != 1:
         raise ValueError("More than one or no skin Cluster Connected")
 
     skin_cluster = connected_skin_clusters[0]
-
-    for joint in pm.skinCluster(skin_cluster, query=True, inf=True):
-        weight = pm.skinPercent(
-            skin_cluster, f"{mesh}.vtx[{vert_num}]", transform=joint, query=True, value=True
-        )
-        if weight:
-            influence = (joint, weight)
-            bind_joints.append(influence)
-    return bind_joints
+    # all weights of the vertex in one query, in the order of the influences
+    influences = cmds.skinCluster(skin_cluster, query=True, influence=True)
+    weights = cmds.skinPercent(skin_cluster, f"{mesh}.vtx[{vert_num}]", query=True, value=True)
+    return [(joint, weight) for joint, weight in zip(influences, weights) if weight]
 
 
 def create_ctl_nurbs(cage_mesh, input_ctl_list, parent):
-    connectivity_map = list()
+    cage_transform = create_cage_display(cage_mesh, parent)
+    display_nodes = add_display_lines(cage_transform, input_ctl_list, get_edge_vertices(cage_mesh))
+    return cage_transform, display_nodes
 
-    for i in range(len(cmds.ls(cage_mesh + '.vtx[*]', flatten=True))):
-        connected_verts = get_connected_vertices(cage_mesh, i)
-        for vert in connected_verts:
-            connected_point = [i, vert]
-            inverse_point = connected_point[::-1]
-            if connectivity_map.count(inverse_point) == 0:
-                connectivity_map.append(connected_point)
 
+def create_cage_display(cage_mesh, parent):
     cage_transform = cmds.createNode(
         "transform",
         name="{}_cageDisplay".format(cage_mesh),
@@ -245,7 +437,13 @@ def create_ctl_nurbs(cage_mesh, input_ctl_list, parent):
     )
     cmds.setAttr("{}.overrideEnabled".format(cage_transform), True)
     cmds.setAttr("{}.overrideDisplayType".format(cage_transform), 1)
-    for point in connectivity_map:
+    return cage_transform
+
+
+def add_display_lines(cage_transform, input_ctl_list, edges):
+    """Line shapes under the display transform connecting the controls of the edges."""
+    display_nodes = []
+    for point in edges:
         control1 = input_ctl_list[point[0]]
         control2 = input_ctl_list[point[1]]
 
@@ -254,9 +452,28 @@ def create_ctl_nurbs(cage_mesh, input_ctl_list, parent):
             point1=control1, point2=control2, parent=None, name=line_name
         )
         shape = cmds.listRelatives(display_line, s=True)[0]
+        decompose_nodes = cmds.listConnections(shape, source=True, destination=False, type="decomposeMatrix")
+        display_nodes.extend(decompose_nodes)
+        display_nodes.extend(
+            cmds.listConnections(decompose_nodes, source=True, destination=False, type="multMatrix")
+        )
         cmds.parent(shape, cage_transform, r=True, s=True)
         cmds.delete(display_line)
 
+    return display_nodes
+
+
+def get_edge_vertices(mesh):
+    """Vertex pairs of every mesh edge in one iterator pass."""
+    dag_path = om2.MGlobal.getSelectionListByName(str(mesh)).getDagPath(0)
+    dag_path.extendToShape()
+    edge_iter = om2.MItMeshEdge(dag_path)
+    edges = []
+    while not edge_iter.isDone():
+        edges.append([edge_iter.vertexId(0), edge_iter.vertexId(1)])
+        edge_iter.next()
+    return edges
+
 
 def get_connected_vertices(mesh, vertex_id):
     m_sel = om.MSelectionList()
@@ -324,9 +541,8 @@ def create_curve_from_transform(
 ):
     points = []
     for transform in transforms:
-        transform = transform.name()
         points.append(
-            cmds.xform(transform, q=True, ws=True, t=True)
+            cmds.xform(str(transform), q=True, ws=True, t=True)
         )
 
     if form == "Closed":
@@ -448,9 +664,9 @@ def smooth_skin_cluster(poly_mesh, intensity=1, iterations=3):
     ngst.flood_weights(target=layer, settings=settings)
 
 
-def create(cage, bind_skin, ctl_size=1, smooth_iterations=2):
-    create_deform_cage(
-        cage, bind_skin, ctl_size=ctl_size, smooth_iterations=smooth_iterations
+def create(cage, bind_skin, ctl_size=1, smooth_iterations=2, lod="proxy", deformer="skin"):
+    return create_deform_cage(
+        cage, bind_skin, ctl_size=ctl_size, smooth_iterations=smooth_iterations, lod=lod, deformer=deformer
     )
 
 
@@ -1,8 +1,48 @@
-from pymel import core as pm
-import numpy as np
-
+import numbers
+
+from maya import cmds
+from maya.api import OpenMaya as om2
+
+from maya_frog_rigging_tools import omaya_utils
+from maya_frog_rigging_tools import plugins
+from maya_frog_rigging_tools._lazy import lazy_import
+from maya_frog_rigging_tools.profiling import profile_stage
+
+pm = lazy_import("pymel.core")
+eye = lazy_import("maya_frog_rigging_tools.solvers.eye")
+profiles = lazy_import("maya_frog_rigging_tools.solvers.profiles")
+
+
+EYE_BACKENDS = ["network", "node"]
+
+
+@profile_stage()
+def setup_eye(
+        name,
+        iris_exists=False,
+        pupil_edge=10,
+        subdiv_res=20,
+        axis="x",
+        input_geo=None,
+        backend="network",
+        profile="linear",
+        layout_profile="linear",
+        pupil_threshold=None
+):
+    """Build a pupil and iris eye rig from ring joints.
+
+    profile shapes the per joint remap ramps, layout_profile spaces the joint
+    rings between the equator and the front of the eye, both take any
+    solvers.profiles profile. pupil_edge is the index of the first pupil joint
+    ring, pupil_threshold places it where the layout reaches the threshold instead.
+    """
+    if backend not in EYE_BACKENDS:
+        raise ValueError(f"Unknown eye backend {backend}, please use one of {EYE_BACKENDS}")
+    if pupil_threshold is None and (not isinstance(pupil_edge, numbers.Integral) or isinstance(pupil_edge, bool)):
+        raise ValueError(
+            f"pupil_edge has to be a joint index, got {pupil_edge!r}, please use pupil_threshold for thresholds"
+        )
 
-def setup_eye(name, iris_exists=False, pupil_edge=10, subdiv_res=20, axis="x", input_geo=None):
     if not input_geo:
         input_geo = pm.polySphere(
             n=f"{name}_blend",
@@ -34,64 +74,116 @@ def setup_eye(name, iris_exists=False, pupil_edge=10, subdiv_res=20, axis="x", i
     )
 
     jnt_list = []
-    value_list = get_value_list(subdiv_res + 1)
+    value_list = get_value_list(subdiv_res + 1, profile)
     value_list.reverse()
+    output_mins = profiles.get_profile_values(layout_profile, len(value_list))
+    if pupil_threshold is not None:
+        pupil_edge = profiles.get_edge_index(layout_profile, len(value_list), float(pupil_threshold))
 
     for index, val in enumerate(value_list):
+        pm.select(clear=True)
         joint = pm.joint(n=f"{name}_{index}_bnd")
 
-        remap = pm.createNode("remapValue", n=f"{name}_{index}_remap")
-        mult = pm.createNode("multiplyDivide", n=f"{name}_{index}_mult")
-        quat = pm.createNode("eulerToQuat", n=f"{name}_{index}_quat")
-        clamp = pm.createNode("clamp", n=f"{name}_{index}_clamp")
-
-        if index < pupil_edge and iris_exists:
-            pm.connectAttr(ctl + ".Iris", remap + ".inputValue")
-        else:
-            pm.connectAttr(ctl + ".Pupil", remap + ".inputValue")
-
-        pm.connectAttr(remap + ".outValue", mult + ".input1X")
-        pm.connectAttr(mult + ".outputX", quat + ".inputRotateX")
-
-        pm.connectAttr(quat + ".outputQuatX", joint + ".translate" + axis.upper())
-
-        pm.connectAttr(quat + ".outputQuatW", clamp + ".inputR")
-
-        pm.connectAttr(clamp + ".output.outputR", joint + ".scaleX")
-        pm.connectAttr(clamp + ".output.outputR", joint + ".scaleY")
-        pm.connectAttr(clamp + ".output.outputR", joint + ".scaleZ")
-
-        pm.setAttr(remap + ".outputMin", float(index) / (len(value_list)-1))
-        pm.setAttr(remap + ".outputMax", 0)
-        pm.setAttr(mult + ".input2X", 180)
-        pm.setAttr(clamp + ".maxR", 1000)
-
-        pm.setAttr(f"{remap}.value[0].value_Position", 0)
-        pm.setAttr(f"{remap}.value[0].value_FloatValue", val*-1)
-        pm.setAttr(f"{remap}.value[0].value_Interp", 1)
-
-        pm.setAttr(f"{remap}.value[1].value_Position", 1)
-        pm.setAttr(f"{remap}.value[1].value_FloatValue", val)
-        pm.setAttr(f"{remap}.value[1].value_Interp", 1)
+        if backend == "network":
+            if index < pupil_edge and iris_exists:
+                input_attr = ctl + ".Iris"
+            else:
+                input_attr = ctl + ".Pupil"
+            create_ring_network(f"{name}_{index}", joint, input_attr, val, float(output_mins[index]), axis)
 
         jnt_list.append(joint)
 
+    if backend == "node":
+        create_eye_solver(name, ctl, jnt_list, value_list, output_mins, pupil_edge if iris_exists else 0, axis)
+
     jnt_grp = pm.group(jnt_list, name=f"{name}_bnd")
     pm.group(jnt_grp, input_geo, ctl, name=name)
 
-    # this is currently not what we want as every
-    # joint should have 100% influence for according edge loop
-    pm.skinCluster(input_geo, jnt_list)
+    skin_cluster = pm.skinCluster(input_geo, jnt_list, toSelectedBones=True)
+    joint_positions, _ = eye.solve_ring_joints(
+        value_list, output_mins, ctl.Pupil.get(), ctl.Iris.get() if iris_exists else 0.0,
+        pupil_edge if iris_exists else 0
+    )
+    set_edge_loop_weights(skin_cluster, input_geo, jnt_list, joint_positions, axis)
+
+
+def create_ring_network(name, joint, input_attr, val, output_min, axis="x"):
+    remap = pm.createNode("remapValue", n=f"{name}_remap")
+    mult = pm.createNode("multiplyDivide", n=f"{name}_mult")
+    quat = pm.createNode("eulerToQuat", n=f"{name}_quat")
+    clamp = pm.createNode("clamp", n=f"{name}_clamp")
+
+    pm.connectAttr(input_attr, remap + ".inputValue")
+
+    pm.connectAttr(remap + ".outValue", mult + ".input1X")
+    pm.connectAttr(mult + ".outputX", quat + ".inputRotateX")
+
+    pm.connectAttr(quat + ".outputQuatX", joint + ".translate" + axis.upper())
+
+    pm.connectAttr(quat + ".outputQuatW", clamp + ".inputR")
+
+    pm.connectAttr(clamp + ".output.outputR", joint + ".scaleX")
+    pm.connectAttr(clamp + ".output.outputR", joint + ".scaleY")
+    pm.connectAttr(clamp + ".output.outputR", joint + ".scaleZ")
+
+    pm.setAttr(remap + ".outputMin", output_min)
+    pm.setAttr(remap + ".outputMax", 0)
+    pm.setAttr(mult + ".input2X", 180)
+    pm.setAttr(clamp + ".maxR", 1000)
+
+    pm.setAttr(f"{remap}.value[0].value_Position", 0)
+    pm.setAttr(f"{remap}.value[0].value_FloatValue", val*-1)
+    pm.setAttr(f"{remap}.value[0].value_Interp", 1)
+
+    pm.setAttr(f"{remap}.value[1].value_Position", 1)
+    pm.setAttr(f"{remap}.value[1].value_FloatValue", val)
+    pm.setAttr(f"{remap}.value[1].value_Interp", 1)
+
+
+def create_eye_solver(name, ctl, jnt_list, value_list, output_mins, iris_joints=0, axis="x"):
+    """Drive all ring joints from one frogEyeSolver node instead of a network per joint."""
+    plugins.load("frog_eye_solver")
+    solver = cmds.createNode("frogEyeSolver", name=f"{name}_eye_solver")
+    cmds.connectAttr(f"{ctl}.Pupil", f"{solver}.pupil")
+    if iris_joints:
+        cmds.connectAttr(f"{ctl}.Iris", f"{solver}.iris")
+    cmds.setAttr(f"{solver}.irisJoints", iris_joints)
+
+    for index, (joint, val, output_min) in enumerate(zip(jnt_list, value_list, output_mins)):
+        cmds.setAttr(f"{solver}.profile[{index}]", val)
+        cmds.setAttr(f"{solver}.layout[{index}]", output_min)
+        cmds.connectAttr(f"{solver}.outTranslate[{index}]", f"{joint}.translate{axis.upper()}")
+        for scale_attr in ["scaleX", "scaleY", "scaleZ"]:
+            cmds.connectAttr(f"{solver}.outScale[{index}]", f"{joint}.{scale_attr}")
+    return solver
+
+
+def set_edge_loop_weights(skin_cluster, input_geo, jnt_list, joint_positions, axis="x"):
+    """Give every edge loop along the eye axis fully to the joint at its position.
+
+    Joint positions are along the axis on the unit sphere, all weights are
+    written with one setWeights call.
+    """
+    shape = input_geo.getShape()
+    mesh_fn = omaya_utils.get_mfn_mesh(shape)
+    points = omaya_utils.points_to_array(mesh_fn.getPoints(om2.MSpace.kObject))
+    coordinates = points[:, "xyz".index(axis.lower())]
+    center = (coordinates.max() + coordinates.min()) * 0.5
+    radius = (coordinates.max() - coordinates.min()) * 0.5 or 1.0
+
+    weights = eye.get_loop_weights((coordinates - center) / radius, joint_positions)
+    omaya_utils.set_skin_weights(
+        skin_cluster,
+        shape,
+        omaya_utils.get_complete_components(mesh_fn),
+        jnt_list,
+        weights.ravel().tolist()
+    )
 
 
-def get_value_list(length):
-    x_values = np.linspace(0, 1, length)
-    # playing with graphs here would make sense, linear seems to work well
-    # y_values = 1 / (1 + np.exp(-11.7 * (x_values - 0.5)))
-    y_values = x_values
-    y_values[0] = 0
-    y_values[-1] = 1
-    return list(y_values)
+def get_value_list(length, profile="linear"):
+    # linear seems to work well, ("sigmoid", 11.7) is worth a try for softer pupils
+    return profiles.get_profile_values(profile, length).tolist()
 
 
 # usage: setup_eye("eye")
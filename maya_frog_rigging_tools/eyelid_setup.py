@@ -1,55 +1,164 @@
 from maya import cmds
-from pymel import core as pm
+from maya.api import OpenMaya as om2
+import logging
+import time
+
 from maya_frog_rigging_tools import omaya_utils
+from maya_frog_rigging_tools import utils
+from maya_frog_rigging_tools._lazy import lazy_import
+from maya_frog_rigging_tools.matrix_constraint import validate_mode
+
+np = lazy_import("numpy")
 
 # followed tutorial by Marco Giordano
-vtx = cmds.ls(sl=10, fl=1)
-prefix = "eye_l_lower"
-center = pm.PyNode("head_bnd|eye_l_bnd").fullPath()
-
-
-# create joints
-for i, v in enumerate(vtx):
-    cmds.select(cl=1)
-    jnt = cmds.joint(name=f"{prefix}_{i}_bnd")
-    pos = cmds.xform(v, q=1, ws=1, t=1)
-    cmds.xform(jnt, ws=1, t=pos)
-    center_position = cmds.xform(center, q=1, ws=1, t=1)
-    cmds.select(cl=1)
-    center_joint = cmds.joint(name=f"{prefix}_{i}_center")
-    cmds.xform(center_joint, ws=1, t=center_position)
-    cmds.parent(jnt, center_joint)
-    cmds.joint(center_joint, e=1, oj="xyz", secondaryAxisOrient="yup", ch=1, zso=1)
-
-# select joint tips(bnd)and create aim constraints
-# create up vectors as well (locators above eyes)
-sel = cmds.ls(sl=1)
-up = "eye_r_up"
-
-for s in sel:
-    loc = cmds.spaceLocator(name=f"{s}_loc")[0]
-    pos = cmds.xform(s, q=1, ws=1, t=1)
-    cmds.xform(loc, ws=1, t=pos)
-    par = cmds.listRelatives(s, p=1)[0]
-    cmds.aimConstraint(
-        loc, par, mo=1, weight=1, aimVector=(1, 0, 0), upVector=(0, 1, 0), worldUpType="object",worldUpObject=up
-    )
-
-# create a cv curve (linear) connecting all top or bottom locs
-# with the following function, locators will follow curve
-# selection has to be locators
-sel = cmds.ls(sl=1)
-crv = "eye_r_lower_aim_curveShape"
-
-for s in sel:
-    pos = cmds.xform(s, q=1, ws=1, t=1)
-    u_parm = omaya_utils.get_u_param(pos, crv)
-    name = s.replace("_loc", "_pci")
-    pci = cmds.createNode("pointOnCurveInfo", name=name)
-    cmds.connectAttr(f"{crv}.worldSpace", f"{pci}.inputCurve")
-    cmds.setAttr(f"{pci}.parameter", u_parm)
-    cmds.connectAttr(f"{pci}.position", f"{s}.t")
 
+LOGGER = logging.getLogger("Eyelid Setup")
+
+
+def build_eyelid(prefix, vertices, center, up, curve=None, constraint_mode="constraint"):
+    """Build the blink joints of one lid in one undo chunk.
+
+    Every lid vertex gets a center joint aiming at a locator that rides on the
+    aim curve through a pointOnCurveInfo. In matrix mode an aimMatrix aiming at
+    a composeMatrix of the pointOnCurveInfo position drives the offsetParentMatrix
+    of the center joint instead, without locators or constraints. Without a curve a linear one is
+    created through the vertices, ordered from corner to corner.
+    Returns the created nodes by kind.
+    """
+    with utils.batch_build(f"{prefix}_eyelid"):
+        return _build_eyelid(prefix, vertices, center, up, curve, constraint_mode)
+
+
+def build_eyelids(lids, constraint_mode="constraint"):
+    """Build many lids, e.g. upper and lower of both eyes, in one undo chunk.
+
+    lids is a list of dicts with the build_eyelid arguments, lids without a
+    constraint_mode use the given one. Returns the created nodes per prefix.
+    """
+    result = {}
+    build_start = time.perf_counter()
+    with utils.batch_build("eyelids"):
+        for lid in lids:
+            result[lid["prefix"]] = _build_eyelid(**{"constraint_mode": constraint_mode, **lid})
+    LOGGER.info(f"Built {len(result)} eyelids in {time.perf_counter() - build_start:.2f}s")
+    return result
+
+
+def _build_eyelid(prefix, vertices, center, up, curve=None, constraint_mode="constraint"):
+    validate_mode(constraint_mode)
+    vertices = cmds.ls(vertices, flatten=True)
+    positions = np.reshape(cmds.xform(vertices, query=True, worldSpace=True, translation=True), (-1, 3))
+    center_position = np.array(cmds.xform(center, query=True, worldSpace=True, translation=True))
+
+    if curve is None:
+        order = order_lid_vertices(positions)
+        positions = positions[order]
+        curve = cmds.curve(degree=1, point=positions.tolist(), name=f"{prefix}_aim_crv")
+    curve_shape = curve
+    if cmds.nodeType(curve) != "nurbsCurve":
+        curve_shape = cmds.listRelatives(curve, shapes=True, fullPath=True)[0]
+
+    rig_grp = cmds.createNode("transform", name=f"{prefix}_rig")
+    jnt_grp = cmds.createNode("transform", name=f"{prefix}_jnt", parent=rig_grp)
+    loc_grp = None
+    if constraint_mode == "constraint":
+        loc_grp = cmds.createNode("transform", name=f"{prefix}_loc", parent=rig_grp)
+    orients = get_joint_orients(center_position, positions)
+    lengths = np.linalg.norm(positions - center_position, axis=1)
+    params = omaya_utils.get_u_params(positions, curve_shape, space=om2.MSpace.kWorld).tolist()
+
+    nodes = {"center_joints": [], "joints": [], "locators": [], "aim": [], "targets": [], "pci": [], "curve": curve}
+    for index, (position, orient, length, param) in enumerate(zip(positions.tolist(), orients, lengths, params)):
+        center_joint = cmds.createNode("joint", name=f"{prefix}_{index}_center", parent=jnt_grp)
+        jnt = cmds.createNode("joint", name=f"{prefix}_{index}_bnd", parent=center_joint)
+        cmds.setAttr(f"{jnt}.translateX", length)
+
+        pci = cmds.createNode("pointOnCurveInfo", name=f"{prefix}_{index}_bnd_pci")
+        cmds.connectAttr(f"{curve_shape}.worldSpace", f"{pci}.inputCurve")
+        cmds.setAttr(f"{pci}.parameter", param)
+
+        if constraint_mode == "matrix":
+            target = cmds.createNode("composeMatrix", name=f"{prefix}_{index}_bnd_target")
+            cmds.connectAttr(f"{pci}.position", f"{target}.inputTranslate")
+            aim = create_aim_matrix(f"{prefix}_{index}_bnd_aim", center_position, f"{target}.outputMatrix", up)
+            # the rig group stays at the origin, so the world aim matrix is the parent space one
+            cmds.connectAttr(f"{aim}.outputMatrix", f"{center_joint}.offsetParentMatrix")
+            nodes["aim"].append(aim)
+            nodes["targets"].append(target)
+        else:
+            cmds.setAttr(f"{center_joint}.translate", *center_position.tolist())
+            cmds.setAttr(f"{center_joint}.jointOrient", *orient)
+
+            loc = cmds.createNode("locator", name=f"{prefix}_{index}_bnd_locShape")
+            loc = cmds.listRelatives(loc, parent=True)[0]
+            loc = cmds.parent(cmds.rename(loc, f"{prefix}_{index}_bnd_loc"), loc_grp)[0]
+            cmds.setAttr(f"{loc}.translate", *position)
+
+            aim = cmds.aimConstraint(
+                loc,
+                center_joint,
+                mo=1,
+                weight=1,
+                aimVector=(1, 0, 0),
+                upVector=(0, 1, 0),
+                worldUpType="object",
+                worldUpObject=up
+            )[0]
+            cmds.connectAttr(f"{pci}.position", f"{loc}.translate")
+            nodes["locators"].append(loc)
+            nodes["aim"].append(aim)
+
+        nodes["center_joints"].append(center_joint)
+        nodes["joints"].append(jnt)
+        nodes["pci"].append(pci)
+
+    LOGGER.info(f"Built {prefix} eyelid with {len(positions)} joints")
+    return nodes
+
+
+def create_aim_matrix(name, center_position, target_matrix_plug, up):
+    """aimMatrix at the eye center aiming x at the target matrix position and y at the up object.
+
+    Aim mode only reads the translation of primaryTargetMatrix, primaryTargetVector
+    is ignored, so points have to come in through a matrix.
+    """
+    aim = cmds.createNode("aimMatrix", name=name)
+    input_matrix = np.eye(4)
+    input_matrix[3, :3] = center_position
+    cmds.setAttr(f"{aim}.inputMatrix", input_matrix.ravel().tolist(), type="matrix")
+
+    cmds.setAttr(f"{aim}.primaryInputAxis", 1, 0, 0)
+    cmds.setAttr(f"{aim}.primaryMode", 1)
+    cmds.connectAttr(target_matrix_plug, f"{aim}.primaryTargetMatrix")
+    cmds.setAttr(f"{aim}.secondaryInputAxis", 0, 1, 0)
+    cmds.setAttr(f"{aim}.secondaryMode", 1)
+    cmds.connectAttr(f"{up}.worldMatrix[0]", f"{aim}.secondaryTargetMatrix")
+    return aim
+
+
+def order_lid_vertices(positions):
+    """Order lid vertices from corner to corner along their main direction."""
+    centered = positions - positions.mean(axis=0)
+    main_direction = np.linalg.svd(centered, full_matrices=False)[2][0]
+    return np.argsort(centered @ main_direction)
+
+
+def get_joint_orients(center_position, positions):
+    """jointOrient values aiming x from the center at each position with y up, like joint -oj xyz -sao yup."""
+    aims = positions - center_position
+    aims /= np.linalg.norm(aims, axis=1, keepdims=True)
+    sides = np.cross(aims, [0.0, 1.0, 0.0])
+    sides /= np.maximum(np.linalg.norm(sides, axis=1, keepdims=True), 1e-12)
+    ups = np.cross(sides, aims)
+
+    # rows are the x, y and z axes, euler xyz of the row major rotation matrix
+    rotate_y = np.arcsin(np.clip(-aims[:, 2], -1.0, 1.0))
+    rotate_x = np.arctan2(ups[:, 2], sides[:, 2])
+    rotate_z = np.arctan2(aims[:, 1], aims[:, 0])
+    return np.degrees(np.stack([rotate_x, rotate_y, rotate_z], axis=1)).tolist()
+
+
+# next steps of the blink rig, still done by hand:
 # create cubic curve with less cv points (5 for example, 1 in corners, 1 at top, 1 in middle)
 # modify that one to make it fit to higher resolution curve
 # name low
@@ -65,6 +174,7 @@ for s in sel:
 # keep secondary average by selecting middle, corner and group of secondary, parent with 0.5 weights so they follow
 
 ### usage
-# name_prefix = "eye_l"
-# center = pm.PyNode("head_bnd|eye_l_bnd").fullPath()
-# vtx = cmds.ls(sl=1, fl=1)
+# build_eyelids([
+#     {"prefix": "eye_l_upper", "vertices": upper_vertices, "center": "head_bnd|eye_l_bnd", "up": "eye_l_up"},
+#     {"prefix": "eye_l_lower", "vertices": lower_vertices, "center": "head_bnd|eye_l_bnd", "up": "eye_l_up"},
+# ])
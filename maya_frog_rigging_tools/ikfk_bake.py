@@ -0,0 +1,234 @@
+from maya import cmds
+from maya.api import OpenMaya as om2
+from maya.api import OpenMayaAnim as oma2
+import logging
+import re
+import time
+
+from maya_frog_rigging_tools._lazy import lazy_import
+from maya_frog_rigging_tools.matrix_constraint import matrix_values
+
+np = lazy_import("numpy")
+pole = lazy_import("maya_frog_rigging_tools.solvers.pole")
+
+LOGGER = logging.getLogger("IK FK Bake")
+
+ROTATE_ORDERS = ["xyz", "yzx", "zxy", "xzy", "yxz", "zyx"]
+EVEN_ROTATE_ORDERS = ["xyz", "yzx", "zxy"]
+
+
+class LimbControls:
+    """Scene nodes of a LimbSetup rig that take part in ik fk matching."""
+
+    __slots__ = ("fk_controls", "fk_joints", "ik_joints", "ik_control", "pole_control", "host")
+
+    def __init__(self, fk_controls, fk_joints, ik_joints, ik_control, pole_control, host):
+        self.fk_controls = [str(node) for node in fk_controls]
+        self.fk_joints = [str(node) for node in fk_joints]
+        self.ik_joints = [str(node) for node in ik_joints]
+        self.ik_control = str(ik_control)
+        self.pole_control = str(pole_control)
+        self.host = str(host)
+
+    @classmethod
+    def from_limb(cls, limb):
+        fk_records = limb.ctl_data.chain("fk")
+        return cls(
+            [record.node for record in fk_records],
+            [record.joint for record in fk_records],
+            limb.ik_chain[:len(fk_records)],
+            limb.ctl_data.node("ik"),
+            limb.ctl_data.node("pole"),
+            limb.ctl_data.node("host"),
+        )
+
+    @classmethod
+    def from_prefix(cls, prefix):
+        """Find the nodes of a built limb by the LimbSetup naming convention."""
+        from maya_frog_rigging_tools.limb_setup import get_ordered_chains
+
+        fk_controls = sorted(
+            cmds.ls(f"{prefix}_fk_*_ctl", type="transform"),
+            key=lambda name: int(re.search(r"_fk_(\d+)_ctl$", name).group(1))
+        )
+        chain_roots = cmds.listRelatives(prefix, children=True, type="joint", fullPath=True) or []
+        fk_root = next((root for root in chain_roots if root.endswith("_fk")), None)
+        ik_root = next((root for root in chain_roots if root.endswith("_ik")), None)
+        if not fk_controls or fk_root is None or ik_root is None:
+            raise RuntimeError(f"Could not find a limb rig with prefix {prefix}")
+
+        fk_chain, ik_chain = get_ordered_chains([fk_root, ik_root])
+        return cls(
+            fk_controls,
+            fk_chain[:len(fk_controls)],
+            ik_chain[:len(fk_controls)],
+            f"{prefix}_ik_ctl",
+            f"{prefix}_pole_ctl",
+            f"{prefix}_host_ctl",
+        )
+
+    @classmethod
+    def resolve(cls, limb):
+        if isinstance(limb, cls):
+            return limb
+        if isinstance(limb, str):
+            return cls.from_prefix(limb)
+        return cls.from_limb(limb)
+
+
+def bake_ik_to_fk(limb, start=None, end=None, switch=True):
+    """Key the fk controls to follow the ik chain over a frame range.
+
+    Every fk control is one stage: its target world matrices and its parent
+    matrices are sampled in one evaluation pass, the local values are solved in
+    NumPy and written as one batch of keys. Parents are sampled after the
+    previous control was baked, so follow settings are respected. Key writing
+    through MFnAnimCurve is not undoable.
+    """
+    limb = LimbControls.resolve(limb)
+    frames = get_frame_range(start, end)
+    bake_start = time.perf_counter()
+
+    reference = [
+        np.array(matrix_values(get_world_matrix(node))).reshape(4, 4)
+        for node in limb.fk_joints + limb.fk_controls
+    ]
+    joint_references, control_references = reference[:len(limb.fk_joints)], reference[len(limb.fk_joints):]
+
+    ik_worlds = sample_matrices([f"{joint}.worldMatrix[0]" for joint in limb.ik_joints], frames)
+
+    for index, control in enumerate(limb.fk_controls):
+        # the fk joint follows its control with a constant offset, invert it to get the control target
+        joint_offset = joint_references[index] @ np.linalg.inv(control_references[index])
+        target_worlds = np.linalg.inv(joint_offset) @ ik_worlds[index]
+        parent_worlds = sample_matrices([f"{control}.parentMatrix[0]"], frames)[0]
+        write_transform_keys(control, frames, target_worlds @ np.linalg.inv(parent_worlds))
+
+    if switch:
+        write_keys(limb.host, "IkFkSwitch", frames, np.ones(len(frames)))
+
+    LOGGER.info(f"Baked fk controls over {len(frames)} frames in {time.perf_counter() - bake_start:.2f}s")
+
+
+def bake_fk_to_ik(limb, start=None, end=None, switch=True, pole_distance=1, up_vector=(0, 0, 1)):
+    """Key the ik and pole controls to follow the fk chain over a frame range.
+
+    The ik control takes the world matrix of the last fk joint, the pole is
+    placed with the pole solver, frames with a straight fk chain keep the pole
+    plane of the frame before them.
+    Key writing through MFnAnimCurve is not undoable.
+    """
+    limb = LimbControls.resolve(limb)
+    frames = get_frame_range(start, end)
+    bake_start = time.perf_counter()
+
+    fk_worlds = sample_matrices([f"{joint}.worldMatrix[0]" for joint in limb.fk_joints], frames)
+    ik_parent_worlds = sample_matrices([f"{limb.ik_control}.parentMatrix[0]"], frames)[0]
+
+    target_worlds = remove_scale(fk_worlds[-1])
+    write_transform_keys(limb.ik_control, frames, target_worlds @ np.linalg.inv(ik_parent_worlds))
+
+    chain_positions = np.stack([fk_worlds[index][:, 3, :3] for index in range(3)], axis=1)
+    pole_positions = pole.solve_pole_positions(chain_positions, pole_distance, up_vector)
+
+    # the pole space follows the ik control, so its parent is sampled after the ik keys exist
+    pole_parent_worlds = sample_matrices([f"{limb.pole_control}.parentMatrix[0]"], frames)[0]
+    pole_worlds = np.tile(np.eye(4), (len(frames), 1, 1))
+    pole_worlds[:, 3, :3] = pole_positions
+    pole_locals = pole_worlds @ np.linalg.inv(pole_parent_worlds)
+    write_keys(limb.pole_control, "translateX", frames, pole_locals[:, 3, 0])
+    write_keys(limb.pole_control, "translateY", frames, pole_locals[:, 3, 1])
+    write_keys(limb.pole_control, "translateZ", frames, pole_locals[:, 3, 2])
+
+    if switch:
+        write_keys(limb.host, "IkFkSwitch", frames, np.zeros(len(frames)))
+
+    LOGGER.info(f"Baked ik controls over {len(frames)} frames in {time.perf_counter() - bake_start:.2f}s")
+
+
+def get_frame_range(start=None, end=None):
+    if start is None:
+        start = cmds.playbackOptions(query=True, minTime=True)
+    if end is None:
+        end = cmds.playbackOptions(query=True, maxTime=True)
+    return np.arange(int(start), int(end) + 1, dtype=float)
+
+
+def get_plug(plug_name):
+    return om2.MSelectionList().add(plug_name).getPlug(0)
+
+
+def get_world_matrix(node):
+    return om2.MMatrix(cmds.getAttr(f"{node}.worldMatrix[0]"))
+
+
+def sample_matrices(plug_names, frames):
+    """Read matrix plugs for every frame through DG contexts, shape (plugs, frames, 4, 4)."""
+    plugs = [get_plug(plug_name) for plug_name in plug_names]
+    samples = np.empty((len(plugs), len(frames), 16))
+    unit = om2.MTime.uiUnit()
+
+    for frame_index, frame in enumerate(frames):
+        with om2.MDGContextGuard(om2.MDGContext(om2.MTime(float(frame), unit))):
+            for plug_index, plug in enumerate(plugs):
+                samples[plug_index, frame_index] = matrix_values(om2.MFnMatrixData(plug.asMObject()).matrix())
+
+    return samples.reshape(len(plugs), len(frames), 4, 4)
+
+
+def remove_scale(matrices):
+    result = matrices.copy()
+    result[..., :3, :3] /= np.linalg.norm(matrices[..., :3, :3], axis=-1, keepdims=True)
+    return result
+
+
+def matrices_to_euler(matrices, rotate_order="xyz"):
+    """Euler angles in radians of row major (..., 4, 4) matrices for a Maya rotate order."""
+    rotation = remove_scale(matrices)[..., :3, :3]
+    first, second, third = ("xyz".index(axis) for axis in rotate_order)
+    sign = 1.0 if rotate_order in EVEN_ROTATE_ORDERS else -1.0
+
+    # Maya matrices are row major, element [a, b] of the column rotation is [b, a] here
+    angles = np.empty(rotation.shape[:-2] + (3,))
+    angles[..., second] = np.arcsin(np.clip(-sign * rotation[..., first, third], -1.0, 1.0))
+    angles[..., first] = np.arctan2(sign * rotation[..., second, third], rotation[..., third, third])
+    angles[..., third] = np.arctan2(sign * rotation[..., first, second], rotation[..., first, first])
+    return angles
+
+
+def write_transform_keys(node, frames, local_matrices):
+    rotate_order = ROTATE_ORDERS[cmds.getAttr(f"{node}.rotateOrder")]
+    rotations = np.unwrap(matrices_to_euler(local_matrices, rotate_order), axis=0)
+
+    for axis_index, axis in enumerate("XYZ"):
+        if cmds.getAttr(f"{node}.translate{axis}", settable=True):
+            write_keys(node, f"translate{axis}", frames, local_matrices[:, 3, axis_index])
+        if cmds.getAttr(f"{node}.rotate{axis}", settable=True):
+            write_keys(node, f"rotate{axis}", frames, rotations[:, axis_index])
+
+
+def write_keys(node, attr, frames, values):
+    """Replace the keys of an attribute in the frame range with one MFnAnimCurve call.
+
+    Values are in internal units, radians for angles.
+    """
+    cmds.cutKey(node, attribute=attr, time=(frames[0], frames[-1]), clear=True)
+    plug = get_plug(f"{node}.{attr}")
+    curve_fn = oma2.MFnAnimCurve()
+    curves = oma2.MAnimUtil.findAnimation(plug)
+
+    if len(curves):
+        curve_fn.setObject(curves[0])
+    else:
+        curve_fn.create(plug)
+
+    unit = om2.MTime.uiUnit()
+    times = om2.MTimeArray([om2.MTime(float(frame), unit) for frame in frames])
+    curve_fn.addKeys(
+        times,
+        om2.MDoubleArray([float(value) for value in values]),
+        oma2.MFnAnimCurve.kTangentAuto,
+        oma2.MFnAnimCurve.kTangentAuto,
+        True
+    )
+
@@ -0,0 +1,131 @@
+import json
+import logging
+import os
+import time
+
+from maya_frog_rigging_tools import control
+from maya_frog_rigging_tools import utils
+from maya_frog_rigging_tools._lazy import lazy_import
+from maya_frog_rigging_tools.limb_setup import LimbSetup
+
+pm = lazy_import("pymel.core")
+
+LOGGER = logging.getLogger("Limb Builder")
+
+LIMB_ARGUMENTS = {
+    "root": "root_bnd",
+    "prefix": "prefix_name",
+    "primary_axis": "primary_axis",
+    "secondary_axis": "secondary_axis",
+    "up_axis": "up_axis",
+    "ctl_scale": "ctl_scale",
+    "bnd_pattern": "bnd_pattern",
+    "constraint_mode": "constraint_mode",
+    "stretch_solver": "stretch_solver",
+}
+
+
+def load_build_spec(spec):
+    """Read a build spec from a json file path or validate already loaded data.
+
+    A spec is either a list of limbs or a dict like::
+
+        {
+            "name": "frog",
+            "ribbon": true,
+            "cleanup": true,
+            "defaults": {"ctl_scale": 2},
+            "limbs": [
+                {"root": "leg_l_0_bnd", "prefix": "leg_l"},
+                {"root": "leg_r_0_bnd", "prefix": "leg_r", "ribbon": false}
+            ]
+        }
+    """
+    if isinstance(spec, (str, os.PathLike)):
+        with open(spec, "r") as f:
+            spec = json.load(f)
+
+    if isinstance(spec, list):
+        spec = {"limbs": spec}
+
+    spec = dict(spec)
+    spec.setdefault("name", "character")
+    spec.setdefault("ribbon", True)
+    spec.setdefault("cleanup", True)
+    spec.setdefault("defaults", {})
+
+    limbs = []
+    for index, limb in enumerate(spec.get("limbs") or []):
+        limb = {**spec["defaults"], **limb}
+        if "root" not in limb:
+            raise ValueError(f"Limb {index} of build spec {spec['name']} has no root joint")
+        unknown = set(limb) - set(LIMB_ARGUMENTS) - {"ribbon"}
+        if unknown:
+            raise ValueError(f"Unknown limb settings {sorted(unknown)} in build spec {spec['name']}")
+        limb.setdefault("prefix", f"limb_{index}")
+        limbs.append(limb)
+
+    if not limbs:
+        raise ValueError(f"Build spec {spec['name']} contains no limbs")
+
+    spec["limbs"] = limbs
+    return spec
+
+
+def build_limbs(spec):
+    """Build every limb of a build spec in one undo chunk with shared control shapes.
+
+    Returns the LimbSetup instances and a per limb timing report.
+    """
+    spec = load_build_spec(spec)
+    name = spec["name"]
+    limb_setups = []
+    report = []
+
+    LOGGER.info(f"Building {len(spec['limbs'])} limbs for {name}")
+    build_start = time.perf_counter()
+
+    with utils.batch_build(f"{name}_limbs"), control.shape_cache():
+        guides_grp = pm.group(em=True, name=f"{name}_guides")
+
+        for limb in spec["limbs"]:
+            limb_start = time.perf_counter()
+            limb_setup = LimbSetup(
+                guides_parent=guides_grp,
+                **{LIMB_ARGUMENTS[key]: value for key, value in limb.items() if key in LIMB_ARGUMENTS}
+            )
+            timing = {"prefix": limb_setup.prefix}
+
+            limb_setup.build_structure()
+            timing["structure"] = time.perf_counter() - limb_start
+
+            stage_start = time.perf_counter()
+            limb_setup.build_ctl_rig()
+            timing["controls"] = time.perf_counter() - stage_start
+
+            if limb.get("ribbon", spec["ribbon"]):
+                stage_start = time.perf_counter()
+                limb_setup.build_ribbon_rig()
+                timing["ribbon"] = time.perf_counter() - stage_start
+
+            timing["total"] = time.perf_counter() - limb_start
+            limb_setups.append(limb_setup)
+            report.append(timing)
+            LOGGER.info(f"Built {limb_setup.prefix} in {timing['total']:.2f}s")
+
+        if spec["cleanup"]:
+            pm.delete(guides_grp)
+
+    LOGGER.info(f"Built {name} limbs in {time.perf_counter() - build_start:.2f}s")
+    log_report(report)
+    return limb_setups, report
+
+
+def log_report(report):
+    stages = ["structure", "controls", "ribbon", "total"]
+    LOGGER.info(" | ".join(["limb".ljust(20)] + [stage.rjust(9) for stage in stages]))
+    for timing in report:
+        row = [timing["prefix"].ljust(20)]
+        for stage in stages:
+            row.append(f"{timing[stage]:8.2f}s" if stage in timing else "-".rjust(9))
+        LOGGER.info(" | ".join(row))
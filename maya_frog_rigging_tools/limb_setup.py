@@ -1,16 +1,84 @@
-from pymel import core as pm
+from maya import cmds
 import logging
 import re
 
-from pymel.core.nodetypes import DependNode
-
 from maya_frog_rigging_tools import control
-from maya_frog_rigging_tools.skin import ribbon
+from maya_frog_rigging_tools import plugins
+from maya_frog_rigging_tools._lazy import lazy_import
+from maya_frog_rigging_tools.matrix_constraint import matrix_constraint, validate_mode
+from maya_frog_rigging_tools.profiling import profile_stage
 from maya_frog_rigging_tools.utils import match_transforms
 
+pm = lazy_import("pymel.core")
+ribbon = lazy_import("maya_frog_rigging_tools.skin.ribbon")
+pole = lazy_import("maya_frog_rigging_tools.solvers.pole")
+
 LOGGER = logging.getLogger("Rigging Utils")
 
 
+class ControlRecord:
+    """Handles of one rig control and the joint it drives."""
+
+    __slots__ = ("name", "node", "subcomponent", "index", "joint", "srt", "null")
+
+    def __init__(self, name, node, subcomponent, index=0, joint=None, srt=None, null=None):
+        self.name = name
+        self.node = node
+        self.subcomponent = subcomponent
+        self.index = index
+        self.joint = joint
+        self.srt = srt
+        self.null = null
+
+    def __repr__(self):
+        return f"ControlRecord({self.name!r}, subcomponent={self.subcomponent!r}, index={self.index})"
+
+
+class ControlRegistry:
+    """Controls of a rig indexed by name, subcomponent and chain position."""
+
+    __slots__ = ("_by_name", "_by_subcomponent")
+
+    def __init__(self):
+        self._by_name = {}
+        self._by_subcomponent = {}
+
+    def add(self, record):
+        if record.name in self._by_name:
+            raise KeyError(f"Control {record.name} is already registered")
+        if record.index in self._by_subcomponent.get(record.subcomponent, {}):
+            raise KeyError(f"Chain position {record.index} of {record.subcomponent} is already registered")
+        self._by_name[record.name] = record
+        self._by_subcomponent.setdefault(record.subcomponent, {})[record.index] = record
+        return record
+
+    def get(self, subcomponent, index=0):
+        return self._by_subcomponent[subcomponent][index]
+
+    def node(self, subcomponent, index=0):
+        return self._by_subcomponent[subcomponent][index].node
+
+    def chain(self, subcomponent):
+        """Records of a subcomponent ordered by chain position."""
+        records = self._by_subcomponent.get(subcomponent, {})
+        return [records[index] for index in sorted(records)]
+
+    def subcomponents(self):
+        return list(self._by_subcomponent)
+
+    def __getitem__(self, name):
+        return self._by_name[name]
+
+    def __contains__(self, name):
+        return name in self._by_name
+
+    def __iter__(self):
+        return iter(self._by_name.values())
+
+    def __len__(self):
+        return len(self._by_name)
+
+
 class LimbSetup:
     def __init__(
             self,
@@ -20,7 +88,10 @@ class LimbSetup:
             secondary_axis="y",
             up_axis="z",
             ctl_scale=1,
-            bnd_pattern="_bnd"
+            bnd_pattern="_bnd",
+            guides_parent=None,
+            constraint_mode="constraint",
+            stretch_solver="network"
     ):
         self.log = logging.getLogger("Limb Setup")
         self.log.info("Initializing LimbSetup")
@@ -31,12 +102,20 @@ class LimbSetup:
         self.root = root_bnd
         self.prefix = prefix_name
         self.bnd_pattern = bnd_pattern
-
+        self.guides_parent = guides_parent
+        self.constraint_mode = validate_mode(constraint_mode)
+        if stretch_solver not in ("network", "node"):
+            raise ValueError(f"Unknown stretch solver {stretch_solver}, expected 'network' or 'node'")
+        self.stretch_solver = stretch_solver
+        self.stretch_outputs = None
+
+    @profile_stage()
     def build_structure(self):
         self.log.info("Building Joint Structure")
         self._create_joint_structure()
         self._create_ctl_guides()
 
+    @profile_stage()
     def build_ctl_rig(self):
         self.log.info("Building Control Structure")
         self._create_ctl_from_guides()
@@ -45,9 +124,11 @@ class LimbSetup:
         self._create_ik_handle()
         self._setup_stretch()
 
+    @profile_stage()
     def build_ribbon_rig(self):
         self._setup_ribbon()
 
+    @profile_stage()
     def _create_joint_structure(self):
         self.log.info("Duplicating Joint Chain")
         self.root_chain = (get_child_joints_in_order(self.root))
@@ -55,34 +136,30 @@ class LimbSetup:
             raise RuntimeError(
                 "Can't Setup Limb, please input chain with at least 2 elements!"
             )
-        self.fk_chain = get_child_joints_in_order(
-            duplicate_and_rename_hierarchy(
-                self.root, self.bnd_pattern, "_fk"
-            )[0]
-        )
-        self.ik_chain = get_child_joints_in_order(
-            duplicate_and_rename_hierarchy(
-                self.root, self.bnd_pattern, "_ik"
-            )[0]
-        )
-        self.stretch_chain = get_child_joints_in_order(
-            duplicate_and_rename_hierarchy(
-                self.root, self.bnd_pattern, "_stretch"
-            )[0]
+        chain_variants = clone_joint_chain(
+            self.root_chain, ["_fk", "_ik", "_stretch"], self.bnd_pattern
         )
+        self.fk_chain = chain_variants["_fk"]
+        self.ik_chain = chain_variants["_ik"]
+        self.stretch_chain = chain_variants["_stretch"]
         self.jnt_grp = pm.group(self.fk_chain[0], self.ik_chain[0], self.stretch_chain[0], name=f"{self.prefix}")
 
+    @profile_stage()
     def _create_ctl_guides(self):
         self.log.info("Creating Controls")
         self.guides_grp = pm.group(em=True, name=f"{self.prefix}_guides")
+        if self.guides_parent:
+            pm.parent(self.guides_grp, self.guides_parent)
         self.guide_mapping = {
-            "host_guide": {"ctl_shape": "gear", "transforms": [90, 0, 0]},
-            "fk_1_guide": {"joint": self.fk_chain[0], "ctl_shape": "circle"},
-            "fk_2_guide": {"joint": self.fk_chain[1], "ctl_shape": "circle"},
-            "fk_3_guide": {"joint": self.fk_chain[2], "ctl_shape": "circle"},
-            "pole_guide": {"world_pos_func": calculate_pole_vector_position, "ctl_shape": "sphere"},
-            "root_guide": {"joint": self.root, "ctl_shape": "needle"},
-            "ik_guide": {"joint": self.ik_chain[2], "ctl_shape": "box"}
+            "host_guide": {"subcomponent": "host", "ctl_shape": "gear", "transforms": [90, 0, 0]},
+            "fk_1_guide": {"subcomponent": "fk", "index": 0, "joint": self.fk_chain[0], "ctl_shape": "circle"},
+            "fk_2_guide": {"subcomponent": "fk", "index": 1, "joint": self.fk_chain[1], "ctl_shape": "circle"},
+            "fk_3_guide": {"subcomponent": "fk", "index": 2, "joint": self.fk_chain[2], "ctl_shape": "circle"},
+            "pole_guide": {
+                "subcomponent": "pole", "world_pos_func": calculate_pole_vector_position, "ctl_shape": "sphere"
+            },
+            "root_guide": {"subcomponent": "root", "joint": self.root, "ctl_shape": "needle"},
+            "ik_guide": {"subcomponent": "ik", "joint": self.ik_chain[2], "ctl_shape": "box"}
         }
         for guide_name, guide_info in self.guide_mapping.items():
             joint = guide_info.get("joint")
@@ -105,9 +182,10 @@ class LimbSetup:
 
             self.log.info(f"Created {guide}")
 
+    @profile_stage()
     def _create_ctl_from_guides(self):
         self.log.info("Creating Controls from Guides")
-        self.ctl_data = {}
+        self.ctl_data = ControlRegistry()
         controls_grp = pm.group(em=True, name=f"{self.prefix}_ctl")
         for guide, guide_info in self.guide_mapping.items():
             guide_node = pm.PyNode(f"{self.prefix}_{guide}")
@@ -121,45 +199,54 @@ class LimbSetup:
             null_grp = pm.group(srt_grp,  name=f"{ctl_name}_null")
             controls_grp.addChild(null_grp)
             pm.matchTransform(null_grp, guide_node)
-            self.ctl_data[ctl_name] = {
-                "node": ctl,
-                "joint": guide_info.get("joint"),
-                "subcomponent": clean_name.split("_")[0],
-                "srt": srt_grp,
-                "null": null_grp
-            }
+            self.ctl_data.add(
+                ControlRecord(
+                    ctl_name,
+                    ctl,
+                    guide_info["subcomponent"],
+                    index=guide_info.get("index", 0),
+                    joint=guide_info.get("joint"),
+                    srt=srt_grp,
+                    null=null_grp
+                )
+            )
 
+    @profile_stage()
     def _build_fk_chain(self):
         self.log.info("Building FK Chain")
-        fk_subcomponents = {key: value for key, value in self.ctl_data.items() if value['subcomponent'] == 'fk'}
-        root_components = {key: value for key, value in self.ctl_data.items() if value['subcomponent'] == 'root'}
-        ordered_chain = dict(sorted(fk_subcomponents.items(), key=lambda x: int(x[0].split('_')[-2])))
-        previous_chain_element_key, previous_chain_element_value = next(iter(root_components.items()))
+        previous_chain_element = self.ctl_data.get("root")
 
-        for next_chain_element_key, next_chain_element_value in ordered_chain.items():
-            next_ctl = next_chain_element_value.get("node")
-            next_jnt = next_chain_element_value.get("joint")
+        for next_chain_element in self.ctl_data.chain("fk"):
+            next_ctl = next_chain_element.node
+            next_jnt = next_chain_element.joint
 
-            prev_ctl = previous_chain_element_value.get("node")
-            next_srt = next_chain_element_value.get("srt")
+            prev_ctl = previous_chain_element.node
+            next_srt = next_chain_element.srt
 
             self.log.info(f"Constraining {next_srt} to {prev_ctl}")
-            translate_constraint = pm.parentConstraint(
-                prev_ctl,
-                next_srt,
-                mo=True,
-                skipRotate=['x', 'y', 'z'],
-                weight=1,
-                name=f"{prev_ctl}_{next_srt}_trl_constr"
-            )
-            rotate_constraint = pm.parentConstraint(
-                prev_ctl,
-                next_srt,
-                mo=True,
-                skipTranslate=['x', 'y', 'z'],
-                weight=1,
-                name=f"{prev_ctl}_{next_srt}_rot_constr"
-            )
+            if self.constraint_mode == "matrix":
+                follow_blend = matrix_constraint(prev_ctl, next_srt, name=f"{prev_ctl}_{next_srt}_follow")
+                translate_weight = f"{follow_blend}.target[0].translateWeight"
+                rotate_weight = f"{follow_blend}.target[0].rotateWeight"
+            else:
+                translate_constraint = pm.parentConstraint(
+                    prev_ctl,
+                    next_srt,
+                    mo=True,
+                    skipRotate=['x', 'y', 'z'],
+                    weight=1,
+                    name=f"{prev_ctl}_{next_srt}_trl_constr"
+                )
+                rotate_constraint = pm.parentConstraint(
+                    prev_ctl,
+                    next_srt,
+                    mo=True,
+                    skipTranslate=['x', 'y', 'z'],
+                    weight=1,
+                    name=f"{prev_ctl}_{next_srt}_rot_constr"
+                )
+                translate_weight = translate_constraint.attr('w0')
+                rotate_weight = rotate_constraint.attr('w0')
 
             self.log.debug(f"Add Space switching attributes on {next_ctl}")
             pm.addAttr(
@@ -183,33 +270,42 @@ class LimbSetup:
 
             pm.connectAttr(
                 f"{next_ctl}.FollowTranslation",
-                translate_constraint.attr('w0'),
+                translate_weight,
                 force=True
             )
             pm.connectAttr(
                 f"{next_ctl}.FollowRotation",
-                rotate_constraint.attr('w0'),
+                rotate_weight,
                 force=True
             )
 
             self.log.info(f"Constraining {next_jnt} to {next_ctl}")
-            pm.parentConstraint(
-                next_ctl,
-                next_jnt,
-                mo=True,
-                weight=1,
-                name=f"{next_ctl}_{next_jnt}_jnt_constr"
-            )
+            if self.constraint_mode == "matrix":
+                matrix_constraint(next_ctl, next_jnt, name=f"{next_ctl}_{next_jnt}_jnt_mtx")
+            else:
+                pm.parentConstraint(
+                    next_ctl,
+                    next_jnt,
+                    mo=True,
+                    weight=1,
+                    name=f"{next_ctl}_{next_jnt}_jnt_constr"
+                )
 
-            previous_chain_element_value = next_chain_element_value
+            previous_chain_element = next_chain_element
 
+    @profile_stage()
     def _constrain_fk_ik(self):
         self.log.info("Constraining IK FK Structure")
 
-        host_component = next((value for value in self.ctl_data.values() if value['subcomponent'] == 'host'), None)
-        host_node = host_component.get("node")
+        host_component = self.ctl_data.get("host")
+        host_node = host_component.node
 
-        pm.pointConstraint(self.root_chain[1], host_component.get("srt"), mo=True)
+        if self.constraint_mode == "matrix":
+            matrix_constraint(
+                self.root_chain[1], host_component.srt, name=f"{host_component.srt}_mtx", rotate=False
+            )
+        else:
+            pm.pointConstraint(self.root_chain[1], host_component.srt, mo=True)
 
         pm.addAttr(
             host_node,
@@ -228,6 +324,21 @@ class LimbSetup:
         )
 
         for index, constrained in enumerate(self.root_chain):
+            if self.constraint_mode == "matrix":
+                # fk is blended in fully first, ik is layered on top by the reversed switch
+                joint_blend = matrix_constraint(
+                    [self.fk_chain[index], self.ik_chain[index]],
+                    constrained,
+                    name=f"{self.fk_chain[index]}{self.ik_chain[index]}{constrained}_mtx"
+                )
+                self.log.debug(f"Add IK FK Switch Attribute for {joint_blend}")
+                pm.connectAttr(
+                    fk_ik_reverse.attr('outputX'),
+                    f"{joint_blend}.target[1].weight",
+                    force=True
+                )
+                continue
+
             joint_constraint = pm.parentConstraint(
                 self.fk_chain[index],
                 self.ik_chain[index],
@@ -249,54 +360,180 @@ class LimbSetup:
             )
 
         self.log.info("Setting up IK FK visibility")
-        for ctl, control_data in self.ctl_data.items():
-            if control_data.get("subcomponent") == "fk":
-                pm.connectAttr(
-                    host_node.attr("IkFkSwitch"),
-                    control_data.get("node").attr('visibility'),
-                    force=True
-                )
-            elif control_data.get("subcomponent") in ["ik", "pole"]:
-                pm.connectAttr(
-                    fk_ik_reverse.attr('outputX'),
-                    control_data.get("node").attr('visibility'),
-                    force=True
-                )
+        for control_data in self.ctl_data.chain("fk"):
+            pm.connectAttr(
+                host_node.attr("IkFkSwitch"),
+                control_data.node.attr('visibility'),
+                force=True
+            )
+        for control_data in self.ctl_data.chain("ik") + self.ctl_data.chain("pole"):
+            pm.connectAttr(
+                fk_ik_reverse.attr('outputX'),
+                control_data.node.attr('visibility'),
+                force=True
+            )
 
+    @profile_stage()
     def _create_ik_handle(self):
         self.log.info("Creating IK Handle")
-        root_component = next((value for value in self.ctl_data.values() if value['subcomponent'] == 'root'), None)
-        pole_component = next((value for value in self.ctl_data.values() if value['subcomponent'] == 'pole'), None)
-        ik_component = next((value for value in self.ctl_data.values() if value['subcomponent'] == 'ik'), None)
+        root_component = self.ctl_data.get("root")
+        pole_component = self.ctl_data.get("pole")
+        ik_component = self.ctl_data.get("ik")
         ik_handle = pm.ikHandle(
-            name=f"{root_component['joint']}_to_{ik_component['joint']}_hndl",
+            name=f"{root_component.joint}_to_{ik_component.joint}_hndl",
             sj=self.ik_chain[0],
-            ee=ik_component['joint'],
+            ee=ik_component.joint,
             sol='ikRPsolver'
         )[0]
 
         pm.setAttr(f"{ik_handle}.visibility", 0)
 
-        pm.parentConstraint(ik_component['node'], ik_handle)
-        pm.poleVectorConstraint(pole_component['node'], ik_handle)
+        pm.parentConstraint(ik_component.node, ik_handle)
+        pm.poleVectorConstraint(pole_component.node, ik_handle)
 
-        root_ctl = root_component.get("node")
+        root_ctl = root_component.node
         pm.pointConstraint(root_ctl, self.jnt_grp, mo=True)
 
+    @profile_stage()
     def _setup_stretch(self):
         self.log.info("Making Limb Stretchy")
-        ik_component = next((value for value in self.ctl_data.values() if value['subcomponent'] == 'ik'), None)
-        host_component = next((value for value in self.ctl_data.values() if value['subcomponent'] == 'host'), None)
-        pole_component = next((value for value in self.ctl_data.values() if value['subcomponent'] == 'pole'), None)
-        root_component = next((value for value in self.ctl_data.values() if value['subcomponent'] == 'root'), None)
+        ik_component = self.ctl_data.get("ik")
+        host_component = self.ctl_data.get("host")
+        pole_component = self.ctl_data.get("pole")
+        root_component = self.ctl_data.get("root")
 
-        chain_start = self.stretch_chain[0]
         ik_start = self.ik_chain[0]
-        chain_middle = self.stretch_chain[1]
         ik_middle = self.ik_chain[1]
-        chain_end = self.stretch_chain[2]
 
-        pole_ctl = pole_component.get("node")
+        end_loc = f"{self.prefix}_end"
+
+        pm.createNode("locator", name=f"{end_loc}Shape")
+        pm.matchTransform(end_loc, ik_component.node)
+        pm.parent(end_loc, ik_component.node)
+
+        start_loc = f"{self.prefix}_start"
+        pm.createNode("locator", name=f"{start_loc}Shape")
+        pm.matchTransform(start_loc, root_component.node)
+        pm.parent(start_loc, root_component.node)
+
+        host_node = host_component.node
+
+        pm.addAttr(
+            host_node,
+            longName="maxStretch",
+            attributeType='float',
+            minValue=1,
+            maxValue=10,
+            defaultValue=1.5,
+            keyable=True
+        )
+        pm.addAttr(
+            host_node,
+            longName="maxSquash",
+            attributeType='float',
+            minValue=0,
+            maxValue=1,
+            defaultValue=0,
+            keyable=True
+        )
+
+        pm.addAttr(
+            host_node,
+            longName="poleLock",
+            attributeType='float',
+            minValue=0,
+            maxValue=1,
+            defaultValue=0,
+            keyable=True
+        )
+
+        pm.addAttr(
+            host_node,
+            longName="poleSpace",
+            attributeType='float',
+            minValue=0,
+            maxValue=1,
+            defaultValue=0.5,
+            keyable=True
+        )
+
+        if self.stretch_solver == "node":
+            stretch_outputs = self._build_stretch_solver(start_loc, end_loc)
+        else:
+            stretch_outputs = self._build_stretch_network(start_loc, end_loc)
+        # upper scale, lower scale, pole start and pole end weight plugs of either solver
+        self.stretch_outputs = stretch_outputs
+        upper_scale, lower_scale, pole_start_weight, pole_end_weight = stretch_outputs
+
+        pm.connectAttr(
+            upper_scale,
+            f"{ik_start}.scale.scale{self.primary_axis.upper()}",
+            force=True
+        )
+        pm.connectAttr(
+            lower_scale,
+            f"{ik_middle}.scale.scale{self.primary_axis.upper()}",
+            force=True
+        )
+
+        pole_space = pm.parentConstraint(
+            start_loc,
+            end_loc,
+            pole_component.srt,
+            mo=True,
+            weight=1,
+            name=f"{self.prefix}_pole_space_constr"
+        )
+
+        pm.connectAttr(
+            pole_start_weight,
+            pole_space.attr('w0'),
+            force=True
+        )
+
+        pm.connectAttr(
+            pole_end_weight,
+            pole_space.attr('w1'),
+            force=True
+        )
+
+        pm.setAttr(f"{end_loc}.visibility", 0)
+        pm.setAttr(f"{start_loc}.visibility", 0)
+
+    def _build_stretch_solver(self, start_loc, end_loc):
+        self.log.info("Using stretch solver node")
+        plugins.load("frog_stretch_solver")
+        host_node = self.ctl_data.node("host")
+        solver = pm.createNode("frogStretchSolver", name=f"{self.prefix}_stretch_solver")
+
+        matrix_inputs = {
+            "startMatrix": f"{self.stretch_chain[0]}.worldMatrix[0]",
+            "middleMatrix": f"{self.stretch_chain[1]}.worldMatrix[0]",
+            "endMatrix": f"{self.stretch_chain[2]}.worldMatrix[0]",
+            "rootMatrix": f"{start_loc}.worldMatrix[0]",
+            "handleMatrix": f"{end_loc}.worldMatrix[0]",
+            "poleMatrix": f"{self.ctl_data.node('pole')}.worldMatrix[0]",
+        }
+        for solver_attr, source in matrix_inputs.items():
+            pm.connectAttr(source, f"{solver}.{solver_attr}", force=True)
+
+        for host_attr in ["maxStretch", "maxSquash", "poleLock", "poleSpace"]:
+            pm.connectAttr(f"{host_node}.{host_attr}", f"{solver}.{host_attr}", force=True)
+
+        return (
+            f"{solver}.upperScale",
+            f"{solver}.lowerScale",
+            f"{solver}.poleStartWeight",
+            f"{solver}.poleEndWeight",
+        )
+
+    def _build_stretch_network(self, start_loc, end_loc):
+        host_node = self.ctl_data.node("host")
+        pole_ctl = self.ctl_data.node("pole")
+
+        chain_start = self.stretch_chain[0]
+        chain_middle = self.stretch_chain[1]
+        chain_end = self.stretch_chain[2]
 
         upper_dist = pm.createNode(
             "distanceBetween",
@@ -343,12 +580,6 @@ class LimbSetup:
             f"{base_length}.input2"
         )
 
-        end_loc = f"{self.prefix}_end"
-
-        pm.createNode("locator", name=f"{end_loc}Shape")
-        pm.matchTransform(end_loc, ik_component.get("node"))
-
-        pm.parent(end_loc, ik_component.get("node"))
         stretch_length = pm.createNode("distanceBetween", name=f"{chain_start}_{end_loc}_dist")
 
         pm.connectAttr(
@@ -362,11 +593,6 @@ class LimbSetup:
             force=True
         )
 
-        start_loc = f"{self.prefix}_start"
-        pm.createNode("locator", name=f"{start_loc}Shape")
-        pm.matchTransform(start_loc, root_component.get("node"))
-        pm.parent(start_loc, root_component.get("node"))
-
         root_pole_length = pm.createNode("distanceBetween", name=f"{start_loc}_{pole_ctl}_dist")
         end_pole_length = pm.createNode("distanceBetween", name=f"{end_loc}_{pole_ctl}_dist")
 
@@ -448,47 +674,6 @@ class LimbSetup:
             force=True
         )
 
-        host_node = host_component.get("node")
-
-        pm.addAttr(
-            host_node,
-            longName="maxStretch",
-            attributeType='float',
-            minValue=1,
-            maxValue=10,
-            defaultValue=1.5,
-            keyable=True
-        )
-        pm.addAttr(
-            host_node,
-            longName="maxSquash",
-            attributeType='float',
-            minValue=0,
-            maxValue=1,
-            defaultValue=0,
-            keyable=True
-        )
-
-        pm.addAttr(
-            host_node,
-            longName="poleLock",
-            attributeType='float',
-            minValue=0,
-            maxValue=1,
-            defaultValue=0,
-            keyable=True
-        )
-
-        pm.addAttr(
-            host_node,
-            longName="poleSpace",
-            attributeType='float',
-            minValue=0,
-            maxValue=1,
-            defaultValue=0.5,
-            keyable=True
-        )
-
         squash_reverse = pm.createNode("reverse", name=f"{self.prefix}_squash_reverse")
         pm.connectAttr(
             f"{host_node}.maxSquash",
@@ -570,17 +755,6 @@ class LimbSetup:
             force=True
         )
 
-        pm.connectAttr(
-            f"{upper_lock_blend}.output.outputR",
-            f"{ik_start}.scale.scale{self.primary_axis.upper()}",
-            force=True
-        )
-        pm.connectAttr(
-            f"{lower_lock_blend}.output.outputR",
-            f"{ik_middle}.scale.scale{self.primary_axis.upper()}",
-            force=True
-        )
-
         pm.connectAttr(
             f"{host_node}.poleLock",
             f"{upper_lock_blend}.blender",
@@ -633,34 +807,17 @@ class LimbSetup:
             force=True
         )
 
-        pole_space = pm.parentConstraint(
-            start_loc,
-            end_loc,
-            pole_component.get("srt"),
-            mo=True,
-            weight=1,
-            name=f"{self.prefix}_pole_space_constr"
-        )
-
-        pm.connectAttr(
+        return (
+            f"{upper_lock_blend}.output.outputR",
+            f"{lower_lock_blend}.output.outputR",
             f"{pole_parent_weight}.output.outputX",
-            pole_space.attr('w0'),
-            force=True
-        )
-
-        pm.connectAttr(
             f"{pole_parent_weight}.output.outputY",
-            pole_space.attr('w1'),
-            force=True
         )
 
-        pm.setAttr(f"{end_loc}.visibility", 0)
-        pm.setAttr(f"{start_loc}.visibility", 0)
-
+    @profile_stage()
     def _setup_ribbon(self):
         self.log.info("Setting up Ribbon")
-        host_component = next((value for value in self.ctl_data.values() if value['subcomponent'] == 'host'), None)
-        host_node = host_component.get("node")
+        host_node = self.ctl_data.node("host")
         bezier_ribbon = ribbon.create_bezier_ribbon(
             self.root_chain,
             host_node,
@@ -706,12 +863,10 @@ class LimbSetup:
 
 def duplicate_and_rename_hierarchy(root_joint, old_name_pattern, new_name_pattern):
     LOGGER.info(f"Duplicating {root_joint} and its hierarchy.")
-    dupl_list: list[DependNode] = [pm.duplicate(root_joint, renameChildren=True)[0]]
+    dupl_root = pm.duplicate(root_joint, renameChildren=True)[0]
+    dupl_list: list[pm.nodetypes.DependNode] = get_ordered_chains([dupl_root], node_type=None)[0]
     renamed_list = []
 
-    for node in dupl_list[0].listRelatives(allDescendents=True):
-        dupl_list.append(node)
-
     for node in dupl_list:
         old_name = node.name()
         new_name = re.sub(old_name_pattern, new_name_pattern, old_name)
@@ -723,6 +878,64 @@ def duplicate_and_rename_hierarchy(root_joint, old_name_pattern, new_name_patter
     return renamed_list
 
 
+CLONED_JOINT_ATTRIBUTES = (
+    "translate",
+    "rotate",
+    "scale",
+    "jointOrient",
+    "rotateAxis",
+    "preferredAngle",
+    "rotateOrder",
+    "segmentScaleCompensate",
+    "radius",
+)
+
+
+def clone_joint_chain(joint_chain, name_patterns, old_name_pattern="_bnd"):
+    """Create named copies of an ordered joint chain.
+
+    The local transforms of the source chain are read once and written to fresh
+    joints for every name pattern, so nothing has to be duplicated, renamed or
+    traversed afterwards. Returns the ordered copies per name pattern.
+    """
+    LOGGER.info(f"Cloning {joint_chain[0]} chain to {', '.join(name_patterns)}")
+    source_paths = [pm.PyNode(joint).longName() for joint in joint_chain]
+    source_values = [
+        {attr: cmds.getAttr(f"{path}.{attr}") for attr in CLONED_JOINT_ATTRIBUTES}
+        for path in source_paths
+    ]
+    clones = {}
+
+    for name_pattern in name_patterns:
+        clone_paths = {}
+
+        for path, values in zip(source_paths, source_values):
+            parent_path, _, short_name = path.rpartition("|")
+            parent_is_clone = parent_path in clone_paths
+            clone_parent = clone_paths.get(parent_path, parent_path)
+            new_name = re.sub(old_name_pattern, name_pattern, short_name.split(":")[-1])
+
+            if clone_parent:
+                clone = cmds.createNode("joint", name=new_name, parent=clone_parent)
+            else:
+                clone = cmds.createNode("joint", name=new_name)
+            clone_path = f"{clone_parent}|{clone}"
+            clone_paths[path] = clone_path
+
+            for attr, value in values.items():
+                if isinstance(value, list):
+                    cmds.setAttr(f"{clone_path}.{attr}", *value[0])
+                else:
+                    cmds.setAttr(f"{clone_path}.{attr}", value)
+
+            if parent_is_clone:
+                cmds.connectAttr(f"{clone_parent}.scale", f"{clone_path}.inverseScale")
+
+        clones[name_pattern] = [pm.PyNode(clone_paths[path]) for path in source_paths]
+
+    return clones
+
+
 def distance_between(first_object, second_object):
     LOGGER.info(f"Measuring Distance between {first_object} and {second_object}")
     first_object_translation = pm.xform(first_object, q=True, translation=True, ws=True)
@@ -745,38 +958,53 @@ def create_nurbs_plane(width, num_u_patches, num_v_patches, name="nurbs"):
 
 def get_child_joints_in_order(root_joint):
     LOGGER.info(f"Ordering Joint Chain of {root_joint}")
-    child_joints = [root_joint]
+    return get_ordered_chains([root_joint])[0]
+
+
+def build_hierarchy_index(roots, node_type="joint"):
+    """Map every parent path below roots to its ordered child paths.
 
-    def traverse_hierarchy(joint):
-        children = joint.getChildren(ad=True, type='joint')
-        for child in children:
-            if child.getParent() == joint:
-                child_joints.append(child)
-                traverse_hierarchy(child)
+    All descendants are listed in a single query, the parent of each node is
+    taken from its full path, so no per node parent lookup is needed.
+    """
+    kwargs = {"allDescendents": True, "fullPath": True}
+    if node_type:
+        kwargs["type"] = node_type
 
-    traverse_hierarchy(root_joint)
+    descendants = cmds.listRelatives([pm.PyNode(root).longName() for root in roots], **kwargs) or []
+    hierarchy_index = {}
 
-    return child_joints
+    # allDescendents lists deepest nodes first, reversing gives parents before children
+    for path in reversed(descendants):
+        hierarchy_index.setdefault(path.rpartition("|")[0], []).append(path)
 
+    return hierarchy_index
 
-def calculate_pole_vector_position(joint_chain, pole_distance=1):
-    # this only works if there is an angle between joints
-    upper_world_transform = joint_chain[0].getTranslation(space='world')
-    middle_world_transform = joint_chain[1].getTranslation(space='world')
-    lower_world_transform = joint_chain[2].getTranslation(space='world')
 
-    upper_length = (middle_world_transform - upper_world_transform).length()
-    lower_length = (lower_world_transform - middle_world_transform).length()
-    distance = (upper_length + lower_length) * 0.5 * pole_distance
+def get_ordered_chains(roots, node_type="joint"):
+    """Return the depth first ordered hierarchy of every root, indexed in one pass."""
+    roots = [pm.PyNode(root) for root in roots]
+    hierarchy_index = build_hierarchy_index(roots, node_type=node_type)
+    chains = []
 
-    norm_upper_vec = ((upper_world_transform - middle_world_transform).normal() * distance) + middle_world_transform
-    norm_lower_vec = ((lower_world_transform - middle_world_transform).normal() * distance) + middle_world_transform
+    for root in roots:
+        chain = [root]
+        stack = list(reversed(hierarchy_index.get(root.longName(), [])))
+        while stack:
+            path = stack.pop()
+            chain.append(pm.PyNode(path))
+            stack.extend(reversed(hierarchy_index.get(path, [])))
+        chains.append(chain)
 
-    mid = norm_upper_vec + (middle_world_transform - norm_upper_vec).projectionOnto(norm_lower_vec - norm_upper_vec)
-    mid_pointer = middle_world_transform - mid
+    return chains
 
-    LOGGER.info(
-        "Calculated pole position. If there is no angle between joints please make sure to adjust position by hand"
-    )
 
-    return (mid_pointer.normal() * distance) + middle_world_transform
+def calculate_pole_vector_position(joint_chain, pole_distance=1, up_vector=(0, 0, 1)):
+    chain_positions = [[list(joint.getTranslation(space="world")) for joint in joint_chain[:3]]]
+
+    if not pole.get_pole_directions(chain_positions)[1][0]:
+        LOGGER.warning(
+            "No angle between joints, placed pole along the up vector. Please make sure to adjust position by hand"
+        )
+
+    return pm.datatypes.Vector(*pole.solve_pole_positions(chain_positions, pole_distance, up_vector)[0])
@@ -0,0 +1,105 @@
+from maya import cmds
+from maya.api import OpenMaya as om2
+import logging
+
+LOGGER = logging.getLogger("Matrix Constraint")
+
+CONSTRAINT_MODES = ("constraint", "matrix")
+
+
+def matrix_constraint(drivers, driven, name=None, translate=True, rotate=True, scale=False, maintain_offset=True):
+    """Drive a transform through its offsetParentMatrix instead of a constraint node.
+
+    Every driver gets a multMatrix computing the driven local matrix, the results
+    are layered in one blendMatrix on top of the driven rest matrix. Target k is
+    weighted 1 / (k + 1), so several drivers average like a constraint. The weight,
+    translateWeight, rotateWeight and scaleWeight of each target can be connected
+    afterwards the same way constraint weights are. Returns the blendMatrix node.
+
+    The local translation always moves into the rest matrix, otherwise rotate or
+    scale only constraints would pivot around the parent instead of the driven.
+    """
+    if not isinstance(drivers, (list, tuple)):
+        drivers = [drivers]
+    driven = str(driven)
+    name = name or f"{driven}_mtx_constr"
+
+    driven_world = get_matrix(f"{driven}.worldMatrix[0]")
+    local_matrix = driven_world * get_matrix(f"{driven}.parentInverseMatrix[0]")
+
+    blend = cmds.createNode("blendMatrix", name=name)
+    set_matrix(f"{blend}.inputMatrix", get_rest_matrix(local_matrix, rotate, scale))
+
+    for index, driver in enumerate(drivers):
+        driver = str(driver)
+        mult = cmds.createNode("multMatrix", name=f"{name}_{index}_mm")
+        matrix_inputs = [f"{driver}.worldMatrix[0]", f"{driven}.parentInverseMatrix[0]"]
+
+        if maintain_offset:
+            offset = driven_world * get_matrix(f"{driver}.worldMatrix[0]").inverse()
+            matrix_inputs.insert(0, offset)
+
+        for input_index, matrix_input in enumerate(matrix_inputs):
+            if isinstance(matrix_input, om2.MMatrix):
+                set_matrix(f"{mult}.matrixIn[{input_index}]", matrix_input)
+            else:
+                cmds.connectAttr(matrix_input, f"{mult}.matrixIn[{input_index}]")
+
+        target = f"{blend}.target[{index}]"
+        cmds.connectAttr(f"{mult}.matrixSum", f"{target}.targetMatrix")
+        cmds.setAttr(f"{target}.weight", 1.0 / (index + 1))
+        cmds.setAttr(f"{target}.translateWeight", float(translate))
+        cmds.setAttr(f"{target}.rotateWeight", float(rotate))
+        cmds.setAttr(f"{target}.scaleWeight", float(scale))
+        cmds.setAttr(f"{target}.shearWeight", float(scale))
+
+    reset_local_channels(driven, rotate, scale)
+    cmds.connectAttr(f"{blend}.outputMatrix", f"{driven}.offsetParentMatrix", force=True)
+    LOGGER.debug(f"Matrix constrained {driven} to {', '.join(str(driver) for driver in drivers)}")
+
+    return blend
+
+
+def get_rest_matrix(local_matrix, rotate, scale):
+    """Local matrix reduced to the constrained channels and the translation."""
+    local_transform = om2.MTransformationMatrix(local_matrix)
+    rest = om2.MTransformationMatrix()
+
+    rest.setTranslation(local_transform.translation(om2.MSpace.kTransform), om2.MSpace.kTransform)
+    if rotate:
+        rest.setRotation(local_transform.rotation(asQuaternion=True))
+    if scale:
+        rest.setScale(local_transform.scale(om2.MSpace.kTransform), om2.MSpace.kTransform)
+        rest.setShear(local_transform.shear(om2.MSpace.kTransform), om2.MSpace.kTransform)
+
+    return rest.asMatrix()
+
+
+def reset_local_channels(node, rotate, scale):
+    # the translation is part of every rest matrix, see get_rest_matrix
+    cmds.setAttr(f"{node}.translate", 0, 0, 0)
+    if rotate:
+        cmds.setAttr(f"{node}.rotate", 0, 0, 0)
+        if cmds.objectType(node, isAType="joint"):
+            cmds.setAttr(f"{node}.jointOrient", 0, 0, 0)
+    if scale:
+        cmds.setAttr(f"{node}.scale", 1, 1, 1)
+        cmds.setAttr(f"{node}.shear", 0, 0, 0)
+
+
+def get_matrix(plug):
+    return om2.MMatrix(cmds.getAttr(plug))
+
+
+def set_matrix(plug, matrix):
+    cmds.setAttr(plug, matrix_values(matrix), type="matrix")
+
+
+def matrix_values(matrix):
+    return [matrix.getElement(row, column) for row in range(4) for column in range(4)]
+
+
+def validate_mode(constraint_mode):
+    if constraint_mode not in CONSTRAINT_MODES:
+        raise ValueError(f"Unknown constraint mode {constraint_mode}, expected one of {CONSTRAINT_MODES}")
+    return constraint_mode
@@ -1,7 +1,12 @@
 import maya.OpenMaya as om
 from maya.api import OpenMaya as om2
 from maya.api import OpenMayaAnim as oma2
-import pymel.core as pm
+
+from maya_frog_rigging_tools._lazy import lazy_import
+
+pm = lazy_import("pymel.core")
+np = lazy_import("numpy")
+curves = lazy_import("maya_frog_rigging_tools.solvers.curves")
 
 
 def get_mobject(name):
@@ -29,6 +34,44 @@ def get_complete_components(mesh_ob):
 	return(ob)
 
 
+def get_complete_lattice_components(lattice_shape):
+	"""All lattice points in the order MItGeometry visits them, s changes fastest, then t, then u."""
+	s_count, t_count, u_count = [
+		pm.getAttr(f"{lattice_shape}.{attr}") for attr in ("sDivisions", "tDivisions", "uDivisions")
+	]
+	comp = om2.MFnTripleIndexedComponent()
+	ob = comp.create(om2.MFn.kLatticeComponent)
+	comp.addElements([(s, t, u) for u in range(u_count) for t in range(t_count) for s in range(s_count)])
+	return ob
+
+
+def get_mdag_path(name):
+	sel = om2.MGlobal.getSelectionListByName(str(name))
+	return sel.getDagPath(0)
+
+
+def get_point_positions(shape, space=om2.MSpace.kWorld):
+	return om2.MItGeometry(get_mdag_path(shape)).allPositions(space)
+
+
+def get_point_array(shape, space=om2.MSpace.kWorld):
+	"""Positions of all points of any deformable shape as a (points, 3) array, read in one API call."""
+	return points_to_array(get_point_positions(shape, space))
+
+
+def points_to_array(points):
+	return np.array(points, dtype=float).reshape(-1, 4)[:, :3]
+
+
+def set_skin_weights(skin_ob, shape, components, influences, weights):
+	"""Write a flat per component, per influence weight list in one setWeights call."""
+	skin_fn = get_mfn_skin(skin_ob)
+	influence_indices = om2.MIntArray(
+		[skin_fn.indexForInfluenceObject(get_mdag_path(influence)) for influence in influences]
+	)
+	skin_fn.setWeights(get_mdag_path(shape), components, influence_indices, om2.MDoubleArray(weights), False)
+
+
 def get_verts(mesh_name):
 	vertices = []
 	mesh_path = om.MDagPath()
@@ -43,18 +86,26 @@ def get_verts(mesh_name):
 	return vertices
 
 def get_u_param(pnt = [], crv = None):
-	point = om.MPoint(pnt[0],pnt[1],pnt[2])
-	curve_fn = om.MFnNurbsCurve(get_dag_path(crv))
-	param_util=om.MScriptUtil()
-	param_ptr=param_util.asDoublePtr()
-	is_on_curve = curve_fn.isPointOnCurve(point)
-	if is_on_curve:
-		curve_fn.getParamAtPoint(point , param_ptr,0.001,om.MSpace.kObject )
-	else:
-		point = curve_fn.closestPoint(point,param_ptr,0.001,om.MSpace.kObject)
-		curve_fn.getParamAtPoint(point , param_ptr,0.001,om.MSpace.kObject )
-	param = param_util.getDouble(param_ptr)
-	return param
+	return float(get_u_params([pnt], crv)[0])
+
+
+def get_u_params(points, crv, space=om2.MSpace.kObject):
+	"""Closest curve parameters for an (N, 3) array of points, sampled once for all points.
+
+	Only non rational curves are supported, CV weights other than 1 raise a ValueError.
+	"""
+	curve_fn = om2.MFnNurbsCurve(get_mdag_path(crv))
+	cv_positions = curve_fn.cvPositions(space)
+	if any(abs(point.w - 1.0) > 1e-9 for point in cv_positions):
+		raise ValueError(f"{crv} is a rational curve, closest parameters need a non rational curve")
+	cvs = np.array([(point.x, point.y, point.z) for point in cv_positions])
+	return curves.closest_params(
+		points,
+		cvs,
+		curves.get_full_knots(curve_fn.knots()),
+		curve_fn.degree,
+		periodic=curve_fn.form == om2.MFnNurbsCurve.kPeriodic
+	)
 
 def get_dag_path(object_name):
 	if isinstance(object_name, list):
@@ -0,0 +1,16 @@
+"""Maya Python API plugins shipped with the rigging tools."""
+from maya import cmds
+import logging
+import os
+
+LOGGER = logging.getLogger("Rig Plugins")
+
+PLUGIN_DIR = os.path.dirname(__file__)
+
+
+def load(plugin_name):
+    if cmds.pluginInfo(plugin_name, query=True, loaded=True):
+        return
+    plugin_path = os.path.join(PLUGIN_DIR, f"{plugin_name}.py")
+    LOGGER.info(f"Loading plugin {plugin_path}")
+    cmds.loadPlugin(plugin_path, quiet=True)
@@ -0,0 +1,146 @@
+"""Mean value coordinate cage deformer.
+
+Moves every point by the weighted offsets of the cage points from their bind
+positions, one matrix product per evaluation. The bind positions come from
+bindCagePoints, the posed cage points from the translation of cageMatrix,
+usually the cage controls relative to their srt groups. Deformations upstream,
+like a skinCluster on the same mesh, are kept and the cage offsets are added
+on top of them.
+
+The weights are computed at bind time, see deformation_cage.bind_cage_deformers,
+and stored flat per geometry in bindWeights so they survive saving the file.
+Points and weights move between Maya and NumPy as whole arrays.
+"""
+import numpy as np
+from maya.api import OpenMaya as om2
+from maya.api import OpenMayaAnim as oma2
+
+
+def maya_useNewAPI():
+    pass
+
+
+class FrogCageDeformer(oma2.MPxDeformerNode):
+    type_name = "frogCageDeformer"
+    type_id = om2.MTypeId(0x0007F103)
+
+    bind_cage_points = None
+    cage_matrix = None
+    bind_weights = None
+
+    def __init__(self):
+        oma2.MPxDeformerNode.__init__(self)
+        self._weights = {}
+
+    @classmethod
+    def creator(cls):
+        return cls()
+
+    @classmethod
+    def initialize(cls):
+        typed_fn = om2.MFnTypedAttribute()
+        matrix_fn = om2.MFnMatrixAttribute()
+        output_geom = oma2.MPxGeometryFilter.outputGeom
+
+        cls.bind_cage_points = typed_fn.create("bindCagePoints", "bcp", om2.MFnData.kPointArray)
+        typed_fn.storable = True
+        cls.addAttribute(cls.bind_cage_points)
+
+        cls.cage_matrix = matrix_fn.create("cageMatrix", "cmx", om2.MFnMatrixAttribute.kDouble)
+        matrix_fn.array = True
+        matrix_fn.usesArrayDataBuilder = True
+        cls.addAttribute(cls.cage_matrix)
+
+        # points * cage points weights of every geometry index, row major
+        cls.bind_weights = typed_fn.create("bindWeights", "bwt", om2.MFnData.kDoubleArray)
+        typed_fn.array = True
+        typed_fn.usesArrayDataBuilder = True
+        typed_fn.storable = True
+        cls.addAttribute(cls.bind_weights)
+
+        for attr in (cls.bind_cage_points, cls.cage_matrix, cls.bind_weights):
+            cls.attributeAffects(attr, output_geom)
+
+    def setDependentsDirty(self, plug, plug_array):
+        if plug.attribute() == self.bind_weights:
+            if plug.isElement:
+                self._weights.pop(plug.logicalIndex(), None)
+            else:
+                self._weights.clear()
+        return super().setDependentsDirty(plug, plug_array)
+
+    def deform(self, data_block, geom_iter, local_to_world, multi_index):
+        envelope = data_block.inputValue(oma2.MPxGeometryFilter.envelope).asFloat()
+        if not envelope:
+            return
+
+        cage_points = _read_translations(data_block.inputArrayValue(self.cage_matrix))
+        bind_data = data_block.inputValue(self.bind_cage_points).data()
+        if bind_data.isNull():
+            return
+        bind_points = _to_numpy(om2.MFnPointArrayData(bind_data).array())
+        points = _to_numpy(geom_iter.allPositions())
+
+        weights = self._get_weights(data_block, multi_index, len(points), len(bind_points))
+        if weights is None or len(cage_points) != len(bind_points):
+            return
+
+        world = _matrix_to_numpy(local_to_world)
+        offsets = (weights @ (cage_points - bind_points)) @ np.linalg.inv(world[:3, :3])
+        result = points + offsets * envelope
+        geom_iter.setAllPositions(om2.MPointArray(result.tolist()))
+
+    def _get_weights(self, data_block, multi_index, point_count, cage_count):
+        weights = self._weights.get(multi_index)
+        if weights is not None and weights.shape == (point_count, cage_count):
+            return weights
+
+        array_handle = data_block.inputArrayValue(self.bind_weights)
+        try:
+            array_handle.jumpToLogicalElement(multi_index)
+        except RuntimeError:
+            return None
+        weight_data = array_handle.inputValue().data()
+        if weight_data.isNull():
+            return None
+
+        weights = np.array(om2.MFnDoubleArrayData(weight_data).array(), dtype=float)
+        if len(weights) != point_count * cage_count:
+            return None
+        weights = weights.reshape(point_count, cage_count)
+        self._weights[multi_index] = weights
+        return weights
+
+
+def _read_translations(array_handle):
+    translations = []
+    for _ in range(len(array_handle)):
+        matrix = array_handle.inputValue().asMatrix()
+        translations.append([matrix.getElement(3, 0), matrix.getElement(3, 1), matrix.getElement(3, 2)])
+        array_handle.next()
+    return np.array(translations).reshape(-1, 3)
+
+
+def _to_numpy(point_array):
+    # MPoints convert as x, y, z, w rows
+    return np.array(point_array, dtype=float).reshape(-1, 4)[:, :3]
+
+
+def _matrix_to_numpy(matrix):
+    return np.array([[matrix.getElement(row, column) for column in range(4)] for row in range(4)])
+
+
+def initializePlugin(plugin):
+    plugin_fn = om2.MFnPlugin(plugin, "maya_frog_rigging_tools", "1.0")
+    plugin_fn.registerNode(
+        FrogCageDeformer.type_name,
+        FrogCageDeformer.type_id,
+        FrogCageDeformer.creator,
+        FrogCageDeformer.initialize,
+        om2.MPxNode.kDeformerNode
+    )
+
+
+def uninitializePlugin(plugin):
+    plugin_fn = om2.MFnPlugin(plugin)
+    plugin_fn.deregisterNode(FrogCageDeformer.type_id)
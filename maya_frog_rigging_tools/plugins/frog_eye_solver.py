@@ -0,0 +1,137 @@
+"""Single node replacement of the eyeball_setup ring joint network.
+
+Takes the Pupil and Iris values with the value profile and layout of every joint and
+outputs the translation along the eye axis and the scale of all joints in one
+compute. Per joint this is the remapValue, multiplyDivide, eulerToQuat and
+clamp chain setup_eye builds otherwise, the math is solvers.eye.solve_ring_joints.
+"""
+from maya.api import OpenMaya as om2
+
+from maya_frog_rigging_tools.solvers import eye
+
+
+def maya_useNewAPI():
+    pass
+
+
+class FrogEyeSolver(om2.MPxNode):
+    type_name = "frogEyeSolver"
+    type_id = om2.MTypeId(0x0007F102)
+
+    pupil = None
+    iris = None
+    iris_joints = None
+    profile = None
+    layout = None
+
+    out_translate = None
+    out_scale = None
+
+    @classmethod
+    def creator(cls):
+        return cls()
+
+    @classmethod
+    def initialize(cls):
+        numeric_fn = om2.MFnNumericAttribute()
+
+        input_attrs = []
+        for attr_name, short_name in [("pupil", "pup"), ("iris", "irs")]:
+            attr = numeric_fn.create(attr_name, short_name, om2.MFnNumericData.kDouble, 0.5)
+            numeric_fn.setMin(0.0)
+            numeric_fn.setMax(1.0)
+            numeric_fn.keyable = True
+            cls.addAttribute(attr)
+            input_attrs.append(attr)
+        cls.pupil, cls.iris = input_attrs
+
+        # joints below this index follow the iris, the rest the pupil
+        cls.iris_joints = numeric_fn.create("irisJoints", "irj", om2.MFnNumericData.kInt, 0)
+        numeric_fn.setMin(0)
+        cls.addAttribute(cls.iris_joints)
+
+        array_attrs = []
+        for attr_name, short_name in [("profile", "prf"), ("layout", "lyt")]:
+            attr = numeric_fn.create(attr_name, short_name, om2.MFnNumericData.kDouble, 0.0)
+            numeric_fn.array = True
+            numeric_fn.usesArrayDataBuilder = True
+            cls.addAttribute(attr)
+            array_attrs.append(attr)
+        # layout holds the remap outputMin per joint, missing elements are spaced evenly
+        cls.profile, cls.layout = array_attrs
+
+        output_attrs = []
+        for attr_name, short_name in [("outTranslate", "otr"), ("outScale", "osc")]:
+            attr = numeric_fn.create(attr_name, short_name, om2.MFnNumericData.kDouble, 0.0)
+            numeric_fn.array = True
+            numeric_fn.usesArrayDataBuilder = True
+            numeric_fn.writable = False
+            numeric_fn.storable = False
+            cls.addAttribute(attr)
+            output_attrs.append(attr)
+        cls.out_translate, cls.out_scale = output_attrs
+
+        for input_attr in (cls.pupil, cls.iris, cls.iris_joints, cls.profile, cls.layout):
+            for output_attr in output_attrs:
+                cls.attributeAffects(input_attr, output_attr)
+
+    def compute(self, plug, data_block):
+        if plug.attribute() not in (self.out_translate, self.out_scale):
+            return None
+
+        pupil = data_block.inputValue(self.pupil).asDouble()
+        iris = data_block.inputValue(self.iris).asDouble()
+        iris_joints = data_block.inputValue(self.iris_joints).asInt()
+
+        profile = _read_array(data_block, self.profile)
+        layout = _read_array(data_block, self.layout)
+
+        translate_handle = data_block.outputArrayValue(self.out_translate)
+        scale_handle = data_block.outputArrayValue(self.out_scale)
+        translate_builder = translate_handle.builder()
+        scale_builder = scale_handle.builder()
+
+        indices = sorted(profile)
+        last_index = max(len(profile) - 1, 1)
+        translations, scales = eye.solve_ring_joints(
+            [profile[index] for index in indices],
+            [layout.get(index, index / last_index) for index in indices],
+            pupil,
+            iris,
+            iris_joints,
+            indices
+        )
+        for index, translation, scale in zip(indices, translations.tolist(), scales.tolist()):
+            translate_builder.addElement(index).setDouble(translation)
+            scale_builder.addElement(index).setDouble(scale)
+
+        translate_handle.set(translate_builder)
+        scale_handle.set(scale_builder)
+        translate_handle.setAllClean()
+        scale_handle.setAllClean()
+        return self
+
+
+def _read_array(data_block, attribute):
+    array_handle = data_block.inputArrayValue(attribute)
+    values = {}
+    for _ in range(len(array_handle)):
+        values[array_handle.elementLogicalIndex()] = array_handle.inputValue().asDouble()
+        array_handle.next()
+    return values
+
+
+def initializePlugin(plugin):
+    plugin_fn = om2.MFnPlugin(plugin, "maya_frog_rigging_tools", "1.0")
+    plugin_fn.registerNode(
+        FrogEyeSolver.type_name,
+        FrogEyeSolver.type_id,
+        FrogEyeSolver.creator,
+        FrogEyeSolver.initialize,
+        om2.MPxNode.kDependNode
+    )
+
+
+def uninitializePlugin(plugin):
+    plugin_fn = om2.MFnPlugin(plugin)
+    plugin_fn.deregisterNode(FrogEyeSolver.type_id)
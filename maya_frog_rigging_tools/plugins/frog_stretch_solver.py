@@ -0,0 +1,179 @@
+"""Single node replacement of the LimbSetup stretch network.
+
+Takes the world matrices of the stretch chain, the start and end locators and
+the pole control together with the host attributes and outputs the two ik
+scales and the pole space weights. The math mirrors the utility node network,
+solvers.stretch.solve_stretch is the NumPy reference of it.
+"""
+import math
+
+from maya.api import OpenMaya as om2
+
+
+def maya_useNewAPI():
+    pass
+
+
+EPSILON = 1e-8
+
+
+class FrogStretchSolver(om2.MPxNode):
+    type_name = "frogStretchSolver"
+    type_id = om2.MTypeId(0x0007F101)
+
+    start_matrix = None
+    middle_matrix = None
+    end_matrix = None
+    root_matrix = None
+    handle_matrix = None
+    pole_matrix = None
+    max_stretch = None
+    max_squash = None
+    pole_lock = None
+    pole_space = None
+
+    upper_scale = None
+    lower_scale = None
+    pole_start_weight = None
+    pole_end_weight = None
+
+    @classmethod
+    def creator(cls):
+        return cls()
+
+    @classmethod
+    def initialize(cls):
+        matrix_fn = om2.MFnMatrixAttribute()
+        numeric_fn = om2.MFnNumericAttribute()
+
+        matrix_attrs = []
+        for attr_name, short_name in [
+            ("startMatrix", "stm"),
+            ("middleMatrix", "mdm"),
+            ("endMatrix", "enm"),
+            ("rootMatrix", "rtm"),
+            ("handleMatrix", "hdm"),
+            ("poleMatrix", "plm"),
+        ]:
+            attr = matrix_fn.create(attr_name, short_name, om2.MFnMatrixAttribute.kDouble)
+            matrix_fn.storable = True
+            cls.addAttribute(attr)
+            matrix_attrs.append(attr)
+
+        (
+            cls.start_matrix,
+            cls.middle_matrix,
+            cls.end_matrix,
+            cls.root_matrix,
+            cls.handle_matrix,
+            cls.pole_matrix,
+        ) = matrix_attrs
+
+        setting_attrs = []
+        for attr_name, short_name, default, minimum, maximum in [
+            ("maxStretch", "mxs", 1.5, 1.0, 10.0),
+            ("maxSquash", "mxq", 0.0, 0.0, 1.0),
+            ("poleLock", "plk", 0.0, 0.0, 1.0),
+            ("poleSpace", "psp", 0.5, 0.0, 1.0),
+        ]:
+            attr = numeric_fn.create(attr_name, short_name, om2.MFnNumericData.kDouble, default)
+            numeric_fn.setMin(minimum)
+            numeric_fn.setMax(maximum)
+            numeric_fn.keyable = True
+            cls.addAttribute(attr)
+            setting_attrs.append(attr)
+
+        cls.max_stretch, cls.max_squash, cls.pole_lock, cls.pole_space = setting_attrs
+
+        output_attrs = []
+        for attr_name, short_name in [
+            ("upperScale", "ups"),
+            ("lowerScale", "lws"),
+            ("poleStartWeight", "psw"),
+            ("poleEndWeight", "pew"),
+        ]:
+            attr = numeric_fn.create(attr_name, short_name, om2.MFnNumericData.kDouble, 1.0)
+            numeric_fn.writable = False
+            numeric_fn.storable = False
+            cls.addAttribute(attr)
+            output_attrs.append(attr)
+
+        cls.upper_scale, cls.lower_scale, cls.pole_start_weight, cls.pole_end_weight = output_attrs
+
+        for input_attr in matrix_attrs + setting_attrs:
+            for output_attr in output_attrs:
+                cls.attributeAffects(input_attr, output_attr)
+
+    def compute(self, plug, data_block):
+        outputs = (self.upper_scale, self.lower_scale, self.pole_start_weight, self.pole_end_weight)
+        if plug.attribute() not in outputs:
+            return None
+
+        start = _position(data_block, self.start_matrix)
+        middle = _position(data_block, self.middle_matrix)
+        end = _position(data_block, self.end_matrix)
+        root = _position(data_block, self.root_matrix)
+        handle = _position(data_block, self.handle_matrix)
+        pole = _position(data_block, self.pole_matrix)
+
+        max_stretch = data_block.inputValue(self.max_stretch).asDouble()
+        max_squash = data_block.inputValue(self.max_squash).asDouble()
+        pole_lock = data_block.inputValue(self.pole_lock).asDouble()
+        pole_space = data_block.inputValue(self.pole_space).asDouble()
+
+        upper_length = (middle - start).length()
+        lower_length = (end - middle).length()
+        base_length = upper_length + lower_length
+        stretch_length = (handle - start).length()
+
+        squash_limit = 1.0 - max_squash
+        if stretch_length > squash_limit * base_length:
+            stretch_scale = _safe_divide(stretch_length, base_length)
+        else:
+            stretch_scale = squash_limit
+        stretch_scale = stretch_scale if max_stretch > stretch_scale else max_stretch
+
+        lock_upper_scale = _safe_divide((pole - root).length(), upper_length)
+        lock_lower_scale = _safe_divide((pole - handle).length(), lower_length)
+        pole_weight = 1.0 - pole_lock
+
+        results = (
+            pole_lock * lock_upper_scale + pole_weight * stretch_scale,
+            pole_lock * lock_lower_scale + pole_weight * stretch_scale,
+            pole_weight * (1.0 - pole_space),
+            pole_weight * pole_space,
+        )
+
+        for output_attr, value in zip(outputs, results):
+            handle_out = data_block.outputValue(output_attr)
+            handle_out.setDouble(value if math.isfinite(value) else 1.0)
+            handle_out.setClean()
+
+        return self
+
+
+def _position(data_block, attribute):
+    matrix = data_block.inputValue(attribute).asMatrix()
+    return om2.MVector(matrix.getElement(3, 0), matrix.getElement(3, 1), matrix.getElement(3, 2))
+
+
+def _safe_divide(numerator, denominator):
+    if abs(denominator) > EPSILON:
+        return numerator / denominator
+    return 1.0
+
+
+def initializePlugin(plugin):
+    plugin_fn = om2.MFnPlugin(plugin, "maya_frog_rigging_tools", "1.0")
+    plugin_fn.registerNode(
+        FrogStretchSolver.type_name,
+        FrogStretchSolver.type_id,
+        FrogStretchSolver.creator,
+        FrogStretchSolver.initialize,
+        om2.MPxNode.kDependNode
+    )
+
+
+def uninitializePlugin(plugin):
+    plugin_fn = om2.MFnPlugin(plugin)
+    plugin_fn.deregisterNode(FrogStretchSolver.type_id)
@@ -0,0 +1,198 @@
+from collections import Counter
+import functools
+import json
+import logging
+import time
+
+from maya.api import OpenMaya as om2
+
+LOGGER = logging.getLogger("Build Profiler")
+
+_active_profiler = None
+
+
+class BuildProfiler:
+    """Record wall time, Maya commands, created nodes and connections per build stage.
+
+    Stages are marked with profile_stage, they are only recorded while a
+    profiler runs, e.g.::
+
+        with BuildProfiler("frog") as profiler:
+            LimbSetup("leg_l_0_bnd", prefix_name="leg_l").build_structure()
+        profiler.write_chrome_trace("frog_trace.json")
+
+    Counts of nested stages are included in their parents, commands are the
+    ones MCommandMessage reports, API calls don't show up.
+    """
+
+    def __init__(self, name="build"):
+        self.name = name
+        self.stages = []
+        self.commands = Counter()
+        self.nodes = Counter()
+        self.connections = Counter()
+        self.duration = 0.0
+        self._open_stages = []
+        self._callback_ids = []
+        self._start = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+        return False
+
+    def start(self):
+        global _active_profiler
+        if _active_profiler is not None:
+            raise RuntimeError(f"Profiler {_active_profiler.name} is already running")
+        self._callback_ids = [
+            om2.MCommandMessage.addCommandCallback(self._on_command),
+            om2.MDGMessage.addNodeAddedCallback(self._on_node_added, "dependNode"),
+            om2.MDGMessage.addConnectionCallback(self._on_connection),
+        ]
+        self._start = time.perf_counter()
+        _active_profiler = self
+        self.enter_stage(self.name)
+
+    def stop(self):
+        global _active_profiler
+        while self._open_stages:
+            self.exit_stage()
+        om2.MMessage.removeCallbacks(self._callback_ids)
+        self._callback_ids = []
+        self.duration = time.perf_counter() - self._start
+        _active_profiler = None
+        LOGGER.info(
+            f"Profiled {self.name}: {self.duration:.2f}s, {sum(self.commands.values())} commands, "
+            f"{sum(self.nodes.values())} nodes, {sum(self.connections.values())} connections"
+        )
+
+    def enter_stage(self, name):
+        self._open_stages.append({
+            "name": name,
+            "start": time.perf_counter(),
+            "commands": self.commands.copy(),
+            "nodes": self.nodes.copy(),
+            "connections": self.connections.copy(),
+            "child_duration": 0.0,
+        })
+
+    def exit_stage(self):
+        stage = self._open_stages.pop()
+        duration = time.perf_counter() - stage["start"]
+        if self._open_stages:
+            self._open_stages[-1]["child_duration"] += duration
+
+        commands = self.commands - stage["commands"]
+        self.stages.append({
+            "name": stage["name"],
+            "depth": len(self._open_stages),
+            "start": stage["start"] - self._start,
+            "duration": duration,
+            "self_duration": duration - stage["child_duration"],
+            "commands": sum(commands.values()),
+            "command_counts": dict(commands.most_common()),
+            "nodes": dict(self.nodes - stage["nodes"]),
+            "connections": dict(self.connections - stage["connections"]),
+        })
+
+    def _on_command(self, command, *args):
+        self.commands[command.split(" ", 1)[0]] += 1
+
+    def _on_node_added(self, node, *args):
+        self.nodes[om2.MFnDependencyNode(node).typeName] += 1
+
+    def _on_connection(self, source_plug, destination_plug, made, *args):
+        if made:
+            self.connections[om2.MFnDependencyNode(destination_plug.node()).typeName] += 1
+
+    def to_dict(self):
+        return {
+            "name": self.name,
+            "duration": self.duration,
+            "stages": sorted(self.stages, key=lambda stage: stage["start"]),
+        }
+
+    def write_json(self, path):
+        with open(path, "w") as json_file:
+            json.dump(self.to_dict(), json_file, indent=2)
+        LOGGER.info(f"Wrote build profile to {path}")
+
+    def get_trace_events(self):
+        """Complete events per stage in Chrome trace event format, timestamps in microseconds."""
+        events = []
+        for stage in sorted(self.stages, key=lambda stage: stage["start"]):
+            events.append({
+                "name": stage["name"],
+                "cat": "build",
+                "ph": "X",
+                "ts": stage["start"] * 1e6,
+                "dur": stage["duration"] * 1e6,
+                "pid": 0,
+                "tid": 0,
+                "args": {
+                    "commands": stage["commands"],
+                    "nodes": sum(stage["nodes"].values()),
+                    "connections": sum(stage["connections"].values()),
+                    "node_types": stage["nodes"],
+                },
+            })
+        return events
+
+    def write_chrome_trace(self, path):
+        """Trace file for chrome://tracing or Perfetto."""
+        with open(path, "w") as trace_file:
+            json.dump({"traceEvents": self.get_trace_events(), "displayTimeUnit": "ms"}, trace_file)
+        LOGGER.info(f"Wrote build trace to {path}")
+
+    def log_summary(self, limit=10):
+        """Log the stages with the most time spent in themselves."""
+        for stage in sorted(self.stages, key=lambda stage: stage["self_duration"], reverse=True)[:limit]:
+            LOGGER.info(
+                f"{stage['name']}: {stage['self_duration']:.3f}s self, {stage['duration']:.3f}s total, "
+                f"{stage['commands']} commands, {sum(stage['nodes'].values())} nodes, "
+                f"{sum(stage['connections'].values())} connections"
+            )
+
+
+class ProfileStage:
+    """Context manager and decorator marking a build stage for the running profiler."""
+
+    def __init__(self, name=None):
+        self.name = name
+
+    def __enter__(self):
+        # remember the profiler so a stage opened before it started doesn't close one of its stages
+        self._profiler = _active_profiler
+        if self._profiler is not None:
+            self._profiler.enter_stage(self.name or "stage")
+        return self
+
+    def __exit__(self, *exc_info):
+        if self._profiler is not None and self._profiler is _active_profiler:
+            self._profiler.exit_stage()
+        return False
+
+    def __call__(self, func):
+        name = self.name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _active_profiler is None:
+                return func(*args, **kwargs)
+            with ProfileStage(name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+
+def profile_stage(name=None):
+    """Mark a build stage, as decorator the function name is the default stage name."""
+    return ProfileStage(name)
+
+
+def get_active_profiler():
+    return _active_profiler
@@ -0,0 +1,62 @@
+import logging
+import time
+
+from maya_frog_rigging_tools import cage_build
+from maya_frog_rigging_tools import rig_icons
+from maya_frog_rigging_tools import utils
+from maya_frog_rigging_tools.basic_rig import BasicRig
+
+LOGGER = logging.getLogger("Prop Builder")
+
+
+def build_props(props, stop_on_error=False, **rig_kwargs):
+    """Rig a list of prop geometry groups with one BasicRig instance each.
+
+    All props share the icon caches, one undo chunk and suspended refresh. A prop
+    that fails to build is logged and reported and the nodes it created are
+    deleted again, the batch carries on unless stop_on_error is set. Extra keyword arguments are passed to every BasicRig.
+    Returns the rigs and a per prop timing and node count report.
+    """
+    props = [prop for prop in props if prop]
+    rigs = []
+    report = []
+
+    LOGGER.info(f"Rigging {len(props)} props")
+    build_start = time.perf_counter()
+
+    with utils.batch_build("frog_props"), rig_icons.icon_cache():
+        for prop in props:
+            prop_start = time.perf_counter()
+            entry = {"prop": str(prop)}
+
+            with utils.record_nodes() as created:
+                try:
+                    rig = BasicRig(rig_geo=prop, **rig_kwargs)
+                    entry["prop"] = rig.name
+                    rig.build()
+                except Exception as e:
+                    if stop_on_error:
+                        raise
+                    LOGGER.exception(f"Could not rig {prop}")
+                    entry["error"] = str(e)
+                else:
+                    rigs.append(rig)
+
+            entry["nodes"] = len(created)
+            if "error" in entry:
+                cage_build.delete_created_nodes(created)
+            entry["time"] = time.perf_counter() - prop_start
+            report.append(entry)
+
+    LOGGER.info(f"Rigged {len(rigs)} of {len(props)} props in {time.perf_counter() - build_start:.2f}s")
+    log_report(report)
+    return rigs, report
+
+
+def log_report(report):
+    LOGGER.info(" | ".join(["prop".ljust(30), "time".rjust(9), "nodes".rjust(7)]))
+    for entry in report:
+        row = [entry["prop"].ljust(30), f"{entry['time']:8.2f}s", str(entry["nodes"]).rjust(7)]
+        if "error" in entry:
+            row.append(f"failed: {entry['error']}")
+        LOGGER.info(" | ".join(row))
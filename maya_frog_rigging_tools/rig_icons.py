@@ -0,0 +1,87 @@
+import logging
+from contextlib import contextmanager
+
+from maya_frog_rigging_tools import control
+from maya_frog_rigging_tools._lazy import lazy_import
+
+pm = lazy_import("pymel.core")
+
+LOGGER = logging.getLogger("Rig Icons")
+
+ICON_SHAPES = {1: "circle", 3: "circle", 11: "gear"}
+
+_icon_templates = None
+
+
+class ControlIcons:
+    """Rig icons built from the project control library."""
+
+    name = "builtin"
+
+    def create(self, index, name):
+        ctl = control.create(ICON_SHAPES.get(index, "circle"), name=name)
+        srt = pm.group(ctl, name=f"{name}_srt")
+        pm.group(srt, name=f"{name}_null")
+        return ctl
+
+    def colorize(self, ctl, color_index):
+        for shape in ctl.getShapes():
+            shape.setAttr("overrideEnabled", 1)
+            shape.setAttr("overrideRGBColors", 0)
+            shape.setAttr("overrideColor", color_index)
+
+
+class CapitoIcons(ControlIcons):
+    """Rig icons of the capito pipeline, only available where capito is installed."""
+
+    name = "capito"
+
+    def __init__(self):
+        # capito pulls in its whole pipeline, only import it once its icons are used
+        try:
+            from capito.maya.rig.icons import RigIcons
+        except ImportError:
+            raise RuntimeError("capito is not available, please use the builtin rig icons") from None
+        self.rig_icons = RigIcons()
+
+    def create(self, index, name):
+        if _icon_templates is None:
+            return self.rig_icons.create_rig_icon(index, name)
+
+        template = _icon_templates.get(index)
+        if template is None:
+            template = self.rig_icons.create_rig_icon(index, f"icon_{index}_template").getParent(2)
+            _icon_templates[index] = template
+
+        null = pm.duplicate(template)[0]
+        return null.getChildren(type="transform")[0].getChildren(type="transform")[0]
+
+
+ICON_PROVIDERS = {provider.name: provider for provider in (ControlIcons, CapitoIcons)}
+
+
+def get_icon_provider(provider="builtin"):
+    if not isinstance(provider, str):
+        return provider
+    if provider not in ICON_PROVIDERS:
+        raise ValueError(f"Unknown icon provider {provider}, please use one of {list(ICON_PROVIDERS)}")
+    return ICON_PROVIDERS[provider]()
+
+
+@contextmanager
+def icon_cache():
+    """Build every requested rig icon once and duplicate it afterwards."""
+    global _icon_templates
+    if _icon_templates is not None:
+        yield
+        return
+
+    _icon_templates = {}
+    try:
+        with control.shape_cache():
+            yield
+    finally:
+        templates = list(_icon_templates.values())
+        _icon_templates = None
+        if templates:
+            pm.delete(templates)
@@ -1,12 +1,14 @@
-import pymel.core as pm
-
 from maya_frog_rigging_tools import control
 from maya_frog_rigging_tools import utils
+from maya_frog_rigging_tools._lazy import lazy_import
+from maya_frog_rigging_tools.profiling import profile_stage
 
 import logging
 
 from maya_frog_rigging_tools.skin.uv_pins import pin_on_nurbs_surface
 
+pm = lazy_import("pymel.core")
+
 LOGGER = logging.getLogger("Ribbon")
 
 
@@ -47,6 +49,7 @@ def add_pins_to_ribbon(ribbon, number_of_pins):
     return pin_list
 
 
+@profile_stage()
 def create_bezier_ribbon(
         jnt_chain, host_node, prim_axis="x", offset_up=(0, 0, 1), offset_low=(0, 0, -1), name="bezier_rbbn"
 ):
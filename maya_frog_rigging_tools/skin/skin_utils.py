@@ -1,4 +1,7 @@
-from pymel import core as pm
+from maya_frog_rigging_tools._lazy import lazy_import
+
+pm = lazy_import("pymel.core")
+
 
 def get_deform_shape(ob):
 	ob = pm.PyNode(ob)
@@ -1,10 +1,12 @@
 
 from maya.api import OpenMaya as om2
-from pymel import core as pm
 
+from maya_frog_rigging_tools._lazy import lazy_import
 from maya_frog_rigging_tools.omaya_utils import get_dag_path, get_mfn_skin, get_mfn_mesh, get_complete_components
 from maya_frog_rigging_tools.skin.skin_utils import get_deform_shape, get_skin_cluster
 
+pm = lazy_import("pymel.core")
+
 
 def log(msg, warn=False, error=False):
 	if error:
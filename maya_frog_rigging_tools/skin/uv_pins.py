@@ -1,5 +1,8 @@
 from maya import cmds
-from pymel import core as pm
+
+from maya_frog_rigging_tools._lazy import lazy_import
+
+pm = lazy_import("pymel.core")
 
 
 def create_pin_on_vert(name=None, vert=None):
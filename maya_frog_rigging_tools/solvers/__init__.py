@@ -0,0 +1 @@
+"""Maya independent NumPy implementations of the rig math."""
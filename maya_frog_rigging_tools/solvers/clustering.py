@@ -0,0 +1,150 @@
+import numpy as np
+
+
+def voxel_cluster(points, voxel_size):
+    """Group points by the voxel they fall into, returns labels and cluster centers."""
+    points = np.asarray(points, dtype=float)
+    voxels = np.floor((points - points.min(axis=0)) / voxel_size).astype(np.int64)
+    _, labels = np.unique(voxels, axis=0, return_inverse=True)
+    labels = labels.ravel()
+    return labels, get_cluster_means(points, labels)
+
+
+def voxel_cluster_count(points, count, iterations=30):
+    """Voxel clustering with the voxel size searched to get close to a cluster count."""
+    points = np.asarray(points, dtype=float)
+    extent = np.ptp(points, axis=0).max() or 1.0
+    low, high = extent * 1e-4, extent
+    best = None
+    for _ in range(iterations):
+        size = (low + high) * 0.5
+        labels, centers = voxel_cluster(points, size)
+        if best is None or abs(len(centers) - count) < abs(len(best[1]) - count):
+            best = labels, centers
+        if len(centers) == count:
+            break
+        if len(centers) > count:
+            low = size
+        else:
+            high = size
+    return best
+
+
+def kmeans_cluster(points, count, iterations=20, seed=0, chunk_size=16384):
+    """Lloyd k-means with k-means++ seeding, returns labels and cluster centers."""
+    points = np.asarray(points, dtype=float)
+    count = min(count, len(points))
+    rng = np.random.default_rng(seed)
+
+    centers = np.empty((count, points.shape[1]))
+    centers[0] = points[rng.integers(len(points))]
+    distances = np.sum((points - centers[0]) ** 2, axis=-1)
+    for index in range(1, count):
+        total = distances.sum()
+        choice = rng.choice(len(points), p=distances / total) if total > 0 else rng.integers(len(points))
+        centers[index] = points[choice]
+        distances = np.minimum(distances, np.sum((points - centers[index]) ** 2, axis=-1))
+
+    labels = np.zeros(len(points), dtype=np.int64)
+    for iteration in range(iterations):
+        new_labels = assign_nearest(points, centers, chunk_size)
+        if iteration and np.array_equal(new_labels, labels):
+            break
+        labels = new_labels
+        means = get_cluster_means(points, labels, count)
+        # empty clusters keep their previous center
+        filled = np.bincount(labels, minlength=count) > 0
+        centers[filled] = means[filled]
+
+    return compact_labels(labels, centers)
+
+
+def assign_nearest(points, centers, chunk_size=16384):
+    """Index of the nearest center for every point, in chunks to bound memory."""
+    labels = np.empty(len(points), dtype=np.int64)
+    center_norms = np.sum(centers * centers, axis=-1)
+    for start in range(0, len(points), chunk_size):
+        chunk = points[start:start + chunk_size]
+        distances = center_norms[None, :] - 2.0 * chunk @ centers.T
+        labels[start:start + chunk_size] = np.argmin(distances, axis=-1)
+    return labels
+
+
+def get_cluster_means(values, labels, count=None):
+    count = labels.max() + 1 if count is None else count
+    sums = np.zeros((count,) + values.shape[1:])
+    np.add.at(sums, labels, values)
+    sizes = np.bincount(labels, minlength=count).astype(float)
+    return sums / np.maximum(sizes, 1.0).reshape((-1,) + (1,) * (values.ndim - 1))
+
+
+def compact_labels(labels, centers):
+    """Drop clusters without points and renumber the labels."""
+    used, labels = np.unique(labels, return_inverse=True)
+    return labels.ravel(), centers[used]
+
+
+def get_cluster_triangles(labels, triangles):
+    """Triangles between clusters, triangles collapsing into fewer than 3 clusters are dropped.
+
+    Winding of the source triangles is kept, duplicates are removed. Clusters
+    can fold the surface so that more than two triangles share an edge, those
+    are dropped as well, triangles covering more source triangles are kept first.
+    """
+    clustered = labels[np.asarray(triangles)]
+    valid = (
+        (clustered[:, 0] != clustered[:, 1])
+        & (clustered[:, 1] != clustered[:, 2])
+        & (clustered[:, 0] != clustered[:, 2])
+    )
+    clustered = clustered[valid]
+    # rotate every triangle to start at its smallest index so duplicates compare equal
+    shift = np.argmin(clustered, axis=1)
+    rows = np.arange(len(clustered))[:, None]
+    clustered = clustered[rows, (shift[:, None] + np.arange(3)) % 3]
+    _, first, support = np.unique(clustered, axis=0, return_index=True, return_counts=True)
+    kept = remove_non_manifold(clustered[first], priority=-support)
+    return clustered[np.sort(first[kept])]
+
+
+def remove_non_manifold(triangles, priority=None):
+    """Indices of the triangles to keep so every edge has at most two triangles with opposite winding.
+
+    Triangles are added by ascending priority, one repeating a directed edge of
+    a kept triangle would be a third triangle on the edge or flip the winding.
+    """
+    triangles = np.asarray(triangles, dtype=np.int64).reshape(-1, 3)
+    order = np.arange(len(triangles)) if priority is None else np.argsort(priority, kind="stable")
+    used_edges = set()
+    kept = []
+    for index in order.tolist():
+        a, b, c = triangles[index].tolist()
+        edges = ((a, b), (b, c), (c, a))
+        if any(edge in used_edges for edge in edges):
+            continue
+        kept.append(index)
+        used_edges.update(edges)
+    return np.sort(np.asarray(kept, dtype=np.int64))
+
+
+def decimate(points, triangles, count, method="kmeans", normals=None, offset=0.0, seed=0):
+    """Reduce a triangle mesh to roughly count vertices by vertex clustering.
+
+    Returns cage points, cage triangles and the cluster label of every source
+    point. With normals, cage points are pushed out by offset along the mean
+    normal of their cluster.
+    """
+    points = np.asarray(points, dtype=float)
+    if method == "kmeans":
+        labels, centers = kmeans_cluster(points, count, seed=seed)
+    elif method == "voxel":
+        labels, centers = voxel_cluster_count(points, count)
+    else:
+        raise ValueError(f"Unknown clustering method {method}, please use kmeans or voxel")
+
+    if normals is not None and offset:
+        cluster_normals = get_cluster_means(np.asarray(normals, dtype=float), labels, len(centers))
+        lengths = np.linalg.norm(cluster_normals, axis=-1, keepdims=True)
+        centers = centers + cluster_normals / np.where(lengths > 1e-12, lengths, 1.0) * offset
+
+    return centers, get_cluster_triangles(labels, triangles), labels
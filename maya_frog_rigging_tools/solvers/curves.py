@@ -0,0 +1,135 @@
+import numpy as np
+
+
+def get_full_knots(knots):
+    """Full knot vector from Maya's, which leaves out the first and last knot."""
+    knots = np.asarray(knots, dtype=float)
+    return np.concatenate([knots[:1], knots, knots[-1:]])
+
+
+def get_domain(knots, degree):
+    """Valid parameter range of a curve with a full knot vector."""
+    return knots[degree], knots[-degree - 1]
+
+
+def get_basis(knots, degree, params, derivative=0):
+    """B-spline basis functions or their derivatives, shape (params, cvs).
+
+    Cox-de Boor recursion vectorized over parameters, spans of zero length
+    drop out instead of dividing by zero.
+    """
+    knots = np.asarray(knots, dtype=float)
+    params = np.asarray(params, dtype=float)
+    if derivative > degree:
+        return np.zeros((len(params), len(knots) - degree - 1))
+    if derivative:
+        lower = get_basis(knots, degree - 1, params, derivative - 1)
+        left = _safe_divide(degree, knots[degree:-1] - knots[:-degree - 1])
+        right = _safe_divide(degree, knots[degree + 1:] - knots[1:-degree])
+        return lower[:, :-1] * left - lower[:, 1:] * right
+
+    # the last span with length owns the end parameter
+    last_span = np.flatnonzero(knots[1:] > knots[:-1])[-1]
+    span = np.searchsorted(knots, params, side="right") - 1
+    span = np.clip(np.where(params >= knots[last_span + 1], last_span, span), 0, len(knots) - 2)
+    basis = np.zeros((len(params), len(knots) - 1))
+    basis[np.arange(len(params)), span] = 1.0
+
+    for order in range(1, degree + 1):
+        left = _safe_divide(params[:, None] - knots[:-order - 1], knots[order:-1] - knots[:-order - 1])
+        right = _safe_divide(knots[order + 1:] - params[:, None], knots[order + 1:] - knots[1:-order])
+        basis = left * basis[:, :-1] + right * basis[:, 1:]
+    return basis
+
+
+def evaluate_curve(cvs, knots, degree, params, derivative=0):
+    """Positions or derivatives of a non rational B-spline at the parameters."""
+    return get_basis(knots, degree, params, derivative) @ np.asarray(cvs, dtype=float)
+
+
+def closest_params(points, cvs, knots, degree, periodic=False, samples_per_span=8, iterations=8, candidates=3):
+    """Parameters of the closest curve points for an (N, 3) array of points.
+
+    Samples the curve once and starts from the nearest samples of the best
+    few local distance minima, so points close to where a curve passes by
+    itself don't get stuck on the wrong part. Refines them with vectorized
+    Newton steps on (C(u) - P) . C'(u), each limited to one sample spacing and
+    halved until they get closer, and keeps the closest. Periodic curves
+    wrap around, open ones clamp to the domain.
+    """
+    points = np.asarray(points, dtype=float).reshape(-1, 3)
+    cvs = np.asarray(cvs, dtype=float)
+    knots = np.asarray(knots, dtype=float)
+    start, end = get_domain(knots, degree)
+    spans = np.unique(knots[degree:-degree])
+    sample_params = np.unique(np.concatenate([
+        np.linspace(span_start, span_end, samples_per_span + 1)
+        for span_start, span_end in zip(spans[:-1], spans[1:])
+    ]))
+    samples = evaluate_curve(cvs, knots, degree, sample_params)
+    nearest = get_nearest_minima(points, samples, candidates, periodic)
+    max_step = np.max(np.diff(sample_params))
+
+    count = nearest.shape[1]
+    points = np.repeat(points, count, axis=0)
+    params = sample_params[nearest.ravel()]
+    distances = np.sum((samples[nearest.ravel()] - points) ** 2, axis=-1)
+    damping = np.ones(len(params))
+
+    for iteration in range(iterations):
+        offset = evaluate_curve(cvs, knots, degree, params) - points
+        first = evaluate_curve(cvs, knots, degree, params, 1)
+        second = evaluate_curve(cvs, knots, degree, params, 2)
+        slope = np.sum(offset * first, axis=-1)
+        speed = np.sum(first * first, axis=-1)
+        curvature = speed + np.sum(offset * second, axis=-1)
+        # Gauss-Newton where the distance isn't convex yet
+        step = np.clip(_safe_divide(slope, np.where(curvature > 0, curvature, speed)), -max_step, max_step)
+        stepped = params - step * damping
+        if periodic:
+            stepped = start + np.mod(stepped - start, end - start)
+        else:
+            stepped = np.clip(stepped, start, end)
+
+        # only keep steps that get closer and halve the rejected ones, Newton may overshoot
+        stepped_distances = np.sum((evaluate_curve(cvs, knots, degree, stepped) - points) ** 2, axis=-1)
+        closer = stepped_distances < distances
+        params = np.where(closer, stepped, params)
+        distances = np.where(closer, stepped_distances, distances)
+        damping = np.where(closer, 1.0, damping * 0.5)
+
+    params = params.reshape(-1, count)
+    best = np.argmin(distances.reshape(-1, count), axis=-1)
+    return params[np.arange(len(params)), best]
+
+
+def get_nearest_minima(points, samples, count=3, periodic=False, chunk_size=4096):
+    """Sample indices of the closest local distance minima along the curve, shape (points, count).
+
+    Points with fewer minima repeat their closest one.
+    """
+    count = min(count, len(samples))
+    sample_norms = np.sum(samples * samples, axis=-1)
+    nearest = np.empty((len(points), count), dtype=np.int64)
+    for chunk_start in range(0, len(points), chunk_size):
+        chunk = points[chunk_start:chunk_start + chunk_size]
+        distances = sample_norms[None, :] - 2.0 * chunk @ samples.T
+        if periodic:
+            previous = np.roll(distances, 1, axis=-1)
+            following = np.roll(distances, -1, axis=-1)
+        else:
+            padding = np.full((len(chunk), 1), np.inf)
+            previous = np.concatenate([padding, distances[:, :-1]], axis=-1)
+            following = np.concatenate([distances[:, 1:], padding], axis=-1)
+        minima = np.where((distances <= previous) & (distances <= following), distances, np.inf)
+
+        order = np.argsort(minima, axis=-1)[:, :count]
+        found = np.isfinite(np.take_along_axis(minima, order, axis=-1))
+        nearest[chunk_start:chunk_start + chunk_size] = np.where(found, order, order[:, :1])
+    return nearest
+
+
+def _safe_divide(numerator, denominator):
+    denominator = np.asarray(denominator, dtype=float)
+    zero = denominator == 0
+    return np.where(zero, 0.0, np.asarray(numerator, dtype=float) / np.where(zero, 1.0, denominator))
@@ -0,0 +1,46 @@
+import numpy as np
+
+
+def get_ring_outputs(values, output_mins, inputs):
+    """remapValue outputs of the eye joints, each ramp goes from -value to value over the input."""
+    values, output_mins, inputs = (np.asarray(array, dtype=float) for array in (values, output_mins, inputs))
+    return output_mins * (1.0 - (2.0 * values * inputs - values))
+
+
+def get_ring_transforms(outputs):
+    """Translation along the eye axis and scale of the joints for remap outputs.
+
+    Outputs are rotations in half turns, the joints take the x and w component
+    of the matching quaternion so they trace rings on the unit sphere.
+    """
+    half_angles = np.asarray(outputs, dtype=float) * np.pi * 0.5
+    return np.sin(half_angles), np.maximum(np.cos(half_angles), 0.0)
+
+
+def solve_ring_joints(values, output_mins, pupil, iris=0.0, iris_joints=0, indices=None):
+    """Translation along the eye axis and scale of every ring joint, what frogEyeSolver computes.
+
+    Joints with an index below iris_joints follow the iris, the rest the pupil.
+    Indices default to the joint positions in values.
+    """
+    indices = np.arange(len(values)) if indices is None else np.asarray(indices)
+    inputs = np.where(indices < iris_joints, iris, pupil)
+    return get_ring_transforms(get_ring_outputs(values, output_mins, inputs))
+
+
+def get_loop_ids(coordinates, tolerance=1e-4):
+    """Group vertices into edge loops by their coordinate along the eye axis."""
+    rounded = np.round(np.asarray(coordinates, dtype=float) / tolerance).astype(np.int64)
+    loop_keys, loop_ids = np.unique(rounded, return_inverse=True)
+    return loop_ids.ravel(), loop_keys * tolerance
+
+
+def get_loop_weights(coordinates, joint_coordinates, tolerance=1e-4):
+    """Rigid weights giving every edge loop fully to the joint closest along the eye axis.
+
+    Coordinates are normalized to the eye radius, returns a (vertices, joints) array.
+    """
+    joint_coordinates = np.asarray(joint_coordinates, dtype=float)
+    loop_ids, loop_coordinates = get_loop_ids(coordinates, tolerance)
+    loop_joints = np.argmin(np.abs(loop_coordinates[:, None] - joint_coordinates[None, :]), axis=1)
+    return np.eye(len(joint_coordinates))[loop_joints[loop_ids]]
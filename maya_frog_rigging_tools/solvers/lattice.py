@@ -0,0 +1,43 @@
+import numpy as np
+
+
+def get_grid_positions(bounds, grid=(2, 3, 2)):
+    """World positions of a joint grid spanning a bounding box.
+
+    Bounds are (x_min, y_min, z_min, x_max, y_max, z_max), grid the joint count
+    along x, y and z. Joints are ordered by y level first, then x, then z, the
+    order BasicRig groups them in.
+    """
+    bounds = np.asarray(bounds, dtype=float)
+    x_values, y_values, z_values = (
+        np.linspace(bounds[axis], bounds[axis + 3], count) for axis, count in enumerate(grid)
+    )
+    y_grid, x_grid, z_grid = np.meshgrid(y_values, x_values, z_values, indexing="ij")
+    return np.stack([x_grid, y_grid, z_grid], axis=-1).reshape(-1, 3)
+
+
+def get_hat_weights(values, count):
+    """Linear interpolation weights of normalized values between count evenly spaced nodes."""
+    values = np.clip(np.asarray(values, dtype=float), 0.0, 1.0)
+    if count == 1:
+        return np.ones((len(values), 1))
+    nodes = np.arange(count)
+    return np.maximum(0.0, 1.0 - np.abs(values[:, None] * (count - 1) - nodes[None, :]))
+
+
+def solve_lattice_weights(points, bounds, grid=(2, 3, 2)):
+    """Trilinear weights of lattice points towards a joint grid, shape (points, joints).
+
+    Every point is weighted to the eight joints of the grid cell it lies in, rows
+    sum up to one and the joint order matches get_grid_positions.
+    """
+    points = np.asarray(points, dtype=float)
+    bounds = np.asarray(bounds, dtype=float)
+    size = bounds[3:] - bounds[:3]
+    normalized = (points - bounds[:3]) / np.where(size > 1e-12, size, 1.0)
+
+    x_weights, y_weights, z_weights = (
+        get_hat_weights(normalized[:, axis], count) for axis, count in enumerate(grid)
+    )
+    weights = np.einsum("py,px,pz->pyxz", y_weights, x_weights, z_weights)
+    return weights.reshape(len(points), -1)
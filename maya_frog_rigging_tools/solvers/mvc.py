@@ -0,0 +1,84 @@
+import numpy as np
+
+EPSILON = 1e-8
+# arcsin loses precision close to 1, points on a triangle edge land around 1e-8 below pi
+PLANAR_EPSILON = 1e-6
+
+
+def mean_value_coordinates(points, cage_points, cage_triangles, chunk_size=None):
+    """Mean value coordinates of points towards a closed triangle cage, shape (points, cage points).
+
+    Implements Ju, Schaefer and Warren 2005 vectorized over points and
+    triangles. Points on a cage vertex or triangle get interpolating weights,
+    every row sums up to one so weights @ cage_points reproduces the points.
+    """
+    points = np.asarray(points, dtype=float)
+    cage_points = np.asarray(cage_points, dtype=float)
+    cage_triangles = np.asarray(cage_triangles, dtype=np.int64)
+    # one hot corner matrices scatter triangle contributions back to cage points
+    corners = [np.eye(len(cage_points))[cage_triangles[:, corner]] for corner in range(3)]
+    chunk_size = chunk_size or max(1, 2 ** 21 // max(len(cage_triangles), 1))
+
+    weights = np.empty((len(points), len(cage_points)))
+    for start in range(0, len(points), chunk_size):
+        weights[start:start + chunk_size] = _chunk_coordinates(
+            points[start:start + chunk_size], cage_points, cage_triangles, corners
+        )
+    return weights
+
+
+def _chunk_coordinates(points, cage_points, cage_triangles, corners):
+    offsets = cage_points[None, :, :] - points[:, None, :]
+    distances = np.linalg.norm(offsets, axis=-1)
+    on_vertex = distances < EPSILON
+    units = offsets / np.where(on_vertex, 1.0, distances)[..., None]
+
+    # (points, triangles, 3 corners) values
+    tri_units = units[:, cage_triangles]
+    tri_distances = distances[:, cage_triangles]
+    lengths = np.linalg.norm(np.roll(tri_units, -1, axis=2) - np.roll(tri_units, 1, axis=2), axis=-1)
+    thetas = 2.0 * np.arcsin(np.clip(lengths * 0.5, -1.0, 1.0))
+    half = thetas.sum(axis=-1) * 0.5
+
+    on_triangle = np.pi - half < PLANAR_EPSILON
+    sin_thetas = np.sin(thetas)
+    sin_next, sin_previous = np.roll(sin_thetas, -1, axis=2), np.roll(sin_thetas, 1, axis=2)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cosines = (
+            2.0 * np.sin(half)[..., None] * np.sin(half[..., None] - thetas) / (sin_next * sin_previous) - 1.0
+        )
+        cosines = np.clip(np.nan_to_num(cosines, nan=1.0), -1.0, 1.0)
+        signs = np.sign(np.linalg.det(tri_units))[..., None]
+        sines = signs * np.sqrt(1.0 - cosines ** 2)
+
+        cos_next, cos_previous = np.roll(cosines, -1, axis=2), np.roll(cosines, 1, axis=2)
+        theta_next, theta_previous = np.roll(thetas, -1, axis=2), np.roll(thetas, 1, axis=2)
+        sines_previous = np.roll(sines, 1, axis=2)
+        contributions = (thetas - cos_next * theta_previous - cos_previous * theta_next) / (
+            tri_distances * sin_next * sines_previous
+        )
+    # points in the plane of a triangle but outside of it get nothing from that triangle
+    skipped = np.any(np.abs(sines) <= EPSILON, axis=-1, keepdims=True)
+    contributions = np.where(skipped | ~np.isfinite(contributions), 0.0, contributions)
+
+    weights = sum(contributions[..., corner] @ corners[corner] for corner in range(3))
+
+    for row in np.nonzero(on_triangle.any(axis=1) & ~on_vertex.any(axis=1))[0]:
+        triangle = np.argmax(on_triangle[row])
+        # barycentric weights from the opposite angles and distances
+        face_weights = sin_thetas[row, triangle] * np.roll(tri_distances[row, triangle], -1) * np.roll(
+            tri_distances[row, triangle], 1
+        )
+        weights[row] = 0.0
+        weights[row, cage_triangles[triangle]] = face_weights
+
+    for row, vertex in zip(*np.nonzero(on_vertex)):
+        weights[row] = 0.0
+        weights[row, vertex] = 1.0
+
+    totals = weights.sum(axis=1, keepdims=True)
+    return weights / np.where(np.abs(totals) > EPSILON, totals, 1.0)
+
+
+def deform_points(weights, cage_points):
+    return np.asarray(weights) @ np.asarray(cage_points, dtype=float)
@@ -0,0 +1,66 @@
+import numpy as np
+
+
+def get_pole_directions(chains, tolerance=1e-6):
+    """Unit directions from the middle joint towards the pole for (N, 3, 3) chains.
+
+    Returns the directions and a mask of chains that have an angle at the middle
+    joint, directions of collinear chains are zero.
+    """
+    chains = np.asarray(chains, dtype=float)
+    upper, middle, lower = chains[:, 0], chains[:, 1], chains[:, 2]
+
+    norm_upper = _normalize(upper - middle) + middle
+    norm_lower = _normalize(lower - middle) + middle
+    line = norm_lower - norm_upper
+    line_length = np.sum(line * line, axis=-1)
+    projection = np.sum((middle - norm_upper) * line, axis=-1) / np.where(line_length > tolerance, line_length, 1.0)
+    mid_pointer = middle - (norm_upper + projection[:, None] * line)
+
+    valid = np.linalg.norm(mid_pointer, axis=-1) > tolerance
+    return np.where(valid[:, None], _normalize(mid_pointer), 0.0), valid
+
+
+def solve_pole_positions(chains, pole_distance=1, up_vector=(0, 0, 1), propagate=True, tolerance=1e-6):
+    """Pole vector positions for (N, 3, 3) arrays of upper, middle and lower positions.
+
+    Follows calculate_pole_vector_position for bent chains. Straight chains reuse
+    the direction of the last bent chain before them when propagate is set (for
+    frame samples), otherwise the up vector made perpendicular to the chain.
+    """
+    chains = np.asarray(chains, dtype=float)
+    upper, middle, lower = chains[:, 0], chains[:, 1], chains[:, 2]
+    upper_length = np.linalg.norm(middle - upper, axis=-1)
+    lower_length = np.linalg.norm(lower - middle, axis=-1)
+    distance = (upper_length + lower_length) * 0.5 * pole_distance
+
+    directions, valid = get_pole_directions(chains, tolerance)
+    if valid.all():
+        return directions * distance[:, None] + middle
+
+    chain_axis = _normalize(lower - upper)
+    fallback = np.broadcast_to(np.asarray(up_vector, dtype=float), directions.shape)
+
+    if propagate:
+        previous = np.maximum.accumulate(np.where(valid, np.arange(len(valid)), -1))
+        has_previous = ~valid & (previous >= 0)
+        fallback = np.where(has_previous[:, None], directions[np.maximum(previous, 0)], fallback)
+
+    fallback = _make_perpendicular(fallback, chain_axis, tolerance)
+    directions = np.where(valid[:, None], directions, fallback)
+    return directions * distance[:, None] + middle
+
+
+def _make_perpendicular(vectors, axis, tolerance):
+    perpendicular = vectors - np.sum(vectors * axis, axis=-1, keepdims=True) * axis
+    degenerate = np.linalg.norm(perpendicular, axis=-1) <= tolerance
+    if degenerate.any():
+        # vector is parallel to the chain, any direction around the chain is as good as another
+        helper = np.where(np.abs(axis[:, :1]) < 0.9, [[1.0, 0.0, 0.0]], [[0.0, 1.0, 0.0]])
+        perpendicular = np.where(degenerate[:, None], np.cross(axis, helper), perpendicular)
+    return _normalize(perpendicular)
+
+
+def _normalize(vectors):
+    lengths = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.where(lengths > 1e-12, lengths, 1.0)
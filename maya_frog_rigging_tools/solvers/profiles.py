@@ -0,0 +1,113 @@
+"""Named falloff curves mapping [0, 1] onto [0, 1].
+
+A profile is a name or a tuple of name and parameters:
+
+    "linear"
+    ("sigmoid", steepness, center)
+    ("bezier", x1, y1, x2, y2)      css style cubic bezier from (0, 0) to (1, 1)
+    ("lut", (0.0, 0.2, ..., 1.0))   evenly spaced samples, linearly interpolated
+"""
+from functools import lru_cache
+
+import numpy as np
+
+DEFAULT_PARAMETERS = {
+    "linear": (),
+    "sigmoid": (11.7, 0.5),
+    "bezier": (0.42, 0.0, 0.58, 1.0),
+    "lut": ((0.0, 1.0),),
+}
+
+
+def normalize_profile(profile):
+    """Hashable (name, parameters) form of a profile with defaults filled in."""
+    if isinstance(profile, str):
+        name, parameters = profile, ()
+    else:
+        name, parameters = profile[0], tuple(profile[1:])
+
+    if name not in DEFAULT_PARAMETERS:
+        raise ValueError(f"Unknown profile {name}, please use one of {list(DEFAULT_PARAMETERS)}")
+
+    defaults = DEFAULT_PARAMETERS[name]
+    parameters = parameters + defaults[len(parameters):]
+    if name == "lut":
+        parameters = (tuple(float(value) for value in parameters[0]),)
+        if len(parameters[0]) < 2:
+            raise ValueError("Lookup table profiles need at least two samples")
+    else:
+        parameters = tuple(float(value) for value in parameters)
+    return (name,) + parameters
+
+
+def evaluate_profile(profile, values):
+    """Evaluate a profile for an array of values in [0, 1]."""
+    name, *parameters = normalize_profile(profile)
+    values = np.clip(np.asarray(values, dtype=float), 0.0, 1.0)
+    return PROFILE_FUNCTIONS[name](values, *parameters)
+
+
+def get_profile_values(profile, length):
+    """Profile sampled at length evenly spaced points, cached per profile and length."""
+    return np.array(_sample_profile(normalize_profile(profile), length))
+
+
+@lru_cache(maxsize=None)
+def _sample_profile(profile, length):
+    samples = evaluate_profile(profile, np.linspace(0.0, 1.0, length))
+    # ends are pinned so ramps always start closed and end fully open
+    samples[0] = 0.0
+    samples[-1] = 1.0
+    return tuple(samples.tolist())
+
+
+def get_edge_index(profile, length, threshold):
+    """Index of the first sample of a profile that reaches a threshold."""
+    return int(np.searchsorted(get_profile_values(profile, length), threshold))
+
+
+def _linear(values):
+    return values
+
+
+def _sigmoid(values, steepness, center):
+    def curve(x):
+        return 1.0 / (1.0 + np.exp(-steepness * (x - center)))
+
+    start, end = curve(0.0), curve(1.0)
+    return (curve(values) - start) / (end - start)
+
+
+def _bezier(values, x1, y1, x2, y2, iterations=24):
+    def component(t, p1, p2):
+        return 3.0 * (1.0 - t) ** 2 * t * p1 + 3.0 * (1.0 - t) * t ** 2 * p2 + t ** 3
+
+    def derivative(t, p1, p2):
+        return 3.0 * (1.0 - t) ** 2 * p1 + 6.0 * (1.0 - t) * t * (p2 - p1) + 3.0 * t ** 2 * (1.0 - p2)
+
+    # solve x(t) = value with Newton steps, bisection takes over where the slope vanishes
+    params = values.copy()
+    low, high = np.zeros_like(values), np.ones_like(values)
+    for _ in range(iterations):
+        error = component(params, x1, x2) - values
+        low = np.where(error < 0.0, params, low)
+        high = np.where(error > 0.0, params, high)
+        slope = derivative(params, x1, x2)
+        newton = params - error / np.where(np.abs(slope) > 1e-6, slope, np.inf)
+        inside = (newton >= low) & (newton <= high) & (np.abs(slope) > 1e-6)
+        # exact solutions like the ends would be bisected away otherwise
+        params = np.where(error == 0.0, params, np.where(inside, newton, (low + high) * 0.5))
+    return component(params, y1, y2)
+
+
+def _lut(values, samples):
+    samples = np.asarray(samples, dtype=float)
+    return np.interp(values, np.linspace(0.0, 1.0, len(samples)), samples)
+
+
+PROFILE_FUNCTIONS = {
+    "linear": _linear,
+    "sigmoid": _sigmoid,
+    "bezier": _bezier,
+    "lut": _lut,
+}
@@ -0,0 +1,55 @@
+import numpy as np
+
+
+def solve_stretch(
+        start,
+        middle,
+        end,
+        root,
+        handle,
+        pole,
+        max_stretch=1.5,
+        max_squash=0.0,
+        pole_lock=0.0,
+        pole_space=0.5
+):
+    """Reference of the LimbSetup stretch network for arrays of world positions.
+
+    Positions are (..., 3) arrays, settings broadcast against them. Returns the
+    upper scale, lower scale, pole start weight and pole end weight exactly as
+    the distanceBetween/condition/blendColors network computes them.
+    """
+    start, middle, end, root, handle, pole = (
+        np.asarray(position, dtype=float) for position in (start, middle, end, root, handle, pole)
+    )
+    max_stretch, max_squash, pole_lock, pole_space = (
+        np.asarray(value, dtype=float) for value in (max_stretch, max_squash, pole_lock, pole_space)
+    )
+
+    upper_length = np.linalg.norm(middle - start, axis=-1)
+    lower_length = np.linalg.norm(end - middle, axis=-1)
+    base_length = upper_length + lower_length
+    stretch_length = np.linalg.norm(handle - start, axis=-1)
+
+    squash_limit = 1.0 - max_squash
+    stretch_scale = np.where(
+        stretch_length > squash_limit * base_length,
+        _safe_divide(stretch_length, base_length),
+        squash_limit
+    )
+    stretch_scale = np.where(max_stretch > stretch_scale, stretch_scale, max_stretch)
+
+    lock_upper_scale = _safe_divide(np.linalg.norm(pole - root, axis=-1), upper_length)
+    lock_lower_scale = _safe_divide(np.linalg.norm(pole - handle, axis=-1), lower_length)
+
+    upper_scale = pole_lock * lock_upper_scale + (1.0 - pole_lock) * stretch_scale
+    lower_scale = pole_lock * lock_lower_scale + (1.0 - pole_lock) * stretch_scale
+
+    pole_weight = 1.0 - pole_lock
+    return upper_scale, lower_scale, pole_weight * (1.0 - pole_space), pole_weight * pole_space
+
+
+def _safe_divide(numerator, denominator, epsilon=1e-8):
+    denominator = np.asarray(denominator, dtype=float)
+    safe = np.abs(denominator) > epsilon
+    return np.where(safe, numerator / np.where(safe, denominator, 1.0), 1.0)
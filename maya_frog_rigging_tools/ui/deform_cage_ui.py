@@ -1,13 +1,15 @@
-from pymel import core as pm
 import maya.cmds as cmds
-from functools import partial
-from maya.api import OpenMaya as om2
 
+from maya_frog_rigging_tools import cage_build
 from maya_frog_rigging_tools import deformation_cage
+from maya_frog_rigging_tools._lazy import lazy_import
+
+pm = lazy_import("pymel.core")
 
 class CreateUI():
     def __init__(self):
         windowID = "myWindowID"
+        self.build = None
 
         if cmds.window(windowID, exists=True):
             cmds.deleteUI(windowID)
@@ -18,20 +20,64 @@ class CreateUI():
         cmds.rowColumnLayout(parent=master_window, numberOfColumns=1)
       
         def apply_close(*args):
-            apply()
-            close()
+            apply(close_after=True)
 
-        def apply(*args):
+        def apply(*args, close_after=False):
+            if self.build and self.build.running:
+                return
             cage_obj = cmds.textField("cage_obj", query=True, text=True)
-            bind_nodes = cmds.textField("bind_nodes", query=True, text=True).split(',')
+            bind_nodes = get_bind_nodes()
             ctl_size = cmds.intSliderGrp("ctl_size", query=True, v=True)
             smooth_iter = cmds.intSliderGrp("smooth_iter", query=True, v=True)
-            deformation_cage.create(
-                cage_obj, bind_nodes, ctl_size=ctl_size, smooth_iterations=smooth_iter
+            deformer = cmds.optionMenuGrp("cage_deformer", query=True, value=True)
+            vertex_count = cmds.polyEvaluate(cage_obj, vertex=True)
+            cmds.progressBar("cage_progress", edit=True, progress=0, maxValue=max(vertex_count, 1))
+
+            def on_progress(stage, done, total):
+                if cmds.progressBar("cage_progress", exists=True):
+                    cmds.progressBar("cage_progress", edit=True, progress=done, maxValue=max(total, 1))
+                    cmds.text(
+                        "cage_status", edit=True, label=f"Building {stage}: {done} / {total}, please don't undo yet"
+                    )
+
+            def on_finish(cage_ctl_group):
+                if not cmds.window(windowID, exists=True):
+                    return
+                if cage_ctl_group:
+                    label = f"Built {cage_ctl_group}, a single undo removes the whole cage"
+                else:
+                    label = "Cancelled, cage removed"
+                cmds.text("cage_status", edit=True, label=label)
+                if cage_ctl_group and close_after:
+                    close()
+
+            self.build = cage_build.ChunkedCageBuild(
+                cage_obj, bind_nodes, ctl_size=ctl_size, smooth_iterations=smooth_iter, deformer=deformer,
+                on_progress=on_progress, on_finish=on_finish
             )
+            self.build.start()
+
+        def cancel(*args):
+            if self.build and self.build.running:
+                self.build.cancel()
+                cmds.text("cage_status", edit=True, label="Cancelling...")
 
         def close(*args):
+            cancel()
             cmds.deleteUI(windowID)
+
+        def get_bind_nodes():
+            bind_nodes = cmds.textField("bind_nodes", query=True, text=True).split(',')
+            return [node.strip() for node in bind_nodes if node.strip()]
+
+        def update_estimate(*args):
+            cage_obj = cmds.textField("cage_obj", query=True, text=True)
+            if not cage_obj or not cmds.objExists(cage_obj):
+                cmds.text("cage_estimate", edit=True, label="Estimate: no cage object")
+                return
+            deformer = cmds.optionMenuGrp("cage_deformer", query=True, value=True)
+            nodes, seconds = cage_build.estimate_cage_build(cage_obj, len(get_bind_nodes()), deformer)
+            cmds.text("cage_estimate", edit=True, label=f"Estimate: ~{nodes} nodes, ~{seconds:.0f}s")
   
         cmds.separator(h=20, style="none")           
         cmds.columnLayout()
@@ -44,7 +90,7 @@ class CreateUI():
             cage = ""
             nodes = ""
 
-        self.cage_obj = cmds.textField("cage_obj", width=240, text=f"{cage}")
+        self.cage_obj = cmds.textField("cage_obj", width=240, text=f"{cage}", changeCommand=update_estimate)
         cmds.setParent("..")
         cmds.separator(h=20, style="none")
         
@@ -54,23 +100,35 @@ class CreateUI():
         self.smooth_iter = cmds.intSliderGrp(
             "smooth_iter", label="Smoothing Iterations ", field=True, min=1, max=10, value=2, width=350
         )
+        self.cage_deformer = cmds.optionMenuGrp(
+            "cage_deformer", label="Deformer: ", width=350, changeCommand=update_estimate
+        )
+        for deformer in deformation_cage.CAGE_DEFORMERS:
+            cmds.menuItem(label=deformer)
         cmds.separator(h=20, style="none")
          
         cmds.columnLayout()
         cmds.rowLayout(numberOfColumns=2, width=500)
         cmds.text(label="Bind Objects: ",  align='right', width=100)
         nodes_str = str(nodes).replace("[", "").replace("]", "").replace("'", "")
-        self.bind_nodes = cmds.textField("bind_nodes", width=240, text=f"{nodes_str}")
+        self.bind_nodes = cmds.textField("bind_nodes", width=240, text=f"{nodes_str}", changeCommand=update_estimate)
         cmds.setParent("..")
 
+        cmds.separator(h=10, style="none")
+        cmds.text("cage_estimate", label="Estimate: ", align="left", width=375)
+        cmds.progressBar("cage_progress", width=375)
+        cmds.text("cage_status", label="", align="left", width=375)
+
         cmds.separator(h=20, style="none")            
         cmds.columnLayout()
-        cmds.rowLayout(numberOfColumns=3, width=500)
-        cmds.button(label="Apply and Close", command=apply_close, width=125, height=28)
-        cmds.button(label="Apply", command=apply, width=125, height=28)
-        cmds.button(label="Close", command=close, width=125, height=28)
+        cmds.rowLayout(numberOfColumns=4, width=500)
+        cmds.button(label="Apply and Close", command=apply_close, width=94, height=28)
+        cmds.button(label="Apply", command=apply, width=94, height=28)
+        cmds.button(label="Cancel", command=cancel, width=94, height=28)
+        cmds.button(label="Close", command=close, width=94, height=28)
         cmds.setParent("..")
 
+        update_estimate()
         cmds.showWindow(windowID)
 
 
@@ -1,6 +1,12 @@
 from pathlib import Path
 import logging
-from pymel import core as pm
+from contextlib import contextmanager
+from maya import cmds
+from maya.api import OpenMaya as om2
+
+from maya_frog_rigging_tools._lazy import lazy_import
+
+pm = lazy_import("pymel.core")
 
 LOGGER = logging.getLogger("Rigging Utils")
 
@@ -43,3 +49,31 @@ def match_transforms(source_obj, target_obj, **kwargs):
     LOGGER.info(f"Matching transforms of {source_obj} to {target_obj}")
     constraint = pm.parentConstraint(source_obj, target_obj, **kwargs)
     pm.delete(constraint)
+
+
+@contextmanager
+def batch_build(chunk_name="frog_build"):
+    """Run a build as one undo chunk with viewport refresh suspended."""
+    interactive = om2.MGlobal.mayaState() == om2.MGlobal.kInteractive
+    cmds.undoInfo(openChunk=True, chunkName=chunk_name)
+    if interactive:
+        cmds.refresh(suspend=True)
+    try:
+        yield
+    finally:
+        if interactive:
+            cmds.refresh(suspend=False)
+        cmds.undoInfo(closeChunk=True)
+
+
+@contextmanager
+def record_nodes():
+    """Collect an MObjectHandle of every node created inside the block into the yielded list."""
+    handles = []
+    callback_id = om2.MDGMessage.addNodeAddedCallback(
+        lambda node, *args: handles.append(om2.MObjectHandle(node)), "dependNode"
+    )
+    try:
+        yield handles
+    finally:
+        om2.MMessage.removeCallback(callback_id)
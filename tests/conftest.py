@@ -0,0 +1,5 @@
+"""The solver tests run without Maya, only the repository root has to be importable."""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,97 @@
+"""The build benchmarks as tests, against the mock Maya layer in benchmarks.
+
+Uses the benchmark fixture of pytest-benchmark when it is installed, every
+case runs once per size since the scaling checks need all sizes anyway.
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+
+import build_benchmarks  # noqa: E402
+
+try:
+    import pytest_benchmark  # noqa: F401
+except ImportError:
+    pytest_benchmark = None
+
+SIZES = (1, 2, 4)
+# elements per size of the deliberately quadratic case, the largest size takes about a second
+EDGE_COUNT = 2500
+
+
+@pytest.fixture
+def run_once(request):
+    """Call a function once, measured by pytest-benchmark when it is available."""
+    if pytest_benchmark is None:
+        return lambda func, *args: func(*args)
+    benchmark = request.getfixturevalue("benchmark")
+    return lambda func, *args: benchmark.pedantic(func, args=args, rounds=1, iterations=1)
+
+
+def build_quadratic_edges(size):
+    """Deduplicate an edge list with list lookups, pure Python time without any nodes."""
+    edges = []
+    for index in range(EDGE_COUNT * size):
+        edge = (index, index + 1)
+        if edge not in edges:
+            edges.append(edge)
+    return len(edges)
+
+
+def build_linear_edges(size):
+    edges = set()
+    for index in range(EDGE_COUNT * size):
+        edges.add((index, index + 1))
+    return len(edges)
+
+
+def run_sizes(build, repeats=build_benchmarks.DEFAULT_REPEATS):
+    return {str(size): build_benchmarks.run_repeated(build, size, repeats) for size in SIZES}
+
+
+@pytest.mark.parametrize("name", sorted(build_benchmarks.CASES))
+def test_case_scaling(run_once, name):
+    results = run_once(build_benchmarks.run_cases, [name], SIZES)
+    time_failures, _ = build_benchmarks.check_time_scaling(results)
+    assert build_benchmarks.check_scaling(results) + time_failures == []
+
+
+def test_quadratic_time_fails():
+    results = {"quadratic": run_sizes(build_quadratic_edges)}
+    assert build_benchmarks.check_scaling(results) == []
+    time_failures, _ = build_benchmarks.check_time_scaling(results)
+    assert [failure.split(" time")[0] for failure in time_failures] == ["quadratic"]
+
+
+def test_linear_time_passes():
+    results = {"linear": run_sizes(build_linear_edges)}
+    assert build_benchmarks.check_time_scaling(results)[0] == []
+
+
+def make_result(elements, duration, stages):
+    return {
+        "elements": elements, "duration": duration, "commands": elements, "nodes": elements,
+        "connections": elements, "stages": {name: {"duration": value} for name, value in stages.items()},
+    }
+
+
+def test_short_stages_are_not_timed():
+    # a stage growing with exponent 2.45 but far below the timing floor, like noisy small stages do
+    results = {"case": {
+        str(size): make_result(10 * size, 0.6 * size, {"small": 0.001 * size ** 2.45, "main": 0.5 * size})
+        for size in SIZES
+    }}
+    assert build_benchmarks.check_time_scaling(results) == ([], [])
+
+
+def test_time_warning_and_failure():
+    results = {
+        "warned": {str(size): make_result(10 * size, 0.2 * size ** 1.6, {}) for size in SIZES},
+        "failed": {str(size): make_result(10 * size, 0.1 * size ** 2, {}) for size in SIZES},
+    }
+    failures, warnings = build_benchmarks.check_time_scaling(results)
+    assert [message.split(" ")[0] for message in failures] == ["failed"]
+    assert [message.split(" ")[0] for message in warnings] == ["warned"]
@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from maya_frog_rigging_tools.solvers.clustering import decimate, get_cluster_triangles, remove_non_manifold
+
+
+def create_sphere(rings=32, segments=32):
+    """UV sphere points and triangles with outward winding."""
+    theta = np.pi * np.arange(1, rings) / rings
+    phi = 2 * np.pi * np.arange(segments) / segments
+    ring_points = np.stack([
+        np.outer(np.sin(theta), np.cos(phi)),
+        np.outer(np.sin(theta), np.sin(phi)),
+        np.outer(np.cos(theta), np.ones(segments)),
+    ], axis=-1).reshape(-1, 3)
+    points = np.concatenate([[[0, 0, 1]], ring_points, [[0, 0, -1]]])
+
+    bottom = len(points) - 1
+    triangles = []
+    for segment in range(segments):
+        following = (segment + 1) % segments
+        triangles.append([0, 1 + segment, 1 + following])
+        triangles.append([bottom, 1 + (rings - 2) * segments + following, 1 + (rings - 2) * segments + segment])
+        for ring in range(rings - 2):
+            a, b = 1 + ring * segments + segment, 1 + ring * segments + following
+            triangles += [[a, a + segments, b + segments], [a, b + segments, b]]
+    return points, np.array(triangles)
+
+
+def get_edge_counts(triangles):
+    edges = np.sort(np.concatenate([triangles[:, [0, 1]], triangles[:, [1, 2]], triangles[:, [2, 0]]]), axis=1)
+    return np.unique(edges, axis=0, return_counts=True)[1]
+
+
+@pytest.mark.parametrize("method", ["voxel", "kmeans"])
+@pytest.mark.parametrize("count", [20, 40, 80])
+def test_decimate_is_edge_manifold(method, count):
+    points, triangles = create_sphere()
+    cage_points, cage_triangles, labels = decimate(points, triangles, count, method=method)
+    assert len(labels) == len(points)
+    assert cage_triangles.max() < len(cage_points)
+    assert get_edge_counts(cage_triangles).max() <= 2
+
+
+def test_collapsed_and_duplicate_triangles():
+    labels = np.array([0, 0, 1, 2, 1])
+    # the first triangle collapses, the last two map to the same cluster triangle
+    assert get_cluster_triangles(labels, [[0, 1, 2], [0, 2, 3], [1, 4, 3]]).tolist() == [[0, 1, 2]]
+
+
+def test_remove_non_manifold():
+    # a fan of three triangles on the edge 0 1, the third one is dropped
+    triangles = [[0, 1, 2], [1, 0, 3], [1, 0, 4]]
+    assert remove_non_manifold(triangles).tolist() == [0, 1]
+    # priority decides which triangle is kept on the edge
+    assert remove_non_manifold(triangles, priority=[2, 1, 0]).tolist() == [0, 2]
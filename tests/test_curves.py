@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+
+from maya_frog_rigging_tools.solvers.curves import closest_params, evaluate_curve, get_domain, get_full_knots
+
+# degree 2 bezier of the parabola y = x * x for x in [-1, 1], x = 2u - 1
+PARABOLA_CVS = [[-1, 1, 0], [0, -1, 0], [1, 1, 0]]
+PARABOLA_KNOTS = get_full_knots([0, 0, 1, 1])
+
+
+def create_periodic_curve(count=8, degree=3):
+    """Uniform periodic curve around a regular polygon like Maya builds closed circles."""
+    angles = 2 * np.pi * np.arange(count) / count
+    cvs = np.stack([np.cos(angles), np.sin(angles), np.zeros(count)], axis=-1)
+    cvs = np.concatenate([cvs, cvs[:degree]])
+    knots = get_full_knots(np.arange(-degree + 1, count + degree, dtype=float))
+    return cvs, knots, degree
+
+
+def brute_force_params(points, cvs, knots, degree, samples=200001):
+    params = np.linspace(*get_domain(knots, degree), samples)
+    curve_points = evaluate_curve(cvs, knots, degree, params)
+    distances = np.linalg.norm(curve_points[None, :, :] - np.asarray(points)[:, None, :], axis=-1)
+    return params[np.argmin(distances, axis=-1)]
+
+
+def test_parabola():
+    points = [[0, -1, 0], [0.5, 0.25, 0], [2, 4, 0], [-3, 0, 0]]
+    # the vertex, a point on the curve and two points past the ends
+    expected = [0.5, 0.75, 1.0, 0.0]
+    assert closest_params(points, PARABOLA_CVS, PARABOLA_KNOTS, 2) == pytest.approx(expected, abs=1e-6)
+
+
+def test_open_cubic_matches_brute_force():
+    rng = np.random.default_rng(0)
+    cvs = rng.uniform(-2, 2, (7, 3))
+    knots = get_full_knots([0, 0, 0, 1, 2, 3, 4, 4, 4])
+    points = rng.uniform(-3, 3, (40, 3))
+    params = closest_params(points, cvs, knots, 3)
+    expected = brute_force_params(points, cvs, knots, 3)
+
+    # compare distances, points with two equally close curve points may pick either
+    distances = np.linalg.norm(evaluate_curve(cvs, knots, 3, params) - points, axis=-1)
+    expected_distances = np.linalg.norm(evaluate_curve(cvs, knots, 3, expected) - points, axis=-1)
+    assert distances == pytest.approx(expected_distances, abs=1e-6)
+
+
+def test_periodic_symmetry():
+    # radial points on the symmetry axes through knots and span centers project back onto them
+    cvs, knots, degree = create_periodic_curve()
+    params = np.arange(0.5, 8, 0.5)
+    points = evaluate_curve(cvs, knots, degree, params) * 2.0
+    assert closest_params(points, cvs, knots, degree, periodic=True) == pytest.approx(params, abs=1e-6)
+
+
+def test_periodic_wrap():
+    cvs, knots, degree = create_periodic_curve()
+    start, end = get_domain(knots, degree)
+    period = end - start
+    params = np.array([start, start + 0.5, end - 0.5])
+    points = evaluate_curve(cvs, knots, degree, params) * 1.5
+    result = closest_params(points, cvs, knots, degree, periodic=True)
+
+    assert np.all((result >= start) & (result <= end))
+    # the seam is the same point from both sides
+    wrapped = np.minimum(np.abs(result - params), period - np.abs(result - params))
+    assert wrapped == pytest.approx([0.0, 0.0, 0.0], abs=1e-6)
+
+
+def test_periodic_seam_matches_brute_force():
+    cvs, knots, degree = create_periodic_curve()
+    start, end = get_domain(knots, degree)
+    params = np.array([start + 0.05, start + 0.2, end - 0.05, end - 0.2])
+    points = evaluate_curve(cvs, knots, degree, params) * np.array([[1.3], [0.7], [1.3], [0.7]])
+    result = closest_params(points, cvs, knots, degree, periodic=True)
+    assert result == pytest.approx(brute_force_params(points, cvs, knots, degree), abs=1e-4)
@@ -0,0 +1,94 @@
+import numpy as np
+import pytest
+
+from maya_frog_rigging_tools.solvers.eye import (
+    get_loop_ids, get_loop_weights, get_ring_outputs, get_ring_transforms, solve_ring_joints,
+)
+
+# ring joint values and remap output minimums of a five joint eye
+VALUES = np.array([0.0, 0.25, 0.5, 0.75, 1.0])
+OUTPUT_MINS = np.linspace(0.0, 1.0, 5)
+
+
+def get_uv_sphere(rings=8, segments=12):
+    """Vertex x coordinates of a polySphere along x, the poles and rings - 1 loops of segments vertices."""
+    angles = np.linspace(0.0, np.pi, rings + 1)[1:-1]
+    loops = np.repeat(np.cos(angles), segments)
+    return np.concatenate([[1.0], loops, [-1.0]])
+
+
+def test_loop_ids():
+    coordinates = get_uv_sphere()
+    # noise below the tolerance keeps every loop together
+    noisy = coordinates + np.random.default_rng(0).uniform(-1e-6, 1e-6, len(coordinates))
+    loop_ids, loop_coordinates = get_loop_ids(noisy)
+
+    assert len(loop_coordinates) == 9
+    assert loop_coordinates == pytest.approx(np.sort(np.cos(np.linspace(0.0, np.pi, 9))), abs=1e-4)
+    assert loop_ids[0] == 8 and loop_ids[-1] == 0
+    assert np.bincount(loop_ids).tolist() == [1] + [12] * 7 + [1]
+
+
+def test_loop_weights():
+    coordinates = get_uv_sphere()
+    joint_coordinates = [-1.0, 0.0, 1.0]
+    weights = get_loop_weights(coordinates, joint_coordinates)
+
+    assert weights.shape == (len(coordinates), 3)
+    assert weights.sum(axis=1) == pytest.approx(np.ones(len(coordinates)))
+    # every loop goes fully to the joint closest along the axis
+    closest = np.argmin(np.abs(coordinates[:, None] - np.array(joint_coordinates)[None, :]), axis=1)
+    assert weights.argmax(axis=1).tolist() == closest.tolist()
+    assert set(np.unique(weights)) == {0.0, 1.0}
+
+
+def test_ring_outputs_closed_and_open():
+    # pupil 0 pushes every ring to outputMin * (1 + value), pupil 1 pulls it to outputMin * (1 - value)
+    assert get_ring_outputs(VALUES, OUTPUT_MINS, 0.0) == pytest.approx(OUTPUT_MINS * (1.0 + VALUES))
+    assert get_ring_outputs(VALUES, OUTPUT_MINS, 1.0) == pytest.approx(OUTPUT_MINS * (1.0 - VALUES))
+    # halfway the rings sit on their layout
+    assert get_ring_outputs(VALUES, OUTPUT_MINS, 0.5) == pytest.approx(OUTPUT_MINS)
+
+
+def test_ring_transforms():
+    translations, scales = get_ring_transforms([0.0, 0.5, 1.0, 1.5])
+    assert translations == pytest.approx([0.0, np.sqrt(0.5), 1.0, np.sqrt(0.5)])
+    # rings past the front of the eye collapse instead of flipping
+    assert scales == pytest.approx([1.0, np.sqrt(0.5), 0.0, 0.0])
+    # the joints stay on the unit sphere while the scale is positive
+    assert translations[:3] ** 2 + scales[:3] ** 2 == pytest.approx(np.ones(3))
+
+
+def solve_ring_reference(profile, layout, pupil, iris, iris_joints):
+    """The per joint math of the remapValue, multiplyDivide, eulerToQuat and clamp network."""
+    translations, scales = [], []
+    for index, value in enumerate(profile):
+        input_value = iris if index < iris_joints else pupil
+        output = layout[index] * (1.0 - (2.0 * value * input_value - value))
+        translations.append(np.sin(output * np.pi * 0.5))
+        scales.append(max(np.cos(output * np.pi * 0.5), 0.0))
+    return translations, scales
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_solve_ring_joints(seed):
+    rng = np.random.default_rng(seed)
+    profile, layout = rng.uniform(0, 1, (2, 12))
+    pupil, iris = rng.uniform(0, 1, 2)
+    iris_joints = int(rng.integers(0, 12))
+
+    translations, scales = solve_ring_joints(profile, layout, pupil, iris, iris_joints)
+    expected_translations, expected_scales = solve_ring_reference(profile, layout, pupil, iris, iris_joints)
+    assert translations == pytest.approx(expected_translations)
+    assert scales == pytest.approx(expected_scales)
+
+    inputs = np.where(np.arange(12) < iris_joints, iris, pupil)
+    assert np.stack([translations, scales]) == pytest.approx(
+        np.stack(get_ring_transforms(get_ring_outputs(profile, layout, inputs)))
+    )
+
+
+def test_solve_ring_joints_indices():
+    # sparse logical indices of the node pick the iris by index, not by position
+    translations, _ = solve_ring_joints([0.5, 0.5], [0.5, 0.5], 1.0, 0.0, iris_joints=3, indices=[1, 4])
+    assert translations == pytest.approx([np.sin(0.75 * np.pi * 0.5), np.sin(0.25 * np.pi * 0.5)])
@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+from maya_frog_rigging_tools.solvers.lattice import get_grid_positions, get_hat_weights, solve_lattice_weights
+
+BOUNDS = (-1, 0, -2, 1, 4, 2)
+GRID = (2, 3, 2)
+
+
+def test_grid_positions():
+    positions = get_grid_positions(BOUNDS, GRID)
+    assert positions.shape == (12, 3)
+    # four joints per y level, lower, middle and upper level in that order
+    assert positions[:4, 1] == pytest.approx([0, 0, 0, 0])
+    assert positions[4:8, 1] == pytest.approx([2, 2, 2, 2])
+    assert positions[8:, 1] == pytest.approx([4, 4, 4, 4])
+    assert positions[:4, [0, 2]] == pytest.approx(np.array([[-1, -2], [-1, 2], [1, -2], [1, 2]]))
+
+
+def test_weights_sum_to_one():
+    points = np.random.default_rng(0).uniform(BOUNDS[:3], BOUNDS[3:], (200, 3))
+    for grid in (GRID, (3, 3, 3), (1, 3, 4)):
+        weights = solve_lattice_weights(points, BOUNDS, grid)
+        assert weights.shape == (200, int(np.prod(grid)))
+        assert weights.min() >= 0
+        assert weights.sum(axis=1) == pytest.approx(np.ones(200))
+
+
+def test_corner_points():
+    # joints sit on the corners and level centers, each gets its own point fully
+    positions = get_grid_positions(BOUNDS, GRID)
+    weights = solve_lattice_weights(positions, BOUNDS, GRID)
+    assert weights == pytest.approx(np.eye(12))
+
+
+def test_middle_level():
+    # y is always split in three levels, a point halfway up only moves with the middle joints
+    weights = solve_lattice_weights([[0, 2, 0], [0, 3, 0]], BOUNDS, GRID)
+    assert weights[0, 4:8] == pytest.approx([0.25, 0.25, 0.25, 0.25])
+    assert weights[0, :4].sum() + weights[0, 8:].sum() == pytest.approx(0)
+    assert weights[1].reshape(3, 4).sum(axis=1) == pytest.approx([0, 0.5, 0.5])
+
+
+def test_hat_weights_clamp():
+    weights = get_hat_weights([-1, 0, 0.25, 1, 2], 3)
+    assert weights == pytest.approx(np.array([[1, 0, 0], [1, 0, 0], [0.5, 0.5, 0], [0, 0, 1], [0, 0, 1]]))
+    assert get_hat_weights([0.3], 1) == pytest.approx(np.ones((1, 1)))
@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from maya_frog_rigging_tools.solvers.mvc import deform_points, mean_value_coordinates
+
+# unit cube around the origin, two outward facing triangles per side
+CUBE_POINTS = np.array([[x, y, z] for x in (-1, 1) for y in (-1, 1) for z in (-1, 1)], dtype=float)
+CUBE_TRIANGLES = np.array([
+    [0, 1, 3], [0, 3, 2], [4, 6, 7], [4, 7, 5], [0, 4, 5], [0, 5, 1],
+    [2, 3, 7], [2, 7, 6], [0, 2, 6], [0, 6, 4], [1, 5, 7], [1, 7, 3],
+])
+
+
+def get_points(count=200, seed=0):
+    return np.random.default_rng(seed).uniform(-0.95, 0.95, (count, 3))
+
+
+def test_weights_sum_to_one():
+    weights = mean_value_coordinates(get_points(), CUBE_POINTS, CUBE_TRIANGLES)
+    assert weights.shape == (200, 8)
+    assert weights.sum(axis=1) == pytest.approx(np.ones(200))
+    # inside a convex cage the coordinates are positive
+    assert weights.min() > 0
+
+
+def test_reproduces_points():
+    points = get_points()
+    weights = mean_value_coordinates(points, CUBE_POINTS, CUBE_TRIANGLES)
+    assert deform_points(weights, CUBE_POINTS) == pytest.approx(points)
+
+
+def test_affine_cage_motion():
+    points = get_points()
+    weights = mean_value_coordinates(points, CUBE_POINTS, CUBE_TRIANGLES)
+    rotation = np.array([[0.0, 1.0, 0.0], [-1.0, 0.0, 0.0], [0.0, 0.0, 1.0]])
+    linear = rotation @ np.diag([2.0, 0.5, 1.5]) + [[0, 0.3, 0], [0, 0, 0], [0.2, 0, 0]]
+    translation = np.array([1.0, -2.0, 0.5])
+
+    moved = deform_points(weights, CUBE_POINTS @ linear + translation)
+    assert moved == pytest.approx(points @ linear + translation)
+
+
+def test_points_on_the_cage():
+    # a cage vertex and the middle of a cage triangle interpolate
+    points = [CUBE_POINTS[5], CUBE_POINTS[[0, 1, 3]].mean(axis=0)]
+    weights = mean_value_coordinates(points, CUBE_POINTS, CUBE_TRIANGLES)
+    assert weights[0] == pytest.approx(np.eye(8)[5])
+    assert weights[1, [0, 1, 3]] == pytest.approx([1 / 3, 1 / 3, 1 / 3])
+    assert deform_points(weights, CUBE_POINTS) == pytest.approx(np.array(points))
+
+
+def test_chunks_match():
+    points = get_points(50)
+    assert mean_value_coordinates(points, CUBE_POINTS, CUBE_TRIANGLES, chunk_size=7) == pytest.approx(
+        mean_value_coordinates(points, CUBE_POINTS, CUBE_TRIANGLES)
+    )
@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+
+from maya_frog_rigging_tools.solvers.pole import get_pole_directions, solve_pole_positions
+
+BENT = [[0, 0, 0], [2, 0, -1], [4, 0, 0]]
+STRAIGHT = [[0, 0, 0], [2, 0, 0], [4, 0, 0]]
+
+
+def calculate_pole_vector_position(chain, pole_distance=1):
+    """NumPy copy of the PyMEL calculate_pole_vector_position the solver replaced."""
+    upper, middle, lower = (np.asarray(position, dtype=float) for position in chain)
+    distance = (np.linalg.norm(middle - upper) + np.linalg.norm(lower - middle)) * 0.5 * pole_distance
+
+    norm_upper = (upper - middle) / np.linalg.norm(upper - middle) * distance + middle
+    norm_lower = (lower - middle) / np.linalg.norm(lower - middle) * distance + middle
+    line = norm_lower - norm_upper
+    mid = norm_upper + np.dot(middle - norm_upper, line) / np.dot(line, line) * line
+    mid_pointer = middle - mid
+    return mid_pointer / np.linalg.norm(mid_pointer) * distance + middle
+
+
+def test_bent_chain():
+    # the pole points away from the chord through the middle joint, half the chain length away
+    expected = [2, 0, -1 - np.sqrt(5)]
+    assert solve_pole_positions([BENT])[0] == pytest.approx(expected)
+    assert calculate_pole_vector_position(BENT) == pytest.approx(expected)
+
+
+def test_matches_old_solver():
+    rng = np.random.default_rng(0)
+    chains = rng.uniform(-5, 5, (50, 3, 3))
+    expected = [calculate_pole_vector_position(chain, pole_distance=1.5) for chain in chains]
+    assert solve_pole_positions(chains, pole_distance=1.5) == pytest.approx(np.array(expected))
+
+
+def test_pole_directions():
+    directions, valid = get_pole_directions([BENT, STRAIGHT])
+    assert valid.tolist() == [True, False]
+    assert directions[0] == pytest.approx([0, 0, -1])
+    assert directions[1] == pytest.approx([0, 0, 0])
+
+
+def test_straight_chain_uses_up_vector():
+    assert solve_pole_positions([STRAIGHT], up_vector=(0, 0, 1))[0] == pytest.approx([2, 0, 2])
+    # the up vector is made perpendicular to the chain
+    assert solve_pole_positions([STRAIGHT], up_vector=(1, 0, 1))[0] == pytest.approx([2, 0, 2])
+
+
+def test_up_vector_along_chain():
+    # any direction around the chain is valid, it only has to be perpendicular and finite
+    position = solve_pole_positions([STRAIGHT], up_vector=(1, 0, 0))[0]
+    assert np.all(np.isfinite(position))
+    assert position[0] == pytest.approx(2)
+    assert np.linalg.norm(position - [2, 0, 0]) == pytest.approx(2)
+
+
+def test_propagate():
+    chains = [STRAIGHT, BENT, STRAIGHT, STRAIGHT]
+    propagated = solve_pole_positions(chains, up_vector=(0, 0, 1), propagate=True)
+    # nothing to propagate before the first bent chain
+    assert propagated[0] == pytest.approx([2, 0, 2])
+    assert propagated[2] == pytest.approx([2, 0, -2])
+    assert propagated[3] == pytest.approx([2, 0, -2])
+
+    independent = solve_pole_positions(chains, up_vector=(0, 0, 1), propagate=False)
+    assert independent[2] == pytest.approx([2, 0, 2])
+    assert independent[1] == pytest.approx(propagated[1])
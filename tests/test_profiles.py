@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+
+from maya_frog_rigging_tools.solvers.profiles import (
+    evaluate_profile, get_edge_index, get_profile_values, normalize_profile,
+)
+
+PROFILES = ["linear", "sigmoid", ("sigmoid", 4.0, 0.3), "bezier", ("bezier", 0.1, 0.7, 0.9, 0.2), ("lut", (0, 0.5, 1))]
+
+
+@pytest.mark.parametrize("profile", PROFILES)
+def test_ends_pinned(profile):
+    values = get_profile_values(profile, 11)
+    assert len(values) == 11
+    assert values[0] == 0.0 and values[-1] == 1.0
+
+
+@pytest.mark.parametrize("profile", ["sigmoid", ("sigmoid", 30.0, 0.8), "bezier", ("bezier", 0.9, 0.1, 0.1, 0.9)])
+def test_monotonic(profile):
+    values = evaluate_profile(profile, np.linspace(0.0, 1.0, 501))
+    assert np.all(np.diff(values) >= -1e-12)
+    assert values[0] == pytest.approx(0.0, abs=1e-9) and values[-1] == pytest.approx(1.0)
+
+
+def test_bezier_ease_in_out():
+    # css ease-in-out, reference values from densely sampling the parametric curve
+    values = evaluate_profile(("bezier", 0.42, 0.0, 0.58, 1.0), [0.1, 0.25, 0.5, 0.75, 0.9])
+    assert values == pytest.approx([0.0197225, 0.1291619, 0.5, 0.8708381, 0.9802775], abs=1e-6)
+
+
+def test_linear_bezier():
+    # control points on the diagonal give the identity
+    values = np.linspace(0.0, 1.0, 7)
+    assert evaluate_profile(("bezier", 1 / 3, 1 / 3, 2 / 3, 2 / 3), values) == pytest.approx(values)
+
+
+def test_lut_interpolation():
+    profile = ("lut", (0.0, 0.2, 1.0))
+    assert evaluate_profile(profile, [0.0, 0.25, 0.5, 0.75, 1.0]) == pytest.approx([0.0, 0.1, 0.2, 0.6, 1.0])
+    # values outside of [0, 1] are clamped
+    assert evaluate_profile(profile, [-1.0, 2.0]) == pytest.approx([0.0, 1.0])
+
+
+def test_normalize_profile():
+    assert normalize_profile("sigmoid") == ("sigmoid", 11.7, 0.5)
+    assert normalize_profile(("sigmoid", 5)) == ("sigmoid", 5.0, 0.5)
+    assert normalize_profile(("lut", [0, 1])) == ("lut", (0.0, 1.0))
+    with pytest.raises(ValueError):
+        normalize_profile("cubic")
+    with pytest.raises(ValueError):
+        normalize_profile(("lut", [1]))
+
+
+def test_edge_index():
+    # linear samples 0, 0.1, ... 1.0, the first one reaching the threshold
+    assert get_edge_index("linear", 11, 0.0) == 0
+    assert get_edge_index("linear", 11, 0.25) == 3
+    assert get_edge_index("linear", 11, 0.3) == 3
+    assert get_edge_index("linear", 11, 1.0) == 10
+    assert get_edge_index("linear", 11, 1.5) == 11
+    assert get_edge_index(("lut", (0.0, 0.0, 0.0, 1.0)), 4, 0.5) == 3
+
+
+def test_cached_values_are_copies():
+    values = get_profile_values("bezier", 5)
+    values[:] = 7.0
+    assert get_profile_values("bezier", 5)[2] == pytest.approx(0.5)
+    assert get_profile_values(("bezier",), 5).tolist() == get_profile_values("bezier", 5).tolist()
@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+
+from maya_frog_rigging_tools.solvers.stretch import solve_stretch
+
+# straight chain along x with an upper and lower length of 2
+START = (0, 0, 0)
+MIDDLE = (2, 0, 0)
+END = (4, 0, 0)
+
+
+def solve(handle, pole=(2, 2, 0), **settings):
+    return [float(value) for value in solve_stretch(START, MIDDLE, END, START, handle, pole, **settings)]
+
+
+def test_squash_limit():
+    # handle at a quarter of the chain length, squashing stops at 1 - max_squash
+    assert solve((1, 0, 0), max_squash=0.5) == pytest.approx([0.5, 0.5, 0.5, 0.5])
+    # without squash the chain keeps its length
+    assert solve((1, 0, 0), max_squash=0.0) == pytest.approx([1.0, 1.0, 0.5, 0.5])
+
+
+def test_stretch():
+    assert solve((5, 0, 0)) == pytest.approx([1.25, 1.25, 0.5, 0.5])
+
+
+def test_max_stretch():
+    # twice the chain length is clamped to max_stretch
+    assert solve((8, 0, 0), max_stretch=1.5) == pytest.approx([1.5, 1.5, 0.5, 0.5])
+
+
+def test_pole_lock():
+    # pole 5 units from the root and 4 from the handle, both segments have a length of 2
+    assert solve((3, 0, 0), pole=(3, 4, 0), pole_lock=1.0) == pytest.approx([2.5, 2.0, 0.0, 0.0])
+    # half locked blends with the unstretched scale of 1, pole weights are split by pole_space
+    assert solve((3, 0, 0), pole=(3, 4, 0), pole_lock=0.5, pole_space=0.25) == pytest.approx(
+        [1.75, 1.5, 0.375, 0.125]
+    )
+
+
+def test_zero_length_chain():
+    # degenerate lengths fall back to a scale of 1 instead of dividing by zero
+    result = solve_stretch(START, START, START, START, (1, 0, 0), (0, 1, 0), pole_lock=0.5)
+    assert np.all(np.isfinite(result))
+    assert [float(value) for value in result] == pytest.approx([1.0, 1.0, 0.25, 0.25])
+
+
+def test_broadcast_poses():
+    handles = np.array([[1, 0, 0], [5, 0, 0], [8, 0, 0]])
+    upper_scale, lower_scale, _, _ = solve_stretch(
+        START, MIDDLE, END, START, handles, (2, 2, 0), max_squash=0.5, max_stretch=1.5
+    )
+    assert upper_scale == pytest.approx([0.5, 1.25, 1.5])
+    assert lower_scale == pytest.approx([0.5, 1.25, 1.5])